@@ -1,35 +1,453 @@
+#!/usr/bin/env python3
+"""
+1-remove-in-paragraph-new-line.py
+
+Stage 1: Paragraph Newline Removal
+
+Source texts are usually hard-wrapped, so a paragraph spans several lines. This script joins
+the lines of every paragraph into a single line while keeping the blank lines that separate
+paragraphs. Precisely: in every run of consecutive newlines, each pair of newlines is kept
+as a paragraph break and a remaining single newline becomes a space.
+
+The input is streamed in fixed-size blocks (or line by line, see iter_joined_text) and
+paragraphs are joined on the fly, so memory use does not depend on the size of the book.
+
+A whole directory of source books can be processed at once, in a process pool; the
+throughput of every file is reported.
+
+For multi-gigabyte sources (Bible collections, anthologies), --chunked memory-maps the input,
+splits it into chunks at blank-line paragraph boundaries, cleans the chunks in parallel worker
+processes and writes the results back in order. A chunk always ends with a complete newline run,
+so the output is identical to the serial path; --verify_serial checks that by also running the
+serial path and comparing the two outputs. Run without arguments, the script checks the chunked
+path against the serial path on a set of edge cases (CRLF and lone CR line endings, empty files,
+no trailing newline, tiny chunk sizes) and exits with a non-zero status on any mismatch.
+
+Usage example:
+    python 1-remove-in-paragraph-new-line.py \
+        --input "/path/to/SherlockHolmes.txt" \
+        --output "/path/to/SherlockHolmes-nl.txt" \
+        [--verbose]
+
+    python 1-remove-in-paragraph-new-line.py \
+        --input_dir "/path/to/source_books" \
+        --output_dir "/path/to/cleaned_books" \
+        [--suffix "-nl"] \
+        [--workers 4] \
+        [--verbose]
+
+    python 1-remove-in-paragraph-new-line.py \
+        --input "/path/to/anthology.txt" \
+        --output "/path/to/anthology-nl.txt" \
+        --chunked [--workers 8] [--chunk_size 64] [--verify_serial]
+
+    python 1-remove-in-paragraph-new-line.py
+"""
+
 import os
+import re
+import sys
+import mmap
+import argparse
+import filecmp
+import logging
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+# Characters read from the input per block.
+BLOCK_SIZE = 1 << 20
+
+# Default target size of a chunk in --chunked mode, in MB.
+DEFAULT_CHUNK_SIZE_MB = 64
+
+# A blank-line paragraph break in the raw bytes of a file (with \n, \r\n or \r line endings).
+PARAGRAPH_BREAK = re.compile(rb"(?:\r?\n|\r(?!\n)){2,}")
+
+# Suffix added to the file name of every cleaned book in directory mode.
+DEFAULT_SUFFIX = "-nl"
+
+# Self-check inputs (name, raw bytes), each cleaned by the chunked path with every one of
+# SELF_CHECK_CHUNK_SIZES (in bytes) and compared with the serial path.
+SELF_CHECK_CASES = [
+    ("empty file", b""),
+    ("no trailing newline", b"First line\nof a paragraph.\n\nLast paragraph without newline"),
+    ("LF", b"One\ntwo\n\nthree\nfour\n\n\nfive\n"),
+    ("CRLF", b"One\r\ntwo\r\n\r\nthree\r\nfour\r\n\r\n\r\nfive\r\n"),
+    ("lone CR", b"One\rtwo\r\rthree\rfour\r\r\rfive\r"),
+    ("mixed line endings", b"One\r\n\rtwo\n\r\nthree\r\r\nfour\n\r\rfive"),
+    ("only newlines", b"\n\r\n\r\r\n\n\n"),
+    ("multi-byte characters", "Pâté\nçà\n\nñ€\r\n\r\n𝄞 fin\n".encode("utf-8")),
+]
+SELF_CHECK_CHUNK_SIZES = (1, 3, 7, DEFAULT_CHUNK_SIZE_MB * 1_000_000)
+
+def newline_run(count):
+    """
+    Return the replacement for a run of count consecutive newlines: one paragraph break
+    for every pair of newlines, and a space for a remaining single newline.
+    """
+    return "\n\n" * (count // 2) + " " * (count % 2)
+
+def join_paragraph_lines(text):
+    """
+    Clean a piece of text that starts and ends with a non-newline character (so every newline
+    run in it is complete): single newlines become spaces and paragraph breaks are kept.
+    """
+    return "\n\n".join(paragraph.replace("\n", " ") for paragraph in text.split("\n\n"))
+
+def iter_joined_text(pieces):
+    """
+    Yield the cleaned text of an iterable of text pieces (lines, or blocks of any size), piece by piece.
+
+    Only the length of the newline run at the end of the previous piece is carried over, so any
+    amount of text is processed in constant memory.
+    """
+    pending_newlines = 0
+    for piece in pieces:
+        body = piece.lstrip("\n")
+        if not body:
+            pending_newlines += len(piece)
+            continue
+        pending_newlines += len(piece) - len(body)
+        if pending_newlines:
+            yield newline_run(pending_newlines)
+        core = body.rstrip("\n")
+        pending_newlines = len(body) - len(core)
+        yield join_paragraph_lines(core)
+    if pending_newlines:
+        yield newline_run(pending_newlines)
+
+def iter_joined_lines(lines):
+    """
+    Yield the cleaned text of an iterable of lines as lines again (each ending with a newline,
+    except possibly the last), so the cleanup can feed other line-based stages
+    (see clean_and_tag_book.py). A joined paragraph becomes a single line.
+    """
+    buffer = []
+    for piece in iter_joined_text(lines):
+        start = 0
+        newline = piece.find("\n")
+        while newline >= 0:
+            buffer.append(piece[start:newline + 1])
+            yield "".join(buffer)
+            buffer = []
+            start = newline + 1
+            newline = piece.find("\n", start)
+        if start < len(piece):
+            buffer.append(piece[start:])
+    if buffer:
+        yield "".join(buffer)
+
+def iter_blocks(file, block_size=BLOCK_SIZE):
+    """
+    Yield a text file's content in blocks of block_size characters.
+    """
+    return iter(lambda: file.read(block_size), "")
 
 def remove_inline_newlines(input_path, output_path):
+    """
+    Join the lines of every paragraph of a text file and write the result to output_path.
+
+    Parameters:
+        input_path (str or Path): The source text file.
+        output_path (str or Path): The cleaned text file to write.
+
+    Returns:
+        dict: "bytes" and "lines" read and the elapsed "seconds", or None if the file could not be processed.
+    """
     if not os.path.isfile(input_path):
-        print(f"Error: The input file '{input_path}' does not exist.")
-        return
-    
+        logger.error(f"The input file '{input_path}' does not exist.")
+        return None
+
+    start = time.perf_counter()
+    line_count = 0
+
+    def counted(blocks):
+        nonlocal line_count
+        for block in blocks:
+            line_count += block.count("\n")
+            yield block
+
     try:
-        with open(input_path, 'r') as file:
-            # Read the entire file content
-            content = file.read()
-        
-        # Replace single newlines within paragraphs with a space
-        cleaned_content = []
-        for paragraph in content.split('\n\n'):
-            # Replace single newlines in paragraphs with a space
-            paragraph = paragraph.replace('\n', ' ')
-            cleaned_content.append(paragraph)
-        
-        # Join the paragraphs back with double newlines to preserve paragraph breaks
-        result = '\n\n'.join(cleaned_content)
-        
-        # Write the cleaned content to the output file
-        with open(output_path, 'w') as output_file:
-            output_file.write(result)
-        
-        print(f"File successfully processed. Output saved to: {output_path}")
+        with open(input_path, "r", encoding="utf-8") as file, open(output_path, "w", encoding="utf-8") as output_file:
+            for piece in iter_joined_text(counted(iter_blocks(file))):
+                output_file.write(piece)
     except Exception as e:
-        print(f"An error occurred: {e}")
+        logger.error(f"An error occurred while processing '{input_path}': {e}")
+        return None
+    seconds = time.perf_counter() - start
+    stats = {"bytes": os.path.getsize(input_path), "lines": line_count, "seconds": seconds}
+    logger.info(f"Processed {input_path} -> {output_path}: {format_throughput(stats)}")
+    return stats
+
+def find_chunk_boundaries(data, chunk_size):
+    """
+    Split a file's bytes (e.g. a memory map) into chunks of roughly chunk_size bytes.
+
+    Every chunk but the last ends right after a blank-line paragraph break, i.e. after a
+    complete newline run, so cleaning the chunks independently gives the same result as
+    cleaning the whole file. A chunk grows past chunk_size until such a break is found.
+
+    Returns:
+        list: (start, end) byte offsets of the chunks, in order.
+    """
+    boundaries = []
+    start = 0
+    size = len(data)
+    while start < size:
+        match = PARAGRAPH_BREAK.search(data, min(start + chunk_size, size))
+        end = match.end() if match else size
+        boundaries.append((start, end))
+        start = end
+    return boundaries
+
+def _clean_chunk(task):
+    """
+    Process pool task: clean the bytes [start, end) of a file.
+
+    The chunk is decoded and its line endings are translated as reading the file in text mode
+    would. Returns the cleaned text and the number of lines in the chunk.
+    """
+    path, start, end = task
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        text = data[start:end].decode("utf-8")
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return "".join(iter_joined_text([text])), text.count("\n")
+
+def remove_inline_newlines_chunked(input_path, output_path, workers=os.cpu_count(),
+                                   chunk_size=DEFAULT_CHUNK_SIZE_MB * 1_000_000):
+    """
+    Clean a text file like remove_inline_newlines, in parallel.
+
+    The input is memory-mapped and split at paragraph boundaries (see find_chunk_boundaries);
+    the chunks are cleaned by a pool of worker processes and written out in order. At most two
+    cleaned chunks per worker are held in memory at a time.
+
+    Returns:
+        dict: "bytes" and "lines" read, the elapsed "seconds" and the number of "chunks", or None
+              if the file could not be processed.
+    """
+    if not os.path.isfile(input_path):
+        logger.error(f"The input file '{input_path}' does not exist.")
+        return None
+
+    start = time.perf_counter()
+    line_count = 0
+    try:
+        size = os.path.getsize(input_path)
+        if size:
+            with open(input_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                boundaries = find_chunk_boundaries(data, chunk_size)
+        else:
+            boundaries = []
+        logger.debug(f"Split {input_path} into {len(boundaries)} chunk(s)")
+        tasks = [(str(input_path), chunk_start, chunk_end) for chunk_start, chunk_end in boundaries]
+        with open(output_path, "w", encoding="utf-8") as output_file, \
+                ProcessPoolExecutor(max_workers=max(1, workers)) as executor:
+            pending = deque()
+            for task in tasks:
+                pending.append(executor.submit(_clean_chunk, task))
+                if len(pending) >= 2 * max(1, workers):
+                    cleaned, lines = pending.popleft().result()
+                    output_file.write(cleaned)
+                    line_count += lines
+            while pending:
+                cleaned, lines = pending.popleft().result()
+                output_file.write(cleaned)
+                line_count += lines
+    except Exception as e:
+        logger.error(f"An error occurred while processing '{input_path}': {e}")
+        return None
+    seconds = time.perf_counter() - start
+    stats = {"bytes": size, "lines": line_count, "seconds": seconds, "chunks": len(boundaries)}
+    logger.info(f"Processed {input_path} -> {output_path} in {len(boundaries)} chunk(s) with {workers} worker(s): "
+                f"{format_throughput(stats)}")
+    return stats
+
+def verify_against_serial(input_path, output_path):
+    """
+    Clean input_path with the serial path into a temporary file and compare it with output_path.
+
+    Returns:
+        bool: True if both outputs are byte-identical.
+    """
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    with tempfile.TemporaryDirectory(dir=output_dir) as temp_dir:
+        serial_path = os.path.join(temp_dir, "serial.txt")
+        if not remove_inline_newlines(input_path, serial_path):
+            return False
+        identical = filecmp.cmp(serial_path, output_path, shallow=False)
+    if identical:
+        logger.info(f"Verified: {output_path} is identical to the serial output")
+    else:
+        logger.error(f"Mismatch: {output_path} differs from the serial output")
+    return identical
+
+def check_chunk_boundaries(data, chunk_size):
+    """
+    Return a description of what is wrong with find_chunk_boundaries(data, chunk_size), or None.
+
+    The chunks must cover the data contiguously, and every chunk but the last must end with a
+    complete newline run (the next chunk may not start with a newline).
+    """
+    boundaries = find_chunk_boundaries(data, chunk_size)
+    position = 0
+    for index, (start, end) in enumerate(boundaries):
+        if start != position or end <= start:
+            return f"chunk {index} is ({start}, {end}), expected to start at {position}"
+        chunk = bytes(data[start:end])
+        newline_run = chunk[len(chunk.rstrip(b"\r\n")):]
+        if end < len(data) and (not PARAGRAPH_BREAK.fullmatch(newline_run) or data[end:end + 1] in (b"\n", b"\r")):
+            return f"chunk {index} ({start}, {end}) does not end with a complete paragraph break"
+        position = end
+    if position != len(data):
+        return f"chunks end at {position} of {len(data)} bytes"
+    return None
+
+def run_self_check(workers=2):
+    """
+    Check the chunked path against the serial path on SELF_CHECK_CASES and print the result.
+
+    Returns:
+        int: The number of failed checks.
+    """
+    logger.setLevel(logging.WARNING)
+    failures = 0
+    checks = 0
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for case_index, (name, data) in enumerate(SELF_CHECK_CASES):
+            input_path = os.path.join(temp_dir, f"case{case_index}.txt")
+            serial_path = os.path.join(temp_dir, f"case{case_index}-serial.txt")
+            with open(input_path, "wb") as f:
+                f.write(data)
+            serial_stats = remove_inline_newlines(input_path, serial_path)
+            for chunk_size in SELF_CHECK_CHUNK_SIZES:
+                checks += 1
+                chunked_path = os.path.join(temp_dir, f"case{case_index}-chunked{chunk_size}.txt")
+                problem = check_chunk_boundaries(data, chunk_size)
+                if problem is None:
+                    chunked_stats = remove_inline_newlines_chunked(input_path, chunked_path, workers, chunk_size)
+                    if not serial_stats or not chunked_stats:
+                        problem = "processing failed"
+                    elif not filecmp.cmp(serial_path, chunked_path, shallow=False):
+                        problem = "chunked output differs from the serial output"
+                    elif chunked_stats["lines"] != serial_stats["lines"]:
+                        problem = f"{chunked_stats['lines']} lines counted, serial path counted {serial_stats['lines']}"
+                if problem:
+                    failures += 1
+                    print(f"FAIL [{name}, chunk size {chunk_size}]: {problem}")
+    print(f"{checks - failures} of {checks} chunked-versus-serial check(s) passed")
+    return failures
+
+def format_throughput(stats):
+    """
+    Describe the size and throughput of a processed file.
+    """
+    megabytes = stats["bytes"] / 1e6
+    seconds = stats["seconds"]
+    rate = megabytes / seconds if seconds > 0 else float("inf")
+    return f"{megabytes:.2f} MB, {stats['lines']} lines in {seconds:.2f}s ({rate:.1f} MB/s)"
+
+def _clean_file(paths):
+    """
+    Process pool task: clean one (input_path, output_path) pair.
+    """
+    input_path, output_path = paths
+    return remove_inline_newlines(input_path, output_path)
+
+def process_directory(input_dir, output_dir, suffix=DEFAULT_SUFFIX, workers=1, chunked=False,
+                      chunk_size=DEFAULT_CHUNK_SIZE_MB * 1_000_000):
+    """
+    Clean every .txt book in input_dir, writing {stem}{suffix}.txt files to output_dir.
+
+    With workers > 1 the books are processed in a process pool; with chunked, they are instead
+    processed one at a time, each split into chunks cleaned by the pool. Files that already
+    carry the suffix are skipped, so the output directory may be the input directory.
+
+    Returns:
+        int: The number of books processed successfully.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    books = sorted(path for path in input_dir.glob("*.txt") if not (suffix and path.stem.endswith(suffix)))
+    logger.info(f"Found {len(books)} book(s) in {input_dir}")
+    jobs = [(book, output_dir / f"{book.stem}{suffix}{book.suffix}") for book in books]
+
+    start = time.perf_counter()
+    if chunked:
+        results = [remove_inline_newlines_chunked(book, output, workers, chunk_size) for book, output in jobs]
+    elif workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_clean_file, jobs))
+    else:
+        results = [_clean_file(job) for job in jobs]
+    elapsed = time.perf_counter() - start
+
+    done = [stats for stats in results if stats]
+    total = {
+        "bytes": sum(stats["bytes"] for stats in done),
+        "lines": sum(stats["lines"] for stats in done),
+        "seconds": elapsed
+    }
+    logger.info(f"Cleaned {len(done)} of {len(jobs)} book(s): {format_throughput(total)}")
+    return len(done)
+
+def main():
+    if len(sys.argv) == 1:
+        sys.exit(1 if run_self_check() else 0)
+
+    parser = argparse.ArgumentParser(
+        description="Join the lines of every paragraph of a source text (or a directory of source texts)."
+    )
+    parser.add_argument('--input', type=str, help='Source text file.')
+    parser.add_argument('--output', type=str, help='Cleaned text file to write.')
+    parser.add_argument('--input_dir', type=str, help='Directory of source text files (*.txt) to clean.')
+    parser.add_argument('--output_dir', type=str,
+                        help='Directory for the cleaned files in directory mode (default: --input_dir).')
+    parser.add_argument('--suffix', type=str, default=DEFAULT_SUFFIX,
+                        help=f'Suffix added to the name of every cleaned file in directory mode (default: "{DEFAULT_SUFFIX}").')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of worker processes: books cleaned in parallel in directory mode, or chunks '
+                             'cleaned in parallel with --chunked (default: 1).')
+    parser.add_argument('--chunked', action='store_true',
+                        help='Memory-map each input and clean chunks split at paragraph boundaries in parallel.')
+    parser.add_argument('--chunk_size', type=int, default=DEFAULT_CHUNK_SIZE_MB,
+                        help=f'Target chunk size in MB for --chunked (default: {DEFAULT_CHUNK_SIZE_MB}).')
+    parser.add_argument('--verify_serial', action='store_true',
+                        help='With --chunked and --input, also run the serial path and check that both outputs '
+                             'are identical.')
+    parser.add_argument('--verbose', action='store_true', help='Enable verbose logging.')
+    args = parser.parse_args()
+
+    if args.verbose:
+        logger.setLevel(logging.DEBUG)
 
-# Example usage:
-input_path = '/Users/chrisbrookhart/Library/Mobile Documents/com~apple~CloudDocs/Developer/My iOS Apps/EchoBooks Content/Sherlock_Holmes/SherlockHolmes.txt'
-output_path = '/Users/chrisbrookhart/Library/Mobile Documents/com~apple~CloudDocs/Developer/My iOS Apps/EchoBooks Content/Sherlock_Holmes/SherlockHolmes-nl.txt'
+    if args.input_dir:
+        input_dir = Path(args.input_dir)
+        if not input_dir.is_dir():
+            logger.error(f"Input directory '{input_dir}' does not exist or is not a directory.")
+            return
+        output_dir = Path(args.output_dir) if args.output_dir else input_dir
+        if output_dir == input_dir and not args.suffix:
+            logger.error("Refusing to overwrite the source books: give --output_dir or a non-empty --suffix.")
+            return
+        process_directory(input_dir, output_dir, args.suffix, args.workers, args.chunked,
+                          args.chunk_size * 1_000_000)
+    elif args.input and args.output:
+        if args.chunked:
+            stats = remove_inline_newlines_chunked(args.input, args.output, args.workers,
+                                                   args.chunk_size * 1_000_000)
+            if stats and args.verify_serial:
+                verify_against_serial(args.input, args.output)
+        else:
+            remove_inline_newlines(args.input, args.output)
+    else:
+        parser.error("give --input and --output, or --input_dir")
 
-remove_inline_newlines(input_path, output_path)
+if __name__ == "__main__":
+    main()
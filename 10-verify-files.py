@@ -6,7 +6,8 @@ This script verifies that all expected JSON and audio files are present in the b
 
 Folder structure assumptions:
   - The top-level book folder (passed as --input_dir) contains the structure JSON file
-    (e.g. "BOOKM_structure.json").
+    (e.g. "BOOKM_structure.json"), and, if it is paged, the subbook files its index refers to
+    (e.g. "SubBooks/BOOKM_S1_subbook.json").
   - Within the book folder, there are language folders (e.g., "en-US", "es-ES", etc.).
     Each language folder is expected to contain two subfolders:
       • Content/  — containing chapter JSON files (in subfolders, e.g., by subbook and chapter)
@@ -37,6 +38,82 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s: %(m
 logger = logging.getLogger(__name__)
 
 # --- JSON Schemas (as defined in previous steps) ---
+# Schemas of the per-language statistics of chapters and subbooks (6-assemble_structure_json.py
+# --statistics): word and character counts, and audio durations in seconds
+language_counts_schema = {
+    "type": "object",
+    "patternProperties": {
+        "^[a-z]{2}-[A-Z]{2}$": {"type": "integer", "minimum": 0}
+    },
+    "additionalProperties": False
+}
+
+language_durations_schema = {
+    "type": "object",
+    "patternProperties": {
+        "^[a-z]{2}-[A-Z]{2}$": {"type": "number", "minimum": 0}
+    },
+    "additionalProperties": False
+}
+
+# Schema of a subbook with its chapters, in the unified structure JSON or in a subbook file
+# of a paged structure JSON (SubBooks/{book_code}_S{n}_subbook.json)
+subbook_schema = {
+    "type": "object",
+    "properties": {
+        "subBookID": {"type": "string", "format": "uuid"},
+        "subBookNumber": {"type": "integer", "minimum": 1},
+        "subBookTitle": {"type": "string"},
+        "totalWords": language_counts_schema,
+        "totalCharacters": language_counts_schema,
+        "audioDuration": language_durations_schema,
+        "chapters": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "chapterID": {"type": "string", "format": "uuid"},
+                    "chapterNumber": {"type": "integer", "minimum": 0},
+                    "chapterTitle": {"type": "string"},
+                    "totalParagraphs": {"type": "integer", "minimum": 0},
+                    "totalSentences": {"type": "integer", "minimum": 0},
+                    "totalWords": language_counts_schema,
+                    "totalCharacters": language_counts_schema,
+                    "audioDuration": language_durations_schema,
+                    "contentReferences": {
+                        "type": "object",
+                        "patternProperties": {
+                            "^[a-z]{2}-[A-Z]{2}$": {"type": "string"}
+                        },
+                        "additionalProperties": False
+                    }
+                },
+                "required": ["chapterID", "chapterNumber", "chapterTitle", "totalParagraphs", "totalSentences", "contentReferences"],
+                "additionalProperties": False
+            }
+        }
+    },
+    "required": ["subBookID", "subBookNumber", "subBookTitle", "chapters"],
+    "additionalProperties": False
+}
+
+# Schema of a subbook in the index of a paged structure JSON (its chapters are in subBookFile)
+subbook_entry_schema = {
+    "type": "object",
+    "properties": {
+        "subBookID": {"type": "string", "format": "uuid"},
+        "subBookNumber": {"type": "integer", "minimum": 1},
+        "subBookTitle": {"type": "string"},
+        "totalChapters": {"type": "integer", "minimum": 0},
+        "totalWords": language_counts_schema,
+        "totalCharacters": language_counts_schema,
+        "audioDuration": language_durations_schema,
+        "subBookFile": {"type": "string", "minLength": 1}
+    },
+    "required": ["subBookID", "subBookNumber", "subBookTitle", "totalChapters", "subBookFile"],
+    "additionalProperties": False
+}
+
 structure_schema = {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "title": "Book Structure Schema",
@@ -59,38 +136,7 @@ structure_schema = {
         },
         "subBooks": {
             "type": "array",
-            "items": {
-                "type": "object",
-                "properties": {
-                    "subBookID": {"type": "string", "format": "uuid"},
-                    "subBookNumber": {"type": "integer", "minimum": 1},
-                    "subBookTitle": {"type": "string"},
-                    "chapters": {
-                        "type": "array",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "chapterID": {"type": "string", "format": "uuid"},
-                                "chapterNumber": {"type": "integer", "minimum": 0},
-                                "chapterTitle": {"type": "string"},
-                                "totalParagraphs": {"type": "integer", "minimum": 0},
-                                "totalSentences": {"type": "integer", "minimum": 0},
-                                "contentReferences": {
-                                    "type": "object",
-                                    "patternProperties": {
-                                        "^[a-z]{2}-[A-Z]{2}$": {"type": "string"}
-                                    },
-                                    "additionalProperties": False
-                                }
-                            },
-                            "required": ["chapterID", "chapterNumber", "chapterTitle", "totalParagraphs", "totalSentences", "contentReferences"],
-                            "additionalProperties": False
-                        }
-                    }
-                },
-                "required": ["subBookID", "subBookNumber", "subBookTitle", "chapters"],
-                "additionalProperties": False
-            }
+            "items": {"oneOf": [subbook_schema, subbook_entry_schema]}
         }
     },
     "required": ["bookID", "bookTitle", "author", "languages", "coverImageName", "bookCode", "defaultPlaybackOrder"],
@@ -111,6 +157,11 @@ structure_schema = {
     "additionalProperties": False
 }
 
+subbook_page_schema = dict(subbook_schema, **{
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "title": "SubBook Schema"
+})
+
 chapter_schema = {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "title": "Chapter Schema",
@@ -179,7 +230,8 @@ def verify_files(book_dir: Path):
     Verify that all expected JSON and audio files are present in the book folder.
 
     Checks:
-      1. That a structure JSON file exists in the top-level book folder (any file with "structure" in its name).
+      1. That a structure JSON file exists in the top-level book folder (any file with "structure" in its name),
+         and for a paged structure JSON, that the subbook file of every subbook in its index exists.
       2. For each language folder (e.g., "en-US", "es-ES", etc.):
          - That both "Content" and "Audio" subfolders exist.
          - Recursively, for each chapter JSON file in Content:
@@ -195,6 +247,18 @@ def verify_files(book_dir: Path):
     if not structure_files:
         missing_files.append("Structure JSON file (e.g., 'structure.json' or '*structure*.json') is missing in the top-level folder.")
 
+    # A paged structure JSON refers to a subbook file for every subbook.
+    for structure_file in structure_files:
+        try:
+            with open(structure_file, "r", encoding="utf-8") as f:
+                subbooks = json.load(f).get("subBooks", [])
+        except Exception as e:
+            missing_files.append(f"Error reading JSON file {structure_file}: {e}")
+            continue
+        for subbook in subbooks:
+            if "subBookFile" in subbook and not (structure_file.parent / subbook["subBookFile"]).is_file():
+                missing_files.append(f"Subbook JSON file missing: {structure_file.parent / subbook['subBookFile']}")
+
     # Process each language folder.
     for lang_folder in book_dir.iterdir():
         if not lang_folder.is_dir():
@@ -1,44 +1,58 @@
 # NOTE: THIS CODE WAS DESIGNED TO LOOK FOR PATTERNS IN THE BOOK OF MORMON.
 # IT ADDS CHAPTER FLAGS TO THE TEXT FILE ABOVE LINES WHERE IT FINDS THE WORD CHAPTER
+#
+# Usage example:
+#     python 2-BOM-add-chapter-flags.py --input book_no_nl.txt --output book_with_chapter_flags.txt
+#
+# The flag is marker_rules.CHAPTER_RULE; pass --rules to use the rules of a JSON rules file
+# instead (see marker_rules.py for the format).
+#
+# iter_chapter_flagged_lines() is also used as a stage of clean_and_tag_book.py.
 
 import os
-import re
+import argparse
 
-def add_chapter_flags(input_path, output_path):
+from marker_rules import CHAPTER_RULE, MarkerRuleEngine, load_rules
+
+def iter_chapter_flagged_lines(lines, engine=None):
+    """
+    Yield the lines of the book, with a chapter flag inserted before every line that
+    contains the word "Chapter" and a chapter number.
+
+    engine is the MarkerRuleEngine to apply (default: one built from CHAPTER_RULE); its
+    per-rule match counts are updated as the lines are consumed.
+    """
+    if engine is None:
+        engine = MarkerRuleEngine([CHAPTER_RULE])
+    return engine.iter_marked_lines(lines)
+
+def add_chapter_flags(input_path, output_path, rules_path=None):
     if not os.path.isfile(input_path):
         print(f"Error: The input file '{input_path}' does not exist.")
         return
-    
+
+    # Stream into a temporary file, so the output may also be the input file.
+    temp_path = f"{output_path}.tmp"
     try:
-        with open(input_path, 'r') as file:
-            # Read all lines from the file
-            lines = file.readlines()
-        
-        updated_lines = []
-        for i, line in enumerate(lines):
-            # Check if the line contains the word "Chapter" and a chapter number
-            match = re.search(r'\bChapter\s+(\d+)', line, re.IGNORECASE)
-            if match:
-                # Extract the chapter number
-                chapter_number = match.group(1)
-                # Insert the comment flag before the current line
-                updated_lines.append(f"<!-- CHAPTER: {chapter_number} -->\n")
-            # Add the current line to the updated list
-            updated_lines.append(line)
-        
-        # Write the updated content to the output file
-        with open(output_path, 'w') as output_file:
-            output_file.writelines(updated_lines)
-        
+        engine = MarkerRuleEngine(load_rules(rules_path) if rules_path else [CHAPTER_RULE])
+        with open(input_path, 'r', encoding='utf-8') as file, open(temp_path, 'w', encoding='utf-8') as output_file:
+            output_file.writelines(iter_chapter_flagged_lines(file, engine))
+        os.replace(temp_path, output_path)
+
         print(f"File successfully processed. Output saved to: {output_path}")
+        print(f"Rule matches: {engine.report()}")
     except Exception as e:
         print(f"An error occurred: {e}")
+    finally:
+        # Left behind only if the output was not written.
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
 
-# Example usage:
-# input_path = "/path/to/your/input.txt"
-# output_path = "/path/to/your/output.txt"
-
-input_path = '/Users/chrisbrookhart/Library/Mobile Documents/com~apple~CloudDocs/Developer/My iOS Apps/EchoBooks Content/Book_of_Mormon/The_Book_of_Mormon_no_nl.txt'
-output_path = '/Users/chrisbrookhart/Library/Mobile Documents/com~apple~CloudDocs/Developer/My iOS Apps/EchoBooks Content/Book_of_Mormon/The_Book_of_Mormon_with_chapter_flags.txt'
-
-add_chapter_flags(input_path, output_path)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add chapter flags above lines mentioning 'Chapter N'.")
+    parser.add_argument('--input', type=str, required=True, help='Book text file.')
+    parser.add_argument('--output', type=str, required=True, help='Flagged book text file to write.')
+    parser.add_argument('--rules', type=str, default=None,
+                        help='JSON rules file to apply instead of the built-in chapter rule.')
+    args = parser.parse_args()
+    add_chapter_flags(args.input, args.output, args.rules)
@@ -1,56 +1,133 @@
+"""
+Moves scripture references (number:colon:number) to their own marker line.
+
+Every reference gets a marker, and the line is split at each reference, so a line holding
+several verses becomes one marker line and one text line per verse:
+
+    1:1 I, Nephi, having been born 1:2 Yea, I make a record
+    ->
+    <!-- REF: 1:1 -->
+    I, Nephi, having been born
+    <!-- REF: 1:2 -->
+    Yea, I make a record
+
+Usage example:
+    python 3-Scripture-add-references.py --input book_with_headers.txt --output book_with_refs.txt
+
+    # Time the single-scan extractor against the former search-and-sub approach
+    python 3-Scripture-add-references.py --input book_with_headers.txt --benchmark
+
+The reference rule is marker_rules.REFERENCE_RULE; pass --rules to use the rules of a JSON
+rules file instead (see marker_rules.py for the format).
+
+iter_referenced_lines() is also used as a stage of clean_and_tag_book.py.
+"""
+
+import os
 import re
+import time
+import argparse
+
+from marker_rules import REFERENCE_RULE, MarkerRuleEngine, load_rules
+
+def iter_referenced_lines(lines, engine=None):
+    """
+    Yield the lines of the book with every reference moved to its own line before the text
+    that follows it, in the format '<!-- REF: number:colon:number -->'. Each line is scanned
+    once.
 
-def wrap_number_patterns_with_newline(input_file_path, output_file_path):
+    engine is the MarkerRuleEngine to apply (default: one built from REFERENCE_RULE); its
+    per-rule match counts are updated as the lines are consumed.
+    """
+    if engine is None:
+        engine = MarkerRuleEngine([REFERENCE_RULE])
+    return engine.iter_marked_lines(lines)
+
+def wrap_number_patterns_with_newline(input_file_path, output_file_path, rules_path=None):
     """
     Opens a text file, finds all instances of 'number:colon:number space',
-    and moves them to their own line before the text in the format:
+    and moves each of them to its own line before the text that follows it, in the format:
     '<!-- REF: number:colon:number -->'.
 
     :param input_file_path: Path to the input text file
     :param output_file_path: Path to the output text file
+    :param rules_path: Optional JSON rules file replacing the built-in reference rule
     """
-    # Define the regex pattern to match the specified pattern
-    pattern = r'\b(\d+:\d+) '  # Captures the number:colon:number pattern
-
-    # Define the replacement format to place the reference on its own line
-    replacement = r'<!-- REF: \1 -->\n'
-
+    # Stream into a temporary file, so the output may also be the input file.
+    temp_path = f"{output_file_path}.tmp"
     try:
-        # Open the input file and read its content
-        with open(input_file_path, 'r') as file:
-            content = file.readlines()
-
-        # Process each line, inserting references on their own line
-        updated_content = []
-        for line in content:
-            # Replace the pattern and add the reference line if a match is found
-            updated_line = re.sub(pattern, replacement, line)
-            if updated_line != line:  # A match was found and replaced
-                match = re.search(pattern, line)
-                if match:
-                    updated_content.append(f'<!-- REF: {match.group(1)} -->\n')
-            # Add the original (now cleaned) line
-            updated_content.append(re.sub(pattern, '', line))
-
-        # Write the updated content to the output file
-        with open(output_file_path, 'w') as file:
-            file.writelines(updated_content)
+        engine = MarkerRuleEngine(load_rules(rules_path) if rules_path else [REFERENCE_RULE])
+        with open(input_file_path, 'r', encoding='utf-8') as file, \
+                open(temp_path, 'w', encoding='utf-8') as output_file:
+            output_file.writelines(iter_referenced_lines(file, engine))
+        os.replace(temp_path, output_file_path)
 
         print(f"Processing complete. Updated file saved to '{output_file_path}'.")
-    
+        print(f"Rule matches: {engine.report()}")
+
     except FileNotFoundError:
         print(f"Error: The file at '{input_file_path}' was not found.")
     except Exception as e:
         print(f"An error occurred: {e}")
+    finally:
+        # Left behind only if the output was not written.
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
 
-# Placeholder for file paths
-# input_file_path = 'path/to/your/input_file.txt'  # Replace with your input file path
-# output_file_path = 'path/to/your/output_file.txt'  # Replace with your desired output file path
+def _search_and_sub_lines(lines, pattern=re.compile(r'\b(\d+:\d+) ')):
+    """
+    The former per-line approach (search, then sub): only the first reference of a line
+    gets a marker while every reference is removed. Kept for --benchmark only.
+    """
+    for line in lines:
+        match = pattern.search(line)
+        if match:
+            yield f'<!-- REF: {match.group(1)} -->\n'
+            yield pattern.sub('', line)
+        else:
+            yield line
+
+def benchmark(input_file_path, repeat=3):
+    """
+    Time the single-scan extractor and the former search-and-sub approach over the book
+    (read into memory first, nothing is written) and print the best time of each.
+    """
+    with open(input_file_path, 'r', encoding='utf-8') as file:
+        lines = file.readlines()
+    megabytes = sum(len(line) for line in lines) / 1e6
 
-input_file_path = '/Users/chrisbrookhart/Library/Mobile Documents/com~apple~CloudDocs/Developer/My iOS Apps/EchoBooks Content/Book_of_Mormon/The_Book_of_Mormon_with_headers.txt'  # Replace with your input file path
-output_file_path = '/Users/chrisbrookhart/Library/Mobile Documents/com~apple~CloudDocs/Developer/My iOS Apps/EchoBooks Content/Book_of_Mormon/The_Book_of_Mormon3_with_refs.txt'  # Replace with your desired output file path
+    def best_time(run):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            output_lines = sum(1 for _ in run())
+            times.append(time.perf_counter() - start)
+        return min(times), output_lines
 
-# Call the function
-wrap_number_patterns_with_newline(input_file_path, output_file_path)
+    engine = MarkerRuleEngine([REFERENCE_RULE])
+    scan_seconds, scan_lines = best_time(lambda: iter_referenced_lines(lines, engine))
+    legacy_seconds, legacy_lines = best_time(lambda: _search_and_sub_lines(lines))
+    references = engine.counts[REFERENCE_RULE["name"]] // repeat
+    legacy_markers = sum(1 for line in _search_and_sub_lines(lines) if line.startswith('<!-- REF: '))
 
+    print(f"{len(lines)} lines, {megabytes:.2f} MB, {references} references (best of {repeat} runs)")
+    print(f"  single scan:    {scan_seconds:.3f}s ({megabytes / scan_seconds:.1f} MB/s), "
+          f"{scan_lines} output lines, {references} REF markers")
+    print(f"  search and sub: {legacy_seconds:.3f}s ({megabytes / legacy_seconds:.1f} MB/s), "
+          f"{legacy_lines} output lines, {legacy_markers} REF markers")
 
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move scripture references to their own marker lines.")
+    parser.add_argument('--input', type=str, required=True, help='Book text file.')
+    parser.add_argument('--output', type=str, default=None, help='Book text file with reference markers to write.')
+    parser.add_argument('--rules', type=str, default=None,
+                        help='JSON rules file to apply instead of the built-in reference rule.')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='Time the reference extraction over the input instead of writing output.')
+    args = parser.parse_args()
+    if args.benchmark:
+        benchmark(args.input)
+    elif not args.output:
+        parser.error("--output is required unless --benchmark is given")
+    else:
+        wrap_number_patterns_with_newline(args.input, args.output, args.rules)
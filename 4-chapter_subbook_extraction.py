@@ -17,6 +17,10 @@ If subbook markers are present, the program creates subdirectories (with a numer
 prefix and sanitized subbook title) and saves the chapter files there. If no subbook
 tags are detected, all chapter files are saved in the output directory.
 
+extract_chapters() yields the same chapters as records (subbook number and title, chapter
+number and title, content lines) without writing anything; 5-spacy_sentence_parser.py
+--from_tagged_book consumes them directly, making the chapter files optional.
+
 Usage example:
     python 4-chapter_subbook_extraction.py \
         --book_title "Example Book Title" \
@@ -31,6 +35,8 @@ import argparse
 import logging
 from pathlib import Path
 
+from marker_lexer import CHAPTER, SUBBOOK, classify_marker
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
@@ -55,100 +61,122 @@ def sanitize_filename(name):
     """
     return re.sub(r'[\\/*?:"<>|]', "", name)
 
-def get_chapter_number(chapter_dir):
+def iter_book_lines(book_text):
     """
-    Determine the next chapter number by counting existing chapter files in the directory.
-    
-    Returns:
-        int: Next chapter number (1-based index).
+    Yield the lines of the book text without line terminators.
+
+    book_text may be the complete text (str) or any iterable of lines, such as an open
+    file, which is then read one line at a time. Both yield exactly what
+    book_text.splitlines() would.
+    """
+    if isinstance(book_text, str):
+        yield from book_text.splitlines()
+        return
+    for raw_line in book_text:
+        yield from raw_line.splitlines()
+
+def subbook_folder_name(subbook_number, subbook_title):
+    """
+    Return the folder name of a subbook: its number, a hyphen and its sanitized title.
     """
-    existing_chapters = list(chapter_dir.glob("chapter*.txt"))
-    return len(existing_chapters) + 1
+    return f"{subbook_number}-{sanitize_filename(subbook_title)}"
 
-def extract_chapters(book_text, output_dir):
+def chapter_relative_path(record):
     """
-    Extract chapters (and subbooks, if present) from the book text.
+    Return the path, relative to the output directory, of the file a chapter record is written to.
+    """
+    filename = f"chapter{record['chapterNumber']}.txt"
+    if not record["subBookNumber"]:
+        return Path(filename)
+    return Path(subbook_folder_name(record["subBookNumber"], record["subBookTitle"])) / filename
+
+def chapter_file_text(record):
+    """
+    Return the text of a chapter file: the chapter title (title-cased), a blank line, then the content.
+    """
+    return title_case(record["chapterTitle"]) + "\n\n" + "\n".join(record["lines"]).strip() + "\n"
+
+def extract_chapters(book_text, on_subbook=None):
+    """
+    Extract chapters (and subbooks, if present) from the book text, yielding one chapter
+    record at a time.
 
     The program scans for:
       - Subbook markers: <!-- SUBBOOK: SubBook Title -->
       - Chapter markers:  <!-- CHAPTER: Chapter Title -->
-      
-    If a subbook marker is encountered, a new subbook folder is created (inside the output directory)
-    and subsequent chapters are written there. If no subbook markers are found, chapters are saved directly
-    to the output directory.
+
+    Each chapter is yielded as soon as the next marker (or the end of the text) is reached,
+    so only one chapter is held in memory at a time when book_text is an open file.
+    Chapters are numbered from 1 within each subbook; chapters that appear before the first
+    subbook marker belong to subbook 0.
 
     Parameters:
-        book_text (str): The complete cleaned book text.
-        output_dir (Path): Directory where chapter files will be saved.
-    
-    Returns:
-        bool: True if at least one subbook tag was detected; False otherwise.
+        book_text (str or iterable of str): The cleaned book text, or an open file / iterable of its lines.
+        on_subbook (callable, optional): Called with (subbook_number, subbook_title) for every subbook marker.
+
+    Yields:
+        dict: A chapter record with "subBookNumber", "subBookTitle" (None for subbook 0),
+              "chapterNumber", "chapterTitle" (as tagged) and "lines" (the chapter content,
+              without line terminators).
     """
-    # Ensure the output directory exists.
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Split the text into lines.
-    lines = book_text.splitlines()
-    
     current_subbook = None
     current_subbook_index = 0
     current_chapter = None
     chapter_lines = []
-    subbook_detected = False
-    
-    # The directory where the current chapter file will be written.
-    current_output_dir = output_dir
+    # Number of chapters extracted so far in each subbook.
+    chapter_counts = {}
 
-    def write_current_chapter(subbook_dir, chapter_title, chapter_lines):
+    def chapter_record(subbook_index, subbook_title, chapter_title, chapter_lines):
         """
-        Write the accumulated chapter content to a file in the given subbook directory.
-        The file is named 'chapterX.txt' where X is the next chapter number.
+        Number a finished chapter and return its record (or None if it has no title or content).
         """
         if not chapter_title or not chapter_lines:
-            return
-        chapter_number = get_chapter_number(subbook_dir)
-        filename = f"chapter{chapter_number}.txt"
-        file_path = subbook_dir / filename
-        with open(file_path, "w", encoding="utf-8") as f:
-            # Write the chapter title (title-cased), a blank line, then the content.
-            f.write(title_case(chapter_title) + "\n\n")
-            f.write("\n".join(chapter_lines).strip() + "\n")
-        logger.info(f"Saved Chapter: '{chapter_title}' as {file_path}")
+            return None
+        chapter_number = chapter_counts.get(subbook_index, 0) + 1
+        chapter_counts[subbook_index] = chapter_number
+        return {
+            "subBookNumber": subbook_index,
+            "subBookTitle": subbook_title,
+            "chapterNumber": chapter_number,
+            "chapterTitle": chapter_title,
+            "lines": chapter_lines
+        }
 
     # Process each line in the text.
-    for line in lines:
-        stripped_line = line.strip()
-        
+    for line in iter_book_lines(book_text):
+        # Classify marker lines (REF markers are chapter content).
+        marker = classify_marker(line.strip())
+        kind = marker[0] if marker else None
+
         # Check for a subbook tag.
-        subbook_match = re.match(r'<!--\s*SUBBOOK:\s*(.+?)\s*-->', stripped_line, re.IGNORECASE)
-        if subbook_match:
+        if kind == SUBBOOK:
             # If a chapter is in progress, finish it.
             if current_chapter is not None and chapter_lines:
-                write_current_chapter(current_output_dir, current_chapter, chapter_lines)
+                record = chapter_record(current_subbook_index, current_subbook, current_chapter, chapter_lines)
+                if record:
+                    yield record
                 chapter_lines = []
                 current_chapter = None
             
             # Record the subbook.
-            subbook_title = subbook_match.group(1).strip()
+            subbook_title = marker[1]
             current_subbook = subbook_title
             current_subbook_index += 1
-            subbook_detected = True
-            # Create a subdirectory for this subbook.
-            subbook_dir_name = f"{current_subbook_index}-{sanitize_filename(subbook_title)}"
-            current_output_dir = output_dir / subbook_dir_name
-            current_output_dir.mkdir(parents=True, exist_ok=True)
-            logger.info(f"Detected SubBook: '{subbook_title}'. Created directory: '{current_output_dir}'")
+            logger.info(f"Detected SubBook: '{subbook_title}'")
+            if on_subbook:
+                on_subbook(current_subbook_index, subbook_title)
             continue
         
         # Check for a chapter tag.
-        chapter_match = re.match(r'<!--\s*CHAPTER:\s*(.+?)\s*-->', stripped_line, re.IGNORECASE)
-        if chapter_match:
-            # If there's an ongoing chapter, write it out.
+        if kind == CHAPTER:
+            # If there's an ongoing chapter, finish it.
             if current_chapter is not None and chapter_lines:
-                write_current_chapter(current_output_dir, current_chapter, chapter_lines)
+                record = chapter_record(current_subbook_index, current_subbook, current_chapter, chapter_lines)
+                if record:
+                    yield record
                 chapter_lines = []
             # Start a new chapter.
-            current_chapter = chapter_match.group(1).strip()
+            current_chapter = marker[1]
             logger.info(f"Detected Chapter: '{current_chapter}'")
             continue
         
@@ -156,9 +184,49 @@ def extract_chapters(book_text, output_dir):
         if current_chapter is not None:
             chapter_lines.append(line)
     
-    # Write any remaining chapter.
+    # Finish any remaining chapter.
     if current_chapter is not None and chapter_lines:
-        write_current_chapter(current_output_dir, current_chapter, chapter_lines)
+        record = chapter_record(current_subbook_index, current_subbook, current_chapter, chapter_lines)
+        if record:
+            yield record
+
+def write_chapters(book_text, output_dir):
+    """
+    Extract chapters (and subbooks, if present) from the book text and write each one to a
+    chapter file.
+
+    For each chapter, a file 'chapterX.txt' is created with the following format:
+      - The first line is the chapter title (converted to title case).
+      - A blank line.
+      - The chapter content.
+
+    If a subbook marker is encountered, a new subbook folder is created (inside the output directory)
+    and subsequent chapters are written there. If no subbook markers are found, chapters are saved directly
+    to the output directory.
+
+    Parameters:
+        book_text (str or iterable of str): The cleaned book text, or an open file / iterable of its lines.
+        output_dir (Path): Directory where chapter files will be saved.
+    
+    Returns:
+        bool: True if at least one subbook tag was detected; False otherwise.
+    """
+    # Ensure the output directory exists.
+    output_dir.mkdir(parents=True, exist_ok=True)
+    subbook_detected = False
+
+    def create_subbook_dir(subbook_number, subbook_title):
+        nonlocal subbook_detected
+        subbook_detected = True
+        subbook_dir = output_dir / subbook_folder_name(subbook_number, subbook_title)
+        subbook_dir.mkdir(parents=True, exist_ok=True)
+        logger.info(f"Created directory: '{subbook_dir}'")
+
+    for record in extract_chapters(book_text, create_subbook_dir):
+        file_path = output_dir / chapter_relative_path(record)
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write(chapter_file_text(record))
+        logger.info(f"Saved Chapter: '{record['chapterTitle']}' as {file_path}")
     
     return subbook_detected
 
@@ -183,12 +251,9 @@ def main():
     
     output_dir = Path(args.output_dir)
     
-    # Read the entire book text.
+    # Extract chapters (and subbooks) from the text, reading it one line at a time.
     with open(book_text_path, "r", encoding="utf-8") as f:
-        book_text = f.read()
-    
-    # Extract chapters (and subbooks) from the text.
-    subbook_found = extract_chapters(book_text, output_dir)
+        subbook_found = write_chapters(f, output_dir)
     if not subbook_found:
         logger.info("No subbook tags detected; chapters have been saved directly in the output directory.")
     else:
@@ -12,6 +12,13 @@ It also maintains a continuous global sentence counter throughout the entire boo
 The output structure is as follows:
   {base_output_dir}/{language}/Content/{subbook_folder}/Chapter{chapter_number}/{filename}
 
+Runs are incremental: a build manifest ({base_output_dir}/{language}/{book_code}_{language}_manifest.json)
+records every chapter's input hash and sentence count, so unchanged chapters are not re-parsed
+(use --force to rebuild everything). It also records every chapter JSON's path, title,
+paragraph, sentence, word and character totals and content stamp (hash, size, modification
+time), from which 6-assemble_structure_json.py builds the structure without parsing the
+chapters.
+
 For example:
   The_Book_of_Mormon/
   └── en-US/
@@ -25,26 +32,66 @@ For example:
 
 Usage example:
     python 5-spacy_sentence_parser.py \
-        --input_dir "/path/to/chapter_texts" \
+        --input_dir "/path/to/chapter_texts" | --from_tagged_book "/path/to/tagged_book.txt" \
         --language "en-US" \
         --book_code "BOOKM" \
         --output_dir "/path/to/The_Book_of_Mormon" \
+        [--segmenter parser|senter|sentencizer|rules] \
+        [--batch_size 256] \
+        [--workers 4] \
+        [--cache_path "/path/to/segmentation_cache.sqlite"] \
+        [--deterministic_ids] \
+        [--json_style pretty|compact] \
+        [--force] \
+        [--use_daemon] \
         [--verbose]
+
+With --from_tagged_book, chapters are extracted in-process from the tagged book text (as
+4-chapter_subbook_extraction.py would split it), so the intermediate chapter files are not needed.
+The output is identical to running stage 4 and then this stage on its output folder.
+
+Warm segmentation daemon (keeps the loaded pipelines in memory between runs):
+    python 5-spacy_sentence_parser.py --serve [--segmenter parser] [--language "en-US"] [--daemon_socket PATH]
+    python 5-spacy_sentence_parser.py --stop_daemon [--daemon_socket PATH]
+Runs started with --use_daemon send chapter text to the daemon instead of loading spaCy,
+and parse in-process when no daemon is running.
 """
 
 import os
 import re
 import json
-import uuid
+import hashlib
 import argparse
+import importlib.util
 import logging
-from pathlib import Path
-import spacy
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path, PurePosixPath
+from rule_segmenter import RuleSegmenter, RULES_VERSION
+from segmentation_cache import SegmentationCache, DEFAULT_MAX_ENTRIES
+import content_ids
+from segmentation_daemon import SegmentationClient, DaemonUnavailable, default_socket_path, serve
+from chapter_json import ChapterJSONWriter, JSON_STYLES, DEFAULT_JSON_STYLE, file_stamp
+from content_model import Chapter, Paragraph, Sentence, load_chapter, write_chapter
+from marker_lexer import REF, classify_marker
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
+# spaCy model used for sentence segmentation.
+SPACY_MODEL = "en_core_web_sm"
+
+# Sentence segmentation pipelines selectable with --segmenter (see load_nlp).
+SEGMENTERS = ("parser", "senter", "sentencizer", "rules")
+DEFAULT_SEGMENTER = "parser"
+
+# Number of lines handed to nlp.pipe per batch.
+DEFAULT_BATCH_SIZE = 256
+
+# Format version of the incremental build manifest.
+MANIFEST_VERSION = 1
+
 def title_case(text):
     """
     Convert text to title case while preserving common lowercase words.
@@ -88,34 +135,61 @@ def parse_sentences(line, nlp):
     sentences = [sent.text.strip() for sent in doc.sents if sent.text.strip()]
     return sentences if sentences else [line.strip()]
 
-def process_chapter_file(chapter_file: Path, nlp, language: str, book_code: str, subbook_num: int, global_counter: dict) -> dict:
+def parse_sentences_batch(lines, nlp, batch_size=DEFAULT_BATCH_SIZE, cache=None):
     """
-    Process a single chapter text file and return a content JSON dictionary.
-    
-    The chapter file is assumed to have:
-      - The first line as the chapter title.
-      - The remainder as the chapter content.
-    
-    The function extracts paragraphs and sentences, assigns local and global sentence indices
-    using the passed mutable global counter, and generates an audio filename for each sentence.
-    
-    Reference Handling:
-      - Before any reference marker is encountered, sentences have an empty reference.
-      - Once a reference marker is encountered (a line like <!-- REF: ... -->),
-        that reference is applied to all subsequent sentences until a new marker is found.
-      - When the chapter is complete, the reference does not carry over.
-    
-    Parameters:
-      - chapter_file: Path to the chapter text file.
-      - nlp: Loaded spaCy model.
-      - language: Target language code (e.g., "en-US").
-      - book_code: Book code for generating audio filenames.
-      - subbook_num: The subbook number (extracted from the folder name or defaulted to 1).
-      - global_counter: A mutable dictionary holding the global sentence index.
-      
+    Segment many lines at once by streaming them through nlp.pipe.
+
+    Returns one list of sentences per input line, in the same order as the input,
+    applying the same fallback as parse_sentences (a line with no detected
+    sentences is kept whole).
+
+    If a SegmentationCache is given, it is consulted first and only the lines it
+    does not know are sent to the pipeline (and then added to the cache).
+    """
+    if cache is None:
+        results = []
+        for line, doc in zip(lines, nlp.pipe(lines, batch_size=batch_size)):
+            sentences = [sent.text.strip() for sent in doc.sents if sent.text.strip()]
+            results.append(sentences if sentences else [line.strip()])
+        return results
+    known = cache.get_many(lines)
+    missing = list(dict.fromkeys(line for line in lines if line not in known))
+    if missing:
+        segmented = dict(zip(missing, parse_sentences_batch(missing, nlp, batch_size)))
+        cache.put_many(segmented)
+        known.update(segmented)
+    return [known[line] for line in lines]
+
+def segmenter_fingerprint(nlp, segmenter: str) -> str:
+    """
+    Identify a loaded segmenter (engine, model name/version and library version) so that
+    cached segmentations are never reused across different segmenters or models.
+    """
+    if isinstance(nlp, RuleSegmenter):
+        return f"rules/{nlp.pack_name}/{RULES_VERSION}"
+    import spacy
+    meta = nlp.meta
+    return f"{segmenter}/{meta.get('lang')}_{meta.get('name')}-{meta.get('version')}/spacy-{spacy.__version__}"
+
+def read_chapter_file(chapter_file):
+    """
+    Read a chapter text file.
+
+    chapter_file may also be an in-memory chapter extracted from a tagged book (a dict with
+    "name", "text" and "chapterNumber", see plan_tagged_book), which is split into lines
+    exactly as if it had been read from its chapter file.
+
     Returns:
-      dict: Chapter content structured according to the unified JSON schema.
+      tuple: (lines, chapter_number), where the chapter number comes from the file name
+             ("chapterN.txt"), or None if the file is unreadable or empty.
     """
+    if isinstance(chapter_file, dict):
+        logger.info(f"Processing chapter: {chapter_file['name']}")
+        lines = chapter_file["text"].splitlines(keepends=True)
+        if not lines:
+            logger.warning(f"Chapter '{chapter_file['name']}' is empty.")
+            return None
+        return lines, chapter_file["chapterNumber"]
     logger.info(f"Processing chapter file: {chapter_file}")
     try:
         with open(chapter_file, "r", encoding="utf-8") as f:
@@ -128,6 +202,43 @@ def process_chapter_file(chapter_file: Path, nlp, language: str, book_code: str,
         logger.warning(f"Chapter file '{chapter_file}' is empty.")
         return None
 
+    chapter_num_match = re.search(r'chapter(\d+)\.txt$', chapter_file.name, re.IGNORECASE)
+    chapter_number = int(chapter_num_match.group(1)) if chapter_num_match else 0
+    return lines, chapter_number
+
+def segment_chapter_file(chapter_file: Path, nlp, batch_size: int = DEFAULT_BATCH_SIZE, cache=None) -> dict:
+    """
+    Read a chapter text file and segment it into paragraphs and sentences
+    (see segment_chapter_lines), or return None if the file is unreadable or empty.
+    """
+    chapter = read_chapter_file(chapter_file)
+    if not chapter:
+        return None
+    lines, chapter_number = chapter
+    return segment_chapter_lines(lines, chapter_number, nlp, batch_size, cache)
+
+def segment_chapter_lines(lines, chapter_number: int, nlp, batch_size: int = DEFAULT_BATCH_SIZE, cache=None) -> dict:
+    """
+    Segment the lines of a chapter into paragraphs and sentences. The first line is the
+    chapter title; the remainder is the chapter content.
+
+    This is the expensive, order-independent half of chapter processing: it resolves
+    reference markers and runs spaCy, but assigns no global indices, IDs or audio
+    filenames, so chapters can be segmented in any order (or in parallel).
+
+    Reference Handling:
+      - Before any reference marker is encountered, sentences have an empty reference.
+      - Once a reference marker is encountered (a line like <!-- REF: ... -->),
+        that reference is applied to all subsequent sentences until a new marker is found.
+      - When the chapter is complete, the reference does not carry over.
+
+    If a SegmentationCache is given, lines it already knows are not re-segmented.
+
+    Returns:
+      dict: A segmented chapter with "chapterNumber", "chapterTitle", "sentenceCount",
+            "cacheHits", "cacheMisses" and "paragraphs" (each with a "paragraphIndex" and a
+            list of "lines", where every line holds its "reference" and its "sentences").
+    """
     chapter_title = lines[0].strip()
     formatted_title = title_case(chapter_title)
     logger.info(f"Extracted chapter title: {formatted_title}")
@@ -136,27 +247,12 @@ def process_chapter_file(chapter_file: Path, nlp, language: str, book_code: str,
     paragraphs_text = parse_paragraphs(content)
     logger.info(f"Found {len(paragraphs_text)} paragraphs in chapter '{formatted_title}'")
     
-    chapter_num_match = re.search(r'chapter(\d+)\.txt$', chapter_file.name, re.IGNORECASE)
-    chapter_number = int(chapter_num_match.group(1)) if chapter_num_match else 0
-    
-    chapter_id = str(uuid.uuid4())
-    chapter_dict = {
-        "chapterID": chapter_id,
-        "language": language,
-        "chapterNumber": chapter_number,
-        "chapterTitle": formatted_title,
-        "paragraphs": []
-    }
-    
+    # First pass: resolve reference markers and collect every sentence-bearing line
+    # together with its paragraph index and the reference active at that point.
     # Initialize reference to empty for each chapter.
     current_reference = ""
+    pending_lines = []
     for para_index, para_text in enumerate(paragraphs_text, start=1):
-        paragraph_id = str(uuid.uuid4())
-        paragraph_dict = {
-            "paragraphID": paragraph_id,
-            "paragraphIndex": para_index,
-            "sentences": []
-        }
         para_lines = para_text.splitlines()
         # Do not clear current_reference after processing a sentence;
         # once set, it persists until a new marker is encountered.
@@ -165,15 +261,73 @@ def process_chapter_file(chapter_file: Path, nlp, language: str, book_code: str,
             if not line:
                 continue
             # Check for a reference marker.
-            ref_match = re.match(r'<!--\s*REF:\s*(.+?)\s*-->', line, re.IGNORECASE)
-            if ref_match:
-                current_reference = ref_match.group(1).strip()
+            marker = classify_marker(line)
+            if marker and marker[0] == REF:
+                current_reference = marker[1]
                 logger.debug(f"Found reference marker: {current_reference}")
                 # Do not clear current_reference; let it persist.
                 continue
-            sentence_texts = parse_sentences(line, nlp)
-            for local_idx, sent in enumerate(sentence_texts, start=1):
-                sentence_id = str(uuid.uuid4())
+            pending_lines.append((para_index, current_reference, line))
+
+    # Segment all of the chapter's lines in one batched spaCy call.
+    hits_before, misses_before = (cache.hits, cache.misses) if cache else (0, 0)
+    segmented_lines = parse_sentences_batch([line for _, _, line in pending_lines], nlp, batch_size, cache)
+
+    # Second pass: group the segmented lines back into their paragraphs.
+    segmented = {
+        "chapterNumber": chapter_number,
+        "chapterTitle": formatted_title,
+        "sentenceCount": 0,
+        "cacheHits": cache.hits - hits_before if cache else 0,
+        "cacheMisses": cache.misses - misses_before if cache else 0,
+        "paragraphs": []
+    }
+    paragraph = None
+    for (para_index, reference, _), sentence_texts in zip(pending_lines, segmented_lines):
+        if paragraph is None or paragraph["paragraphIndex"] != para_index:
+            paragraph = {"paragraphIndex": para_index, "lines": []}
+            segmented["paragraphs"].append(paragraph)
+        paragraph["lines"].append({"reference": reference, "sentences": sentence_texts})
+        segmented["sentenceCount"] += len(sentence_texts)
+    return segmented
+
+def new_chapter(segmented: dict, language: str, book_code: str, subbook_num: int,
+                deterministic_ids: bool = False) -> Chapter:
+    """
+    Return the Chapter (see content_model.py) of a segmented chapter, without its paragraphs.
+
+    With deterministic_ids, the chapter ID is derived from the book code and structural
+    position (see content_ids.py) instead of being random.
+    """
+    chapter_number = segmented["chapterNumber"]
+    return Chapter(
+        chapter_id=content_ids.chapter_id(book_code, subbook_num, chapter_number, deterministic_ids),
+        language=language,
+        chapter_number=chapter_number,
+        chapter_title=segmented["chapterTitle"]
+    )
+
+def iter_chapter_paragraphs(segmented: dict, language: str, book_code: str, subbook_num: int, global_counter: dict,
+                            deterministic_ids: bool = False):
+    """
+    Yield the Paragraphs of a segmented chapter (see segment_chapter_file), one at a time,
+    so they can be streamed to disk as they are produced.
+
+    This is the cheap, order-dependent half of chapter processing: it assigns IDs, local
+    and global sentence indices (advancing the passed mutable global counter) and the
+    audio filename of every sentence. Paragraphs without sentences are dropped.
+    """
+    chapter_number = segmented["chapterNumber"]
+    paragraph_count = 0
+    for paragraph in segmented["paragraphs"]:
+        para_index = paragraph["paragraphIndex"]
+        paragraph_id = content_ids.paragraph_id(book_code, subbook_num, chapter_number, para_index, deterministic_ids)
+        content_paragraph = Paragraph(paragraph_id, para_index)
+        for line in paragraph["lines"]:
+            # The sentence index restarts for every source line, as it always has.
+            for local_idx, sent in enumerate(line["sentences"], start=1):
+                sentence_id = content_ids.sentence_id(book_code, subbook_num, chapter_number, para_index,
+                                                      len(content_paragraph.sentences) + 1, deterministic_ids)
                 audio_filename = create_audio_filename(
                     sequential_index=global_counter["value"],
                     book_code=book_code,
@@ -183,25 +337,260 @@ def process_chapter_file(chapter_file: Path, nlp, language: str, book_code: str,
                     sentence_num=local_idx,
                     language=language
                 )
-                sentence_text = sent.strip()
-                sentence_dict = {
-                    "sentenceID": sentence_id,
-                    "sentenceIndex": local_idx,
-                    "globalSentenceIndex": global_counter["value"],
-                    "reference": current_reference,  # Use the current reference (may be empty initially)
-                    "text": sentence_text,
-                    "audioFile": audio_filename
-                }
-                paragraph_dict["sentences"].append(sentence_dict)
+                content_paragraph.sentences.append(Sentence(
+                    sentence_id=sentence_id,
+                    sentence_index=local_idx,
+                    global_index=global_counter["value"],
+                    reference=line["reference"],  # Use the current reference (may be empty initially)
+                    text=sent.strip(),
+                    audio_file=audio_filename
+                ))
                 logger.debug(f"Added sentence {local_idx} (global {global_counter['value']}) in paragraph {para_index}")
                 global_counter["value"] += 1
-        # When the paragraph is finished, the current_reference remains active (it will carry over to subsequent paragraphs in the chapter).
-        paragraph_dict["sentences"] and chapter_dict["paragraphs"].append(paragraph_dict)
-        logger.info(f"Added paragraph {para_index} with {len(paragraph_dict['sentences'])} sentences")
-    # At the end of the chapter, reset the current reference so it does not carry over.
-    current_reference = ""
-    logger.info(f"Finished processing chapter '{formatted_title}' with {len(chapter_dict['paragraphs'])} paragraphs")
-    return chapter_dict
+        logger.info(f"Added paragraph {para_index} with {len(content_paragraph.sentences)} sentences")
+        if content_paragraph.sentences:
+            paragraph_count += 1
+            yield content_paragraph
+    logger.info(f"Finished processing chapter '{segmented['chapterTitle']}' with {paragraph_count} paragraphs")
+
+def build_chapter(segmented: dict, language: str, book_code: str, subbook_num: int, global_counter: dict,
+                  deterministic_ids: bool = False) -> Chapter:
+    """
+    Turn a segmented chapter (see segment_chapter_file) into a complete Chapter.
+    """
+    chapter = new_chapter(segmented, language, book_code, subbook_num, deterministic_ids)
+    chapter.paragraphs = list(iter_chapter_paragraphs(segmented, language, book_code, subbook_num,
+                                                      global_counter, deterministic_ids))
+    return chapter
+
+def process_chapter_file(chapter_file: Path, nlp, language: str, book_code: str, subbook_num: int, global_counter: dict,
+                         batch_size: int = DEFAULT_BATCH_SIZE, deterministic_ids: bool = False) -> Chapter:
+    """
+    Process a single chapter text file and return its Chapter (see content_model.py).
+    
+    The chapter file is assumed to have:
+      - The first line as the chapter title.
+      - The remainder as the chapter content.
+    
+    The function extracts paragraphs and sentences, assigns local and global sentence indices
+    using the passed mutable global counter, and generates an audio filename for each sentence.
+    See segment_chapter_file for how reference markers are handled.
+    
+    Parameters:
+      - chapter_file: Path to the chapter text file.
+      - nlp: Loaded spaCy model.
+      - language: Target language code (e.g., "en-US").
+      - book_code: Book code for generating audio filenames.
+      - subbook_num: The subbook number (extracted from the folder name or defaulted to 1).
+      - global_counter: A mutable dictionary holding the global sentence index.
+      - batch_size: Number of lines per nlp.pipe batch when segmenting the chapter.
+      - deterministic_ids: Derive IDs from the book code and structural position instead of uuid4.
+      
+    Returns:
+      Chapter: Chapter content; Chapter.to_dict() gives the unified JSON schema.
+    """
+    segmented = segment_chapter_file(chapter_file, nlp, batch_size)
+    if not segmented:
+        return None
+    return build_chapter(segmented, language, book_code, subbook_num, global_counter, deterministic_ids)
+
+def load_nlp(segmenter: str = DEFAULT_SEGMENTER, language: str = "en-US"):
+    """
+    Load a spaCy pipeline containing only what sentence segmentation needs.
+
+    Only doc.sents is ever used, so unused components are excluded at load time:
+      - "parser": the trained model's dependency parser (most accurate, slowest).
+      - "senter": the trained model's lightweight statistical sentence recognizer.
+      - "sentencizer": a blank pipeline with spaCy's rule-based sentencizer (fastest,
+        no model download needed); its tokenizer is chosen from the language code.
+      - "rules": the dependency-free RuleSegmenter (see rule_segmenter.py), using the rule
+        pack for the language code. spaCy is not imported at all in this mode.
+    """
+    start = time.perf_counter()
+    if segmenter == "rules":
+        nlp = RuleSegmenter(language)
+        load_seconds = time.perf_counter() - start
+        logger.info(f"Loaded 'rules' segmenter (pipeline: {', '.join(nlp.pipe_names)}) in {load_seconds:.2f}s")
+        return nlp
+    # spaCy is imported lazily so the "rules" segmenter works without it installed.
+    import spacy
+    if segmenter == "parser":
+        nlp = spacy.load(SPACY_MODEL, exclude=["tagger", "attribute_ruler", "lemmatizer", "ner", "senter"])
+    elif segmenter == "senter":
+        nlp = spacy.load(SPACY_MODEL, exclude=["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner"])
+        nlp.enable_pipe("senter")
+    elif segmenter == "sentencizer":
+        nlp = spacy.blank(language.split("-")[0])
+        nlp.add_pipe("sentencizer")
+    else:
+        raise ValueError(f"Unknown segmenter '{segmenter}'; expected one of {', '.join(SEGMENTERS)}.")
+    load_seconds = time.perf_counter() - start
+    logger.info(f"Loaded '{segmenter}' segmenter (pipeline: {', '.join(nlp.pipe_names)}) in {load_seconds:.2f}s")
+    return nlp
+
+# Per-process state for --workers mode: each worker loads the model once.
+_worker_nlp = None
+_worker_batch_size = DEFAULT_BATCH_SIZE
+_worker_cache = None
+
+def _init_segmentation_worker(segmenter, language, batch_size, log_level, cache_path, cache_max_entries):
+    """
+    Process pool initializer: load the spaCy model (and open the shared cache) once for this worker process.
+    """
+    global _worker_nlp, _worker_batch_size, _worker_cache
+    logger.setLevel(log_level)
+    _worker_nlp = load_nlp(segmenter, language)
+    _worker_batch_size = batch_size
+    if cache_path:
+        _worker_cache = SegmentationCache(cache_path, cache_max_entries, segmenter_fingerprint(_worker_nlp, segmenter))
+
+def _segment_chapter_in_worker(chapter_file):
+    """
+    Segment one chapter file with the worker's resident model.
+    """
+    return segment_chapter_file(chapter_file, _worker_nlp, _worker_batch_size, _worker_cache)
+
+def iter_segmented_chapters(chapter_files, nlp, batch_size: int = DEFAULT_BATCH_SIZE, workers: int = 1,
+                            segmenter: str = DEFAULT_SEGMENTER, language: str = "en-US",
+                            cache_path=None, cache_max_entries: int = DEFAULT_MAX_ENTRIES, daemon=None):
+    """
+    Yield the segmented form of each chapter file, in the order given.
+
+    With a daemon (a SegmentationClient, see segmentation_daemon.py), chapters are segmented
+    by the warm daemon process and nlp and workers are not used; if the daemon stops
+    answering, the remaining chapters are segmented in-process.
+
+    With workers > 1, chapters are segmented in a process pool (each worker loads the
+    pipeline selected by segmenter/language once and nlp is not used); results are still
+    yielded in input order so the caller can number sentences sequentially.
+
+    If cache_path is given, a persistent SegmentationCache at that path is consulted before
+    segmenting any line and trimmed to cache_max_entries once all chapters are done.
+    """
+    if not chapter_files:
+        return
+    if daemon is not None:
+        yield from _iter_segmented_chapters_via_daemon(chapter_files, daemon, batch_size, segmenter, language,
+                                                       cache_path, cache_max_entries)
+        return
+    if workers <= 1:
+        cache = None
+        if cache_path:
+            cache = SegmentationCache(cache_path, cache_max_entries, segmenter_fingerprint(nlp, segmenter))
+        try:
+            for chapter_file in chapter_files:
+                yield segment_chapter_file(chapter_file, nlp, batch_size, cache)
+        finally:
+            if cache:
+                cache.close()
+        return
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_segmentation_worker,
+                                 initargs=(segmenter, language, batch_size, logger.level,
+                                           cache_path, cache_max_entries)) as executor:
+            yield from executor.map(_segment_chapter_in_worker, chapter_files)
+    finally:
+        if cache_path:
+            # The workers share the database; enforce the size bound once they are done.
+            SegmentationCache(cache_path, cache_max_entries).close()
+
+def _iter_segmented_chapters_via_daemon(chapter_files, daemon, batch_size, segmenter, language,
+                                        cache_path, cache_max_entries):
+    """
+    Yield the segmented form of each chapter file, segmented by the daemon, falling back to
+    in-process parsing for the remaining chapters as soon as a request fails.
+    """
+    request = {
+        "op": "segment",
+        "segmenter": segmenter,
+        "language": language,
+        "batchSize": batch_size,
+        "cachePath": str(Path(cache_path).resolve()) if cache_path else None,
+        "cacheMaxEntries": cache_max_entries
+    }
+    for position, chapter_file in enumerate(chapter_files):
+        chapter = read_chapter_file(chapter_file)
+        if not chapter:
+            yield None
+            continue
+        lines, chapter_number = chapter
+        try:
+            segmented = daemon.request(dict(request, lines=lines, chapterNumber=chapter_number))["segmented"]
+        except (DaemonUnavailable, RuntimeError) as e:
+            logger.warning(f"{e}; falling back to in-process parsing")
+            break
+        yield segmented
+    else:
+        if cache_path:
+            try:
+                daemon.request({"op": "evict"})
+            except (DaemonUnavailable, RuntimeError) as e:
+                logger.warning(f"Could not trim the daemon's segmentation cache: {e}")
+        return
+    nlp = load_nlp(segmenter, language)
+    yield from iter_segmented_chapters(chapter_files[position:], nlp, batch_size, 1, segmenter, language,
+                                       cache_path, cache_max_entries)
+
+class ResidentPipelines:
+    """
+    Request handler of the segmentation daemon (--serve).
+
+    Keeps every pipeline it loads (and every segmentation cache it opens) resident, keyed by
+    segmenter and language, so one daemon can serve several books and languages. Requests:
+      - {"op": "ping"}: returns the daemon's pid and loaded pipelines.
+      - {"op": "segment", "lines", "chapterNumber", "segmenter", "language", "batchSize",
+         "cachePath", "cacheMaxEntries"}: returns {"segmented": ...} (see segment_chapter_lines).
+      - {"op": "chapter", ... same as "segment", plus "bookCode", "subBookNumber",
+         "firstGlobalIndex", "deterministicIds"}: returns {"chapter": ...}, the chapter's
+         content JSON with sentences numbered from firstGlobalIndex.
+      - {"op": "evict"}: trims every open segmentation cache to its size bound.
+    """
+
+    def __init__(self):
+        self._pipelines = {}
+        self._caches = {}
+
+    def nlp(self, segmenter: str, language: str):
+        key = (segmenter, language)
+        if key not in self._pipelines:
+            self._pipelines[key] = load_nlp(segmenter, language)
+        return self._pipelines[key]
+
+    def cache(self, cache_path, cache_max_entries: int, segmenter: str, language: str):
+        if not cache_path:
+            return None
+        key = (cache_path, segmenter, language)
+        if key not in self._caches:
+            fingerprint = segmenter_fingerprint(self.nlp(segmenter, language), segmenter)
+            self._caches[key] = SegmentationCache(cache_path, cache_max_entries, fingerprint)
+        return self._caches[key]
+
+    def __call__(self, request: dict) -> dict:
+        op = request.get("op")
+        if op == "ping":
+            return {"pid": os.getpid(), "pipelines": [f"{segmenter}/{language}" for segmenter, language in self._pipelines]}
+        if op == "evict":
+            return {"evicted": sum(cache.evict() for cache in self._caches.values())}
+        if op not in ("segment", "chapter"):
+            raise ValueError(f"Unknown daemon request '{op}'")
+        segmenter = request.get("segmenter", DEFAULT_SEGMENTER)
+        language = request.get("language", "en-US")
+        nlp = self.nlp(segmenter, language)
+        cache = self.cache(request.get("cachePath"), request.get("cacheMaxEntries", DEFAULT_MAX_ENTRIES),
+                           segmenter, language)
+        segmented = segment_chapter_lines(request["lines"], request.get("chapterNumber", 0), nlp,
+                                          request.get("batchSize", DEFAULT_BATCH_SIZE), cache)
+        if op == "segment":
+            return {"segmented": segmented}
+        global_counter = {"value": request.get("firstGlobalIndex", 1)}
+        chapter = build_chapter(segmented, language, request["bookCode"], request.get("subBookNumber", 1),
+                                global_counter, request.get("deterministicIds", False))
+        return {"chapter": chapter.to_dict()}
+
+    def close(self):
+        for cache in self._caches.values():
+            cache.close()
+        self._caches = {}
 
 def get_subbook_info(chapter_file: Path, base_input_dir: Path):
     """
@@ -211,31 +600,42 @@ def get_subbook_info(chapter_file: Path, base_input_dir: Path):
     that folder name and number are returned; otherwise, return a default ("1-Default", 1).
     """
     try:
-        rel_path = chapter_file.relative_to(base_input_dir)
-        parts = rel_path.parts
-        if len(parts) > 1:
-            subbook_folder = parts[0]
-            match = re.match(r'^(\d+)-(.+)$', subbook_folder)
-            if match:
-                subbook_num = int(match.group(1))
-                return subbook_folder, subbook_num
+        return get_subbook_info_from_parts(chapter_file.relative_to(base_input_dir).parts)
     except Exception as e:
         logger.debug(f"Could not determine subbook info for {chapter_file}: {e}")
     return "1-Default", 1
 
-def process_all_chapter_files(base_input_dir: Path, nlp, language: str, book_code: str, base_output_dir: Path):
+def get_subbook_info_from_parts(parts):
     """
-    Recursively process all chapter text files under the base input directory and output the chapter JSON files
-    into a hierarchical folder structure.
-    
-    Output structure:
-      {base_output_dir}/{language}/Content/{subbook_folder}/Chapter{chapter_number}/{filename}
-    
-    For flat books (with no subbook folders in the input), a default subbook folder ("1-Default") is used.
-    A mutable global counter is maintained so that the global sentence index is continuous.
+    Determine the subbook folder name and number from the parts of a chapter file's relative path
+    (see get_subbook_info).
+    """
+    if len(parts) > 1:
+        subbook_folder = parts[0]
+        match = re.match(r'^(\d+)-(.+)$', subbook_folder)
+        if match:
+            subbook_num = int(match.group(1))
+            return subbook_folder, subbook_num
+    return "1-Default", 1
+
+def load_chapter_extraction():
+    """
+    Import 4-chapter_subbook_extraction.py as a module (its file name is not a valid module name).
+    """
+    path = Path(__file__).resolve().parent / "4-chapter_subbook_extraction.py"
+    spec = importlib.util.spec_from_file_location("chapter_subbook_extraction", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def plan_chapter_files(base_input_dir: Path):
+    """
+    List the chapter text files under base_input_dir in build order.
+
+    Returns:
+      list: One (chapter_file, rel_input, subbook_folder, subbook_num, chapter_number, input_hash)
+            tuple per chapter, where rel_input is the file's path relative to base_input_dir.
     """
-    global_counter = {"value": 1}
-    
     subbook_folders = [d for d in base_input_dir.iterdir() if d.is_dir() and re.match(r'^\d+-', d.name)]
     use_default_subbook = False
     if not subbook_folders:
@@ -245,6 +645,7 @@ def process_all_chapter_files(base_input_dir: Path, nlp, language: str, book_cod
     chapter_files = sorted(base_input_dir.rglob("chapter*.txt"))
     logger.info(f"Found {len(chapter_files)} chapter file(s) under {base_input_dir}")
     
+    chapters = []
     for chapter_file in chapter_files:
         if use_default_subbook:
             subbook_folder = "1-Default"
@@ -255,59 +656,437 @@ def process_all_chapter_files(base_input_dir: Path, nlp, language: str, book_cod
         chapter_num_match = re.search(r'chapter(\d+)\.txt$', chapter_file.name, re.IGNORECASE)
         chapter_number = int(chapter_num_match.group(1)) if chapter_num_match else 0
         
+        rel_input = chapter_file.relative_to(base_input_dir).as_posix()
+        try:
+            input_hash = hash_file(chapter_file)
+        except Exception as e:
+            logger.debug(f"Could not hash {chapter_file}: {e}")
+            input_hash = None
+        chapters.append((chapter_file, rel_input, subbook_folder, subbook_num, chapter_number, input_hash))
+    return chapters
+
+def plan_tagged_book(book_path: Path):
+    """
+    Extract the chapters of a tagged book in-process (with extract_chapters from
+    4-chapter_subbook_extraction.py) instead of reading the chapter files stage 4 writes.
+
+    Each chapter becomes an in-memory chapter (see read_chapter_file) holding exactly the text
+    of the chapter file stage 4 would have written. Chapters are ordered, hashed and assigned to
+    subbooks as plan_chapter_files would do for those files, so both modes produce identical output
+    and share the incremental build manifest. The chapter texts are held in memory.
+
+    Returns:
+      list: Same tuples as plan_chapter_files, with in-memory chapters instead of chapter files.
+    """
+    extraction = load_chapter_extraction()
+    chapters = []
+    subbook_detected = False
+
+    def note_subbook(subbook_number, subbook_title):
+        nonlocal subbook_detected
+        subbook_detected = True
+
+    with open(book_path, "r", encoding="utf-8") as f:
+        for record in extraction.extract_chapters(f, note_subbook):
+            rel_path = PurePosixPath(extraction.chapter_relative_path(record).as_posix())
+            text = extraction.chapter_file_text(record)
+            chapters.append((rel_path, text, record["chapterNumber"]))
+    logger.info(f"Extracted {len(chapters)} chapter(s) from {book_path}")
+    if not subbook_detected:
+        logger.info("No subbook markers detected in the tagged book; using default subbook.")
+    
+    planned = []
+    for rel_path, text, chapter_number in sorted(chapters, key=lambda chapter: chapter[0]):
+        if subbook_detected:
+            subbook_folder, subbook_num = get_subbook_info_from_parts(rel_path.parts)
+        else:
+            subbook_folder, subbook_num = "1-Default", 1
+        rel_input = rel_path.as_posix()
+        chapter = {"name": f"{book_path.name}:{rel_input}", "text": text, "chapterNumber": chapter_number}
+        planned.append((chapter, rel_input, subbook_folder, subbook_num, chapter_number, hash_text(text)))
+    return planned
+
+def hash_file(path: Path) -> str:
+    """
+    Return a content hash of a file, used to detect changed chapter inputs.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def hash_text(text: str) -> str:
+    """
+    Return the content hash (see hash_file) of a file holding text encoded as UTF-8.
+    """
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+def load_manifest(manifest_file: Path, settings: dict) -> dict:
+    """
+    Load the per-chapter entries of a build manifest written by a previous run.
+
+    Returns an empty dict (forcing a full rebuild) if the manifest is missing, unreadable,
+    or was produced with different settings (book code, language, segmenter or model).
+    """
+    if not manifest_file.exists():
+        return {}
+    try:
+        with open(manifest_file, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable manifest {manifest_file}: {e}")
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION or manifest.get("settings") != settings:
+        logger.info("Build settings changed since the last run; rebuilding every chapter.")
+        return {}
+    return manifest.get("chapters", {})
+
+def save_manifest(manifest_file: Path, settings: dict, chapters: dict):
+    """
+    Write the build manifest: the settings of this run and, per chapter input file (relative
+    path), its input hash, subbook number, output file, sentence count and first global index,
+    and for chapters with an output file its chapter title, paragraph count, word and character
+    counts and content stamp (see chapter_json.file_stamp).
+    """
+    manifest = {"version": MANIFEST_VERSION, "settings": settings, "chapters": chapters}
+    try:
+        manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(manifest_file, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=4, ensure_ascii=False)
+        logger.debug(f"Saved build manifest to {manifest_file}")
+    except Exception as e:
+        logger.error(f"Error writing manifest {manifest_file}: {e}")
+
+def count_text(sentence_texts) -> dict:
+    """
+    Return the "wordCount" (whitespace-separated words) and "characterCount" of sentence texts.
+    """
+    word_count = character_count = 0
+    for text in sentence_texts:
+        word_count += len(text.split())
+        character_count += len(text)
+    return {"wordCount": word_count, "characterCount": character_count}
+
+def chapter_manifest_fields(output_file_path: Path) -> dict:
+    """
+    Return the manifest fields describing an existing chapter JSON: its chapter title,
+    paragraph count, word and character counts (see count_text) and content stamp (see
+    chapter_json.file_stamp).
+    """
+    chapter = load_chapter(output_file_path)
+    return dict(chapterTitle=chapter.chapter_title, paragraphCount=len(chapter.paragraphs),
+                **count_text(sentence.text for sentence in chapter.iter_sentences()),
+                **file_stamp(output_file_path))
+
+def renumber_chapter_file(output_file_path: Path, first_index: int, book_code: str, subbook_num: int, language: str,
+                          json_style: str = DEFAULT_JSON_STYLE) -> bool:
+    """
+    Shift the globalSentenceIndex and audioFile of every sentence in an existing chapter JSON so
+    that the chapter starts at first_index. Everything else (text, IDs, references) is kept.
+    """
+    try:
+        chapter = load_chapter(output_file_path)
+        index = first_index
+        for paragraph in chapter.paragraphs:
+            for sentence in paragraph.sentences:
+                sentence.global_index = index
+                sentence.audio_file = create_audio_filename(
+                    sequential_index=index,
+                    book_code=book_code,
+                    subbook_num=subbook_num,
+                    chapter_num=chapter.chapter_number,
+                    paragraph_num=paragraph.paragraph_index,
+                    sentence_num=sentence.sentence_index,
+                    language=language
+                )
+                index += 1
+        write_chapter(output_file_path, chapter, json_style)
+        logger.info(f"Renumbered {output_file_path} to start at global sentence {first_index}")
+        return True
+    except Exception as e:
+        logger.error(f"Error renumbering JSON file {output_file_path}: {e}")
+        return False
+
+def process_all_chapter_files(base_input_dir: Path, nlp, language: str, book_code: str, base_output_dir: Path,
+                              batch_size: int = DEFAULT_BATCH_SIZE, workers: int = 1, segmenter: str = DEFAULT_SEGMENTER,
+                              cache_path=None, cache_max_entries: int = DEFAULT_MAX_ENTRIES, force: bool = False,
+                              deterministic_ids: bool = False, json_style: str = DEFAULT_JSON_STYLE, daemon=None,
+                              tagged_book=None):
+    """
+    Recursively process all chapter text files under the base input directory and output the chapter JSON files
+    into a hierarchical folder structure.
+    
+    Output structure:
+      {base_output_dir}/{language}/Content/{subbook_folder}/Chapter{chapter_number}/{filename}
+    
+    For flat books (with no subbook folders in the input), a default subbook folder ("1-Default") is used.
+    A mutable global counter is maintained so that the global sentence index is continuous.
+    
+    Processing happens in two phases: chapters are first segmented (in parallel when workers > 1),
+    then numbered and written sequentially in chapter order, so the output does not depend on the
+    number of workers. With cache_path, previously segmented lines are served from a persistent
+    cache and the hit/miss counts are reported at the end.
+    
+    Builds are incremental: a manifest ({base_output_dir}/{language}/{book_code}_{language}_manifest.json)
+    records each chapter's input hash and sentence count. Chapters whose input is unchanged are not
+    re-segmented; they are left untouched, or, when an earlier chapter's sentence count changed, only
+    their globalSentenceIndex and audioFile values are renumbered in place. Pass force=True to rebuild
+    every chapter.
+    
+    With deterministic_ids, chapter, paragraph and sentence IDs are uuid5 values derived from the book
+    code and structural position, so unchanged content is written byte-for-byte identically.
+    
+    Chapter JSON is streamed to disk paragraph by paragraph in the given json_style ("pretty" or
+    "compact", see chapter_json.py).
+    
+    With a daemon (a SegmentationClient), chapters are segmented by the warm daemon process.
+    
+    With tagged_book (the path of a tagged book text), chapters are extracted from it in-process
+    (see plan_tagged_book) and base_input_dir is not used.
+    """
+    global_counter = {"value": 1}
+    
+    if tagged_book is not None:
+        chapters = plan_tagged_book(tagged_book)
+    else:
+        chapters = plan_chapter_files(base_input_dir)
+    
+    language_dir = base_output_dir / language
+    manifest_file = language_dir / f"{book_code}_{language}_manifest.json"
+    settings = {
+        "bookCode": book_code,
+        "language": language,
+        "segmenter": segmenter,
+        "model": f"rules-{RULES_VERSION}" if segmenter == "rules" else SPACY_MODEL,
+        "deterministicIds": deterministic_ids,
+        "jsonStyle": json_style
+    }
+    previous_chapters = {} if force else load_manifest(manifest_file, settings)
+    manifest_chapters = {}
+    
+    # Plan the build: locate every chapter's output and decide which inputs changed.
+    jobs = []
+    for chapter_file, rel_input, subbook_folder, subbook_num, chapter_number, input_hash in chapters:
         # Construct output folder:
         # {base_output_dir}/{language}/Content/{subbook_folder}/Chapter{chapter_number}
         output_subdir = base_output_dir / language / "Content" / subbook_folder / f"Chapter{chapter_number}"
-        output_subdir.mkdir(parents=True, exist_ok=True)
-        
-        chapter_data = process_chapter_file(chapter_file, nlp, language, book_code, subbook_num, global_counter)
-        if not chapter_data:
-            continue
-        
         # Construct output filename: {book_code}_S{subbook_num}_C{chapter_number}_{language}.json
         output_filename = f"{book_code}_S{subbook_num}_C{chapter_number}_{language}.json"
         output_file_path = output_subdir / output_filename
         
+        entry = previous_chapters.get(rel_input)
+        unchanged = (
+            entry is not None
+            and input_hash is not None
+            and entry.get("inputHash") == input_hash
+            and entry.get("subBookNumber") == subbook_num
+            and entry.get("outputFile") == output_file_path.relative_to(language_dir).as_posix()
+            and (entry.get("sentenceCount", 0) == 0 or output_file_path.exists())
+        )
+        jobs.append((chapter_file, rel_input, input_hash, subbook_num, output_file_path, entry if unchanged else None))
+    
+    for rel_input in previous_chapters.keys() - {job[1] for job in jobs}:
+        logger.warning(f"Chapter input '{rel_input}' no longer exists; its previous output was left in place.")
+    
+    start = time.perf_counter()
+    total_sentences = 0
+    cache_hits = 0
+    cache_misses = 0
+    unchanged_count = 0
+    renumbered_count = 0
+    to_segment = [job[0] for job in jobs if job[5] is None]
+    segmented_chapters = iter_segmented_chapters(to_segment, nlp, batch_size, workers, segmenter, language,
+                                                 cache_path, cache_max_entries, daemon)
+    for chapter_file, rel_input, input_hash, subbook_num, output_file_path, entry in jobs:
+        output_file_path.parent.mkdir(parents=True, exist_ok=True)
+        first_index = global_counter["value"]
+        
+        if entry is not None:
+            # Unchanged input: skip it, renumbering in place if earlier chapters shifted.
+            renumber = entry["sentenceCount"] and entry.get("firstGlobalIndex") != first_index
+            entry = dict(entry, firstGlobalIndex=first_index)
+            if renumber:
+                if not renumber_chapter_file(output_file_path, first_index, book_code, subbook_num, language,
+                                             json_style):
+                    # Keep the numbering of the following chapters consistent.
+                    global_counter["value"] = first_index + entry["sentenceCount"]
+                    continue
+                renumbered_count += 1
+                entry.update(file_stamp(output_file_path))
+            else:
+                unchanged_count += 1
+                logger.debug(f"Unchanged chapter {rel_input}; skipped")
+            if entry["sentenceCount"] and ("contentHash" not in entry or "wordCount" not in entry):
+                # Entry written before the manifest recorded chapter totals: fill them in once.
+                try:
+                    entry.update(chapter_manifest_fields(output_file_path))
+                except Exception as e:
+                    logger.warning(f"Could not read chapter totals from {output_file_path}: {e}")
+            global_counter["value"] += entry["sentenceCount"]
+            manifest_chapters[rel_input] = entry
+            continue
+        
+        segmented = next(segmented_chapters)
+        manifest_entry = {
+            "inputHash": input_hash,
+            "subBookNumber": subbook_num,
+            "outputFile": output_file_path.relative_to(language_dir).as_posix(),
+            "sentenceCount": 0,
+            "firstGlobalIndex": first_index
+        }
+        if not segmented:
+            if input_hash is not None:
+                manifest_chapters[rel_input] = manifest_entry
+            continue
+        total_sentences += segmented["sentenceCount"]
+        cache_hits += segmented["cacheHits"]
+        cache_misses += segmented["cacheMisses"]
+        chapter = new_chapter(segmented, language, book_code, subbook_num, deterministic_ids)
+        
         try:
-            with open(output_file_path, "w", encoding="utf-8") as json_file:
-                json.dump(chapter_data, json_file, indent=4, ensure_ascii=False)
-            logger.info(f"Saved content JSON for {chapter_file} as {output_file_path}")
+            # Stream the paragraphs to disk as they are numbered.
+            sentence_texts = []
+            with ChapterJSONWriter(output_file_path, chapter.header_dict(), json_style) as writer:
+                for paragraph in iter_chapter_paragraphs(segmented, language, book_code, subbook_num,
+                                                         global_counter, deterministic_ids):
+                    sentence_texts.extend(sentence.text for sentence in paragraph.sentences)
+                    writer.write_paragraph(paragraph.to_dict())
+            logger.info(f"Saved content JSON for {rel_input} as {output_file_path}")
+            manifest_entry["sentenceCount"] = segmented["sentenceCount"]
+            manifest_entry["chapterTitle"] = chapter.chapter_title
+            manifest_entry["paragraphCount"] = writer.paragraph_count
+            manifest_entry.update(count_text(sentence_texts))
+            manifest_entry.update(file_stamp(output_file_path))
+            manifest_chapters[rel_input] = manifest_entry
         except Exception as e:
             logger.error(f"Error writing JSON file {output_file_path}: {e}")
+            # Keep the numbering of the following chapters consistent.
+            global_counter["value"] = first_index + segmented["sentenceCount"]
+    segmented_chapters.close()
+    
+    save_manifest(manifest_file, settings, manifest_chapters)
+    
+    elapsed = time.perf_counter() - start
+    rate = total_sentences / elapsed if elapsed > 0 else 0.0
+    logger.info(f"Segmented {len(to_segment)} chapter(s), renumbered {renumbered_count}, "
+                f"left {unchanged_count} unchanged")
+    logger.info(f"Segmented {total_sentences} sentences with the '{segmenter}' segmenter in {elapsed:.2f}s "
+                f"({rate:.0f} sentences/sec)")
+    if cache_path:
+        logger.info(f"Segmentation cache: {cache_hits} hits, {cache_misses} misses")
 
 def main():
     parser = argparse.ArgumentParser(
         description="Process all chapter text files to produce content JSONs in a hierarchical folder structure."
     )
-    parser.add_argument('--input_dir', type=str, required=True,
+    parser.add_argument('--input_dir', type=str,
                         help='Base directory containing chapter text files (and subbook folders, if any).')
-    parser.add_argument('--language', type=str, required=True,
+    parser.add_argument('--from_tagged_book', type=str, default=None,
+                        help='Tagged book text (the input of 4-chapter_subbook_extraction.py) to extract chapters from '
+                             'in-process, instead of reading chapter files from --input_dir.')
+    parser.add_argument('--language', type=str,
                         help='Target language code for the output JSON files (e.g., "en-US").')
-    parser.add_argument('--book_code', type=str, required=True,
+    parser.add_argument('--book_code', type=str,
                         help='Book code used for naming the output files (e.g., "BOOKM").')
-    parser.add_argument('--output_dir', type=str, required=True,
+    parser.add_argument('--output_dir', type=str,
                         help='Base directory where the output folder structure will be created (i.e., the book-level folder).')
+    parser.add_argument('--batch_size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'Number of lines segmented per spaCy nlp.pipe batch (default: {DEFAULT_BATCH_SIZE}).')
+    parser.add_argument('--segmenter', choices=SEGMENTERS, default=DEFAULT_SEGMENTER,
+                        help='Sentence segmentation pipeline: "parser" (dependency parser), "senter" (statistical '
+                             'sentence recognizer), "sentencizer" (rule-based, blank pipeline) or "rules" '
+                             '(dependency-free rule-based segmenter, no spaCy needed). Default: "parser".')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of worker processes used to segment chapters in parallel (default: 1, no pool).')
+    parser.add_argument('--cache_path', type=str, default=None,
+                        help='SQLite file used to cache sentence segmentation across runs (disabled if omitted).')
+    parser.add_argument('--cache_max_entries', type=int, default=DEFAULT_MAX_ENTRIES,
+                        help=f'Maximum number of cached lines; least recently used entries are evicted '
+                             f'(default: {DEFAULT_MAX_ENTRIES}).')
+    parser.add_argument('--deterministic_ids', action='store_true',
+                        help='Derive chapter, paragraph and sentence IDs (uuid5) from the book code and structural '
+                             'position instead of generating random UUIDs, so unchanged content yields identical JSON.')
+    parser.add_argument('--json_style', choices=JSON_STYLES, default=DEFAULT_JSON_STYLE,
+                        help='Chapter JSON layout: "pretty" (4-space indent) or "compact" (no whitespace, uses '
+                             'orjson/msgspec when installed). Default: "pretty".')
+    parser.add_argument('--force', action='store_true',
+                        help='Re-segment every chapter, ignoring the incremental build manifest.')
+    parser.add_argument('--serve', action='store_true',
+                        help='Run as a warm segmentation daemon on --daemon_socket, keeping loaded pipelines in memory '
+                             '(the --segmenter/--language pipeline is loaded at startup).')
+    parser.add_argument('--use_daemon', action='store_true',
+                        help='Segment chapters with a running daemon (see --serve); falls back to in-process parsing '
+                             'when no daemon answers.')
+    parser.add_argument('--stop_daemon', action='store_true', help='Stop the daemon listening on --daemon_socket.')
+    parser.add_argument('--daemon_socket', type=str, default=None,
+                        help=f'Unix socket of the segmentation daemon (default: {default_socket_path()}).')
     parser.add_argument('--verbose', action='store_true', help='Enable verbose logging.')
     args = parser.parse_args()
     
     if args.verbose:
         logger.setLevel(logging.DEBUG)
     
-    base_input_dir = Path(args.input_dir)
+    if args.stop_daemon:
+        try:
+            SegmentationClient(args.daemon_socket).request({"op": "shutdown"})
+            logger.info("Segmentation daemon stopped")
+        except (DaemonUnavailable, RuntimeError) as e:
+            logger.error(str(e))
+        return
+    
+    if args.serve:
+        pipelines = ResidentPipelines()
+        try:
+            pipelines.nlp(args.segmenter, args.language or "en-US")
+            serve(args.daemon_socket, pipelines)
+        except Exception as e:
+            logger.error(f"Segmentation daemon failed: {e}")
+        finally:
+            pipelines.close()
+        return
+    
+    missing = [f"--{name}" for name in ("language", "book_code", "output_dir") if not getattr(args, name)]
+    if not args.input_dir and not args.from_tagged_book:
+        missing.insert(0, "--input_dir (or --from_tagged_book)")
+    if missing:
+        parser.error(f"the following arguments are required: {', '.join(missing)}")
+    
+    base_input_dir = Path(args.input_dir) if args.input_dir else None
     base_output_dir = Path(args.output_dir)
+    tagged_book = Path(args.from_tagged_book) if args.from_tagged_book else None
     
-    if not base_input_dir.exists() or not base_input_dir.is_dir():
+    if tagged_book is not None:
+        if not tagged_book.is_file():
+            logger.error(f"Tagged book file '{tagged_book}' does not exist.")
+            return
+    elif not base_input_dir.exists() or not base_input_dir.is_dir():
         logger.error(f"Input directory '{base_input_dir}' does not exist or is not a directory.")
         return
     
-    try:
-        nlp = spacy.load("en_core_web_sm")
-        logger.debug("Loaded spaCy model 'en_core_web_sm'")
-    except Exception as e:
-        logger.error(f"Error loading spaCy model: {e}")
-        return
+    daemon = None
+    if args.use_daemon:
+        daemon = SegmentationClient(args.daemon_socket)
+        status = daemon.ping()
+        if status is None:
+            logger.warning(f"No segmentation daemon running on {daemon.socket_path}; parsing in-process")
+            daemon = None
+        else:
+            logger.info(f"Using segmentation daemon (pid {status['pid']}) on {daemon.socket_path}")
+    
+    # In --workers mode each worker process loads its own copy of the model; with a daemon, none is loaded here.
+    nlp = None
+    if args.workers <= 1 and daemon is None:
+        try:
+            nlp = load_nlp(args.segmenter, args.language)
+        except Exception as e:
+            logger.error(f"Error loading spaCy model: {e}")
+            return
     
-    process_all_chapter_files(base_input_dir, nlp, args.language, args.book_code, base_output_dir)
+    process_all_chapter_files(base_input_dir, nlp, args.language, args.book_code, base_output_dir,
+                              args.batch_size, args.workers, args.segmenter,
+                              args.cache_path, args.cache_max_entries, args.force, args.deterministic_ids,
+                              args.json_style, daemon, tagged_book)
 
 if __name__ == "__main__":
     main()
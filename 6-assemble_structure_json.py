@@ -29,6 +29,37 @@ The unified structure JSON contains:
 The program accepts an output directory parameter (--output_dir) where the unified structure JSON file will be saved.
 The actual filename is determined by convention using the book code (e.g., "BOOKM_structure.json").
 
+The chapter titles and totals come from the build manifest of the sentence parser stage
+({language}/{book_code}_{language}_manifest.json, next to the Content folder) when it exists:
+a chapter JSON is only parsed when its manifest entry is stale, i.e. the file's content stamp
+(hash, size, modification time) no longer matches the one recorded by the parser. Chapter files
+the manifest does not record (such as the output of since-removed inputs) are not included.
+Without a manifest (or with --no_manifest), every chapter JSON is read: the chapter folders are
+listed with os.scandir and the chapter files are read by a pool of threads (--workers), each
+counting paragraphs and sentences in a single streaming pass over the raw bytes, without
+decoding the JSON into objects (see count_chapter_totals).
+
+With --statistics, every chapter and subbook also gets per-language statistics for progress
+and time estimates: totalWords and totalCharacters (language -> count in its sentence texts)
+and, for the languages with generated audio, audioDuration (language -> seconds). They are
+gathered in the same pass as the totals: the native language's counts come from the build
+manifest (or the streaming count of its chapter JSON), the other languages' chapter JSON files
+are counted the same way, and the durations are read from the frame headers of the chapter's
+ADTS AAC files in {language}/Audio (see aac_duration.py). Subbook statistics are the sums of
+those of its chapters.
+
+With --update, the structure JSON already in --output_dir is updated instead of replaced: its
+bookID, subBookID and chapterID values are kept (subbooks are matched by number and chapters by
+subbook and chapter number, so only new subbooks and chapters get new IDs), chapters whose
+content changed get their new title and totals, and the file is only rewritten if its content
+changed. With the build manifest, only the chapters whose content changed are parsed.
+
+With --paged, the structure is split so a reader can open a large book without loading every
+chapter: the structure JSON becomes an index holding the book metadata and the subbook list,
+where each subbook has a totalChapters count and a subBookFile instead of its chapters, and
+each subbook object (chapters and contentReferences as in the unified structure) is written
+to its own file, SubBooks/{book_code}_S{subbook_number}_subbook.json, next to the index.
+--update reads the subbook files of a paged structure and rewrites only those that changed.
 
 Usage Notes for assemble_structure_json.py:
 
@@ -56,83 +87,295 @@ Usage example:
         --default_playback_order "en-US,es-ES,fr-FR" \
         --input_dir "/path/to/The_Book_ofMormon/en-US/Content" \
         --output_dir "/path/to/The_Book_ofMormon" \
+        [--manifest "/path/to/The_Book_ofMormon/en-US/BOOKM_en-US_manifest.json" | --no_manifest] \
+        [--workers 8] \
+        [--statistics] \
+        [--update] \
+        [--paged] \
+        [--deterministic_ids] \
+        [--json_style pretty|compact] \
         [--verbose]
 """
 
+import os
 import re
 import json
-import uuid
 import argparse
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import content_ids
+from chapter_json import encode, write_json, stamp_is_current, JSON_STYLES, DEFAULT_JSON_STYLE
+from aac_duration import aac_file_duration
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
+# Every paragraph object of a chapter JSON has a "paragraphID" key and every sentence object a
+# "sentenceID" key. Inside a JSON string a quote is always escaped, so these byte sequences only
+# occur as keys (all supported JSON styles write no whitespace before the colon).
+PARAGRAPH_KEY = b'"paragraphID":'
+SENTENCE_KEY = b'"sentenceID":'
+CHAPTER_TITLE = re.compile(rb'"chapterTitle":\s*("(?:[^"\\]|\\.)*")')
+# Likewise, only sentence objects have a "text" key.
+TEXT_KEY = b'"text":'
+SENTENCE_TEXT = re.compile(rb'"text":\s*"((?:[^"\\]|\\.)*)"')
+READ_BLOCK_SIZE = 1 << 20
+
+# Per-language statistics of chapters and subbooks (--statistics), see chapter_statistics.
+STATISTICS_KEYS = ("totalWords", "totalCharacters", "audioDuration")
+
+# Folder of the subbook files of a paged structure, next to the structure index.
+SUBBOOK_PAGES_DIR = "SubBooks"
+
 def sanitize_filename(name):
     """Remove or replace characters that are invalid in file or directory names."""
     return re.sub(r'[\\/*?:"<>|]', "", name)
 
-def extract_chapter_metadata(chapter_file: Path, book_code: str) -> dict:
+def read_chapter_totals(chapter_file: Path, count_text: bool = False) -> dict:
     """
-    Extract chapter metadata from a chapter JSON file.
-    Assumes that the chapter JSON file (produced by the sentence parser stage) contains a "chapterTitle" field
-    and a "paragraphs" array.
+    Parse a chapter JSON file and return its "chapterTitle" (as written), "totalParagraphs"
+    (length of the "paragraphs" array) and "totalSentences" (sum of the lengths of the
+    "sentences" arrays in each paragraph). With count_text, also its "totalWords"
+    (whitespace-separated words) and "totalCharacters" in the text of all sentences, counted as
+    in the sentence parser's build manifest.
+    """
+    with open(chapter_file, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    paragraphs = data.get("paragraphs", [])
+    totals = {
+        "chapterTitle": data.get("chapterTitle", ""),
+        "totalParagraphs": len(paragraphs),
+        "totalSentences": sum(len(para.get("sentences", [])) for para in paragraphs)
+    }
+    if count_text:
+        texts = [sentence.get("text", "") for para in paragraphs for sentence in para.get("sentences", [])]
+        totals["totalWords"] = sum(len(text.split()) for text in texts)
+        totals["totalCharacters"] = sum(len(text) for text in texts)
+    return totals
+
+def count_chapter_totals(chapter_file: Path, count_text: bool = False) -> dict:
+    """
+    Return the same totals as read_chapter_totals, counted in one streaming pass over the
+    file's bytes instead of decoding the JSON: paragraphs and sentences are counted by their
+    ID keys, and only the chapter title (in the header, before the paragraphs) and, with
+    count_text, the sentence texts are decoded.
+    Falls back to read_chapter_totals if the title is not in the first block of the file.
+    """
+    counts = {PARAGRAPH_KEY: 0, SENTENCE_KEY: 0}
+    chapter_title = None
+    previous_block = b""
+    text_tail = b""
+    words = characters = 0
+    with open(chapter_file, "rb") as f:
+        for block in iter(lambda: f.read(READ_BLOCK_SIZE), b""):
+            if chapter_title is None:
+                match = CHAPTER_TITLE.search(block)
+                if match is None:
+                    return read_chapter_totals(chapter_file, count_text)
+                chapter_title = json.loads(match.group(1))
+            for key in counts:
+                # Prefix the end of the previous block to count keys split across blocks (a
+                # prefix shorter than the key cannot hold a key counted before).
+                counts[key] += (previous_block[len(previous_block) - len(key) + 1:] + block).count(key)
+            previous_block = block
+            if count_text:
+                text_tail += block
+                end = 0
+                for match in SENTENCE_TEXT.finditer(text_tail):
+                    raw = match.group(1)
+                    text = json.loads(b'"' + raw + b'"') if b"\\" in raw else raw.decode("utf-8")
+                    words += len(text.split())
+                    characters += len(text)
+                    end = match.end()
+                # Carry a text that continues in the next block, or the end of the block (which
+                # may hold the start of a "text" key), over to the next block.
+                start = text_tail.rfind(TEXT_KEY, end)
+                text_tail = text_tail[start if start != -1 else max(end, len(text_tail) - len(TEXT_KEY) + 1):]
+    if chapter_title is None:
+        return read_chapter_totals(chapter_file, count_text)
+    totals = {
+        "chapterTitle": chapter_title,
+        "totalParagraphs": counts[PARAGRAPH_KEY],
+        "totalSentences": counts[SENTENCE_KEY]
+    }
+    if count_text:
+        totals["totalWords"] = words
+        totals["totalCharacters"] = characters
+    return totals
+
+def scan_chapter_files(directory: Path, book_code: str, recursive: bool = True) -> list:
+    """
+    List the chapter JSON files ({book_code}_S{n}_C{n}_*.json) in a directory (and, if recursive,
+    its subdirectories) with os.scandir, in sorted order.
+    """
+    pattern = re.compile(rf"^{re.escape(book_code)}_S\d+_C\d+_.*\.json$", re.IGNORECASE)
+    chapter_files = []
+    pending = [str(directory)]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        pending.append(entry.path)
+                elif entry.is_file() and pattern.match(entry.name):
+                    chapter_files.append(Path(entry.path))
+    return sorted(chapter_files)
+
+def chapter_numbers(chapter_file: Path, book_code: str):
+    """
+    Return the subbook and chapter numbers of a chapter JSON file from its name,
+    {book_code}_S{subbook_num}_C{chapter_number}_{language}.json (1 and 0 if it does not match).
+    """
+    pattern = re.compile(rf"^{re.escape(book_code)}_S(\d+)_C(\d+)_.*\.json$", re.IGNORECASE)
+    match = pattern.search(chapter_file.name)
+    return (int(match.group(1)), int(match.group(2))) if match else (1, 0)
+
+def chapter_audio_duration(audio_dir: Path, book_code: str, subbook_number: int, chapter_number: int,
+                           language: str):
+    """
+    Return the total duration in seconds of the sentence audio files of a chapter in a language
+    (named as by the sentence parser, {index}_{book_code}_S{n}_C{n}_P{n}_S{n}_{language}.aac) found
+    in audio_dir, or None if there are none. Unreadable audio files are logged and skipped.
+    """
+    if not audio_dir.is_dir():
+        return None
+    pattern = re.compile(rf"^\d+_{re.escape(book_code)}_S{subbook_number}_C{chapter_number}_P\d+_S\d+_"
+                         rf"{re.escape(language)}\.aac$")
+    seconds = None
+    with os.scandir(audio_dir) as entries:
+        for entry in entries:
+            if not pattern.match(entry.name):
+                continue
+            try:
+                seconds = (seconds or 0.0) + aac_file_duration(entry.path)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable audio file: {e}")
+    return seconds
+
+def chapter_statistics(chapter_file: Path, totals: dict, content_dir: Path, languages: list, book_code: str) -> dict:
+    """
+    Return the per-language statistics of a chapter:
+      - totalWords and totalCharacters: language -> count in the chapter's sentence texts, for the
+        languages whose chapter JSON exists,
+      - audioDuration: language -> total duration in seconds (rounded to milliseconds) of the
+        chapter's sentence audio files, for the languages that have audio files for it.
+
+    chapter_file is the chapter JSON of the native language, in content_dir (the native language's
+    Content folder, {book_dir}/{language}/Content), and totals its totals including the word and
+    character counts (see read_chapter_totals). The chapter JSON of every other language is read
+    from the same relative folder of {book_dir}/{language}/Content, and the audio files of every
+    language from that folder of {book_dir}/{language}/Audio (see 8-audio-generation.py).
+    """
+    native_language = content_dir.parent.name
+    book_dir = content_dir.parent.parent
+    relative_dir = chapter_file.parent.relative_to(content_dir)
+    subbook_number, chapter_number = chapter_numbers(chapter_file, book_code)
+    statistics = {key: {} for key in STATISTICS_KEYS}
+    for lang in languages:
+        if lang == native_language:
+            lang_totals = totals
+        else:
+            lang_file = (book_dir / lang / "Content" / relative_dir /
+                         f"{book_code}_S{subbook_number}_C{chapter_number}_{lang}.json")
+            try:
+                lang_totals = count_chapter_totals(lang_file, count_text=True) if lang_file.is_file() else None
+            except Exception as e:
+                logger.error(f"Error processing chapter file {lang_file}: {e}")
+                lang_totals = None
+        if lang_totals is not None:
+            statistics["totalWords"][lang] = lang_totals["totalWords"]
+            statistics["totalCharacters"][lang] = lang_totals["totalCharacters"]
+        seconds = chapter_audio_duration(book_dir / lang / "Audio" / relative_dir, book_code, subbook_number,
+                                         chapter_number, lang)
+        if seconds is not None:
+            statistics["audioDuration"][lang] = round(seconds, 3)
+    return statistics
+
+def add_subbook_statistics(subbook: dict):
+    """
+    Add the per-language statistics of a subbook (see chapter_statistics), the sums of those of
+    its chapters, before its chapters.
+    """
+    chapters = subbook.pop("chapters")
+    for key in STATISTICS_KEYS:
+        sums = {}
+        for chapter in chapters:
+            for lang, value in chapter.get(key, {}).items():
+                sums[lang] = sums.get(lang, 0) + value
+        subbook[key] = {lang: round(value, 3) for lang, value in sums.items()} if key == "audioDuration" else sums
+    subbook["chapters"] = chapters
+
+def chapter_metadata(chapter_file: Path, totals: dict, book_code: str, deterministic_ids: bool = False,
+                     statistics: dict = None) -> dict:
+    """
+    Build the metadata of a chapter from its totals (see read_chapter_totals) and, if given, its
+    statistics (see chapter_statistics).
     
     It infers the chapter number from the filename using the new naming convention:
       {book_code}_S{subbook_num}_C{chapter_number}_{language}.json
     
     Returns a dictionary with:
-      - chapterID: a new UUID,
+      - chapterID: a new UUID (or, with deterministic_ids, a uuid5 derived from the book code,
+        subbook number and chapter number, matching the chapterID written by the sentence parser),
       - chapterNumber: inferred from the filename (defaulting to 0 if not found),
       - chapterTitle: the title (converted to title case),
-      - totalParagraphs: number of paragraphs (length of the "paragraphs" array),
-      - totalSentences: computed by summing the lengths of the "sentences" arrays in each paragraph,
+      - totalParagraphs: number of paragraphs,
+      - totalSentences: number of sentences,
+      - totalWords, totalCharacters and audioDuration: the statistics, if given,
       - contentReferences: an empty dictionary to be filled later.
     """
+    formatted_title = totals["chapterTitle"].strip().title()
+    subbook_number, chapter_number = chapter_numbers(chapter_file, book_code)
+    
+    return {
+        "chapterID": content_ids.chapter_id(book_code, subbook_number, chapter_number, deterministic_ids),
+        "chapterNumber": chapter_number,
+        "chapterTitle": formatted_title,
+        "totalParagraphs": totals["totalParagraphs"],
+        "totalSentences": totals["totalSentences"],
+        **(statistics or {}),
+        "contentReferences": {}  # To be populated for each language.
+    }
+
+def extract_chapter_metadata(chapter_file: Path, book_code: str, deterministic_ids: bool = False,
+                             content_dir: Path = None, languages: list = None) -> dict:
+    """
+    Extract chapter metadata (see chapter_metadata) from a chapter JSON file.
+    Assumes that the chapter JSON file (produced by the sentence parser stage) contains a "chapterTitle" field
+    and a "paragraphs" array.
+    With content_dir (the Content folder of the chapter file), the chapter's statistics in the
+    given languages are included (see chapter_statistics).
+    """
     try:
-        with open(chapter_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        chapter_title = data.get("chapterTitle", "").strip()
-        formatted_title = chapter_title.title()
-        paragraphs = data.get("paragraphs", [])
-        total_paragraphs = len(paragraphs)
-        total_sentences = sum(len(para.get("sentences", [])) for para in paragraphs)
-        # Use the new naming convention to extract the chapter number.
-        # Expected pattern: {book_code}_S\d+_C(\d+)_.*\.json$
-        pattern = re.compile(rf"^{re.escape(book_code)}_S\d+_C(\d+)_.*\.json$", re.IGNORECASE)
-        match = pattern.search(chapter_file.name)
-        chapter_number = int(match.group(1)) if match else 0
-        
-        return {
-            "chapterID": str(uuid.uuid4()),
-            "chapterNumber": chapter_number,
-            "chapterTitle": formatted_title,
-            "totalParagraphs": total_paragraphs,
-            "totalSentences": total_sentences,
-            "contentReferences": {}  # To be populated for each language.
-        }
+        totals = count_chapter_totals(chapter_file, count_text=content_dir is not None)
+        statistics = None
+        if content_dir is not None:
+            statistics = chapter_statistics(chapter_file, totals, content_dir, languages, book_code)
+        return chapter_metadata(chapter_file, totals, book_code, deterministic_ids, statistics)
     except Exception as e:
         logger.error(f"Error processing chapter file {chapter_file}: {e}")
         return None
 
-def assemble_subbook(subbook_dir: Path, languages: list, book_code: str) -> dict:
+def extract_chapters_metadata(chapter_files: list, book_code: str, deterministic_ids: bool = False,
+                              executor: ThreadPoolExecutor = None, content_dir: Path = None,
+                              languages: list = None) -> list:
     """
-    Assemble metadata for a subbook by scanning a subdirectory containing chapter JSON files.
-    
-    Expects that the subbook folder name starts with a numeric prefix followed by a dash (e.g., "1-Introduction").
-    
-    Returns a dictionary with:
-      - subBookID: generated UUID,
-      - subBookNumber: extracted numeric prefix,
-      - subBookTitle: the remainder of the folder name,
-      - chapters: a list of chapter metadata dictionaries.
-      
-    The contentReferences for each chapter are built using the naming convention:
-      {book_code}_S{subbook_number}_C{chapter_number}_{language}.json
+    Extract the metadata of several chapter files (see extract_chapter_metadata), in order,
+    reading them in parallel on the executor's threads when one is given.
+    """
+    def extract(chapter_file):
+        return extract_chapter_metadata(chapter_file, book_code, deterministic_ids, content_dir, languages)
+    if executor is None:
+        return [extract(chapter_file) for chapter_file in chapter_files]
+    return list(executor.map(extract, chapter_files))
+
+def new_subbook(subbook_name: str, book_code: str, deterministic_ids: bool = False) -> dict:
+    """
+    Return a subbook (without chapters) for a subbook folder name with a numeric prefix followed
+    by a dash (e.g., "1-Introduction"); other names give subbook 1, "Default".
     """
-    subbook_name = subbook_dir.name
     match = re.match(r'^(\d+)-(.+)$', subbook_name)
     if match:
         subbook_number = int(match.group(1))
@@ -141,47 +384,175 @@ def assemble_subbook(subbook_dir: Path, languages: list, book_code: str) -> dict
         subbook_number = 1
         subbook_title = "Default"
     
-    subbook = {
-        "subBookID": str(uuid.uuid4()),
+    return {
+        "subBookID": content_ids.subbook_id(book_code, subbook_number, deterministic_ids),
         "subBookNumber": subbook_number,
         "subBookTitle": subbook_title,
         "chapters": []
     }
+
+def add_content_references(chapter_meta: dict, languages: list, book_code: str, subbook_number: int):
+    """
+    Fill in the contentReferences of a chapter: {book_code}_S{subbook_number}_C{chapter_number}_{language}.json
+    """
+    for lang in languages:
+        chapter_meta["contentReferences"][lang] = f"{book_code}_S{subbook_number}_C{chapter_meta['chapterNumber']}_{lang}.json"
+
+def assemble_subbook(subbook_dir: Path, languages: list, book_code: str, deterministic_ids: bool = False,
+                     executor: ThreadPoolExecutor = None, statistics: bool = False) -> dict:
+    """
+    Assemble metadata for a subbook by scanning a subdirectory containing chapter JSON files.
+    
+    Expects that the subbook folder name starts with a numeric prefix followed by a dash (e.g., "1-Introduction").
+    
+    Returns a dictionary with:
+      - subBookID: generated UUID (deterministic uuid5 with deterministic_ids),
+      - subBookNumber: extracted numeric prefix,
+      - subBookTitle: the remainder of the folder name,
+      - chapters: a list of chapter metadata dictionaries.
+      
+    The contentReferences for each chapter are built using the naming convention:
+      {book_code}_S{subbook_number}_C{chapter_number}_{language}.json
+    
+    With statistics, the subbook and its chapters get their per-language statistics (see
+    chapter_statistics and add_subbook_statistics).
+    """
+    subbook = new_subbook(subbook_dir.name, book_code, deterministic_ids)
     
     # Search recursively for chapter JSON files in the subbook folder.
-    # Use a pattern that matches our new naming convention.
+    chapter_files = scan_chapter_files(subbook_dir, book_code)
+    content_dir = subbook_dir.parent if statistics else None
+    for chapter_meta in extract_chapters_metadata(chapter_files, book_code, deterministic_ids, executor,
+                                                  content_dir, languages):
+        if chapter_meta:
+            add_content_references(chapter_meta, languages, book_code, subbook["subBookNumber"])
+            subbook["chapters"].append(chapter_meta)
+    subbook["chapters"].sort(key=lambda c: c["chapterNumber"])
+    if statistics:
+        add_subbook_statistics(subbook)
+    return subbook
+
+def default_manifest_path(input_dir: Path, book_code: str) -> Path:
+    """
+    Return the path of the build manifest the sentence parser writes next to the Content folder:
+      {language}/{book_code}_{language}_manifest.json
+    """
+    language_dir = input_dir.resolve().parent
+    return language_dir / f"{book_code}_{language_dir.name}_manifest.json"
+
+def load_manifest_chapters(manifest_file: Path, input_dir: Path, book_code: str):
+    """
+    Read the chapter entries of the sentence parser's build manifest, grouped by subbook folder.
+    
+    Returns:
+      dict: subbook folder name -> list of (chapter_file, manifest entry), or None if the manifest
+            is missing or unreadable, or records chapter files that are not in a numbered subbook
+            folder of input_dir (the folders are then scanned instead).
+    """
+    if not manifest_file.is_file():
+        logger.info(f"No build manifest at {manifest_file}; parsing every chapter.")
+        return None
+    try:
+        with open(manifest_file, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable manifest {manifest_file}: {e}")
+        return None
+    
+    manifest_dir = manifest_file.resolve().parent
+    input_dir = input_dir.resolve()
     pattern = re.compile(rf"^{re.escape(book_code)}_S\d+_C\d+_.*\.json$", re.IGNORECASE)
-    chapter_files = sorted([f for f in subbook_dir.rglob("*") if f.is_file() and pattern.match(f.name)])
-    for chapter_file in chapter_files:
-        chapter_meta = extract_chapter_metadata(chapter_file, book_code)
+    grouped = {}
+    for entry in manifest.get("chapters", {}).values():
+        if not entry.get("outputFile"):
+            continue
+        chapter_file = manifest_dir / entry["outputFile"]
+        try:
+            parts = chapter_file.relative_to(input_dir).parts
+        except ValueError:
+            parts = ()
+        if len(parts) < 2 or not re.match(r'^\d+-', parts[0]) or not pattern.match(chapter_file.name):
+            logger.info(f"Manifest {manifest_file} does not describe the chapters of {input_dir}; "
+                        f"parsing every chapter.")
+            return None
+        grouped.setdefault(parts[0], []).append((chapter_file, entry))
+    return grouped
+
+def assemble_subbook_from_manifest(subbook_dir: Path, chapter_entries: list, languages: list, book_code: str,
+                                   deterministic_ids: bool = False, manifest_counts: dict = None,
+                                   executor: ThreadPoolExecutor = None, statistics: bool = False) -> dict:
+    """
+    Assemble metadata for a subbook (see assemble_subbook) from the manifest entries of its chapters
+    (see load_manifest_chapters) instead of scanning and parsing its chapter files.
+    
+    A chapter file is only parsed when its manifest entry is stale: it records no content stamp or
+    the file no longer matches it (see chapter_json.stamp_is_current), or, with statistics, it
+    records no word and character counts. Entries whose chapter file does not exist are skipped.
+    If given, manifest_counts ({"current": 0, "stale": 0}) is updated with the number of chapters
+    taken from the manifest and parsed. Chapters are processed on the executor's threads when one
+    is given.
+    """
+    subbook = new_subbook(subbook_dir.name, book_code, deterministic_ids)
+    counts = manifest_counts if manifest_counts is not None else {"current": 0, "stale": 0}
+    content_dir = subbook_dir.parent if statistics else None
+    
+    def build(chapter_entry):
+        chapter_file, entry = chapter_entry
+        if stamp_is_current(chapter_file, entry) and (not statistics or "wordCount" in entry):
+            totals = {
+                "chapterTitle": entry.get("chapterTitle", ""),
+                "totalParagraphs": entry.get("paragraphCount", 0),
+                "totalSentences": entry.get("sentenceCount", 0)
+            }
+            language_statistics = None
+            if statistics:
+                totals["totalWords"] = entry["wordCount"]
+                totals["totalCharacters"] = entry.get("characterCount", 0)
+                language_statistics = chapter_statistics(chapter_file, totals, content_dir, languages, book_code)
+            return chapter_metadata(chapter_file, totals, book_code, deterministic_ids, language_statistics), "current"
+        if chapter_file.is_file():
+            logger.debug(f"Stale manifest entry for {chapter_file}; parsing it")
+            return extract_chapter_metadata(chapter_file, book_code, deterministic_ids, content_dir, languages), "stale"
+        return None, None
+    
+    chapter_entries = sorted(chapter_entries, key=lambda chapter_entry: chapter_entry[0])
+    results = executor.map(build, chapter_entries) if executor is not None else map(build, chapter_entries)
+    for chapter_meta, source in results:
+        if source is None:
+            continue
+        counts[source] += 1
         if chapter_meta:
-            for lang in languages:
-                chapter_meta["contentReferences"][lang] = f"{book_code}_S{subbook_number}_C{chapter_meta['chapterNumber']}_{lang}.json"
+            add_content_references(chapter_meta, languages, book_code, subbook["subBookNumber"])
             subbook["chapters"].append(chapter_meta)
     subbook["chapters"].sort(key=lambda c: c["chapterNumber"])
+    if statistics:
+        add_subbook_statistics(subbook)
     return subbook
 
-def assemble_flat_chapters(input_dir: Path, languages: list, book_code: str) -> list:
+def assemble_flat_chapters(input_dir: Path, languages: list, book_code: str, deterministic_ids: bool = False,
+                           executor: ThreadPoolExecutor = None, statistics: bool = False) -> list:
     """
     Assemble metadata for a non-hierarchical book (i.e., no subbook folders) by scanning chapter JSON files.
     
     Returns a list of chapter metadata dictionaries. For a flat book, we assume a default subbook number of 1.
     The contentReferences for each chapter are built using the naming convention:
       {book_code}_S1_C{chapter_number}_{language}.json
+    With statistics, the chapters get their per-language statistics (see chapter_statistics).
     """
     chapters = []
-    pattern = re.compile(rf"^{re.escape(book_code)}_S\d+_C\d+_.*\.json$", re.IGNORECASE)
-    chapter_files = sorted([f for f in input_dir.glob("*") if f.is_file() and pattern.match(f.name)])
-    for chapter_file in chapter_files:
-        chapter_meta = extract_chapter_metadata(chapter_file, book_code)
+    chapter_files = scan_chapter_files(input_dir, book_code, recursive=False)
+    content_dir = input_dir if statistics else None
+    for chapter_meta in extract_chapters_metadata(chapter_files, book_code, deterministic_ids, executor,
+                                                  content_dir, languages):
         if chapter_meta:
-            for lang in languages:
-                chapter_meta["contentReferences"][lang] = f"{book_code}_S1_C{chapter_meta['chapterNumber']}_{lang}.json"
+            add_content_references(chapter_meta, languages, book_code, 1)
             chapters.append(chapter_meta)
     chapters.sort(key=lambda c: c["chapterNumber"])
     return chapters
 
-def assemble_structure_json(book_metadata: dict, input_dir: Path, languages: list, book_code: str) -> dict:
+def assemble_structure_json(book_metadata: dict, input_dir: Path, languages: list, book_code: str,
+                            deterministic_ids: bool = False, manifest_file: Path = None, workers: int = None,
+                            statistics: bool = False) -> dict:
     """
     Assemble the unified structure JSON for the book.
 
@@ -190,12 +561,20 @@ def assemble_structure_json(book_metadata: dict, input_dir: Path, languages: lis
       - input_dir: folder containing chapter JSON files and subbook folders.
       - languages: list of language codes available for the book.
       - book_code: the book code, used for constructing contentReferences filenames.
+      - deterministic_ids: derive bookID, subBookID and chapterID (uuid5) from the book code and
+        structural position instead of generating random UUIDs (see content_ids.py).
+      - manifest_file: build manifest of the sentence parser to take chapter titles and totals
+        from (see load_manifest_chapters), or None to parse every chapter file.
+      - workers: number of threads reading chapter files that are not taken from the manifest
+        (default: ThreadPoolExecutor's default; 1 reads them sequentially).
+      - statistics: add the per-language word and character counts and audio durations of every
+        chapter and subbook (see chapter_statistics and add_subbook_statistics).
 
     Returns:
       dict: The unified structure JSON.
     """
     structure = {
-        "bookID": str(uuid.uuid4()),
+        "bookID": content_ids.book_id(book_code, deterministic_ids),
         "bookTitle": book_metadata.get("bookTitle", ""),
         "author": book_metadata.get("author", ""),
         "languages": languages,
@@ -205,27 +584,149 @@ def assemble_structure_json(book_metadata: dict, input_dir: Path, languages: lis
         "defaultPlaybackOrder": book_metadata.get("defaultPlaybackOrder", languages)
     }
     
+    # Chapter files that are not taken from the manifest are read by a pool of threads.
+    executor = ThreadPoolExecutor(max_workers=workers) if workers != 1 else None
     # Look for subbook folders (names starting with a numeric prefix).
     subbook_dirs = [d for d in input_dir.iterdir() if d.is_dir() and re.match(r'^\d+-', d.name)]
     if subbook_dirs:
         subbooks = []
         subbook_dirs = sorted(subbook_dirs, key=lambda d: int(re.match(r'^(\d+)-', d.name).group(1)))
+        manifest_chapters = load_manifest_chapters(manifest_file, input_dir, book_code) if manifest_file else None
+        manifest_counts = {"current": 0, "stale": 0}
         for subbook_dir in subbook_dirs:
-            subbook = assemble_subbook(subbook_dir, languages, book_code)
+            if manifest_chapters is not None:
+                subbook = assemble_subbook_from_manifest(subbook_dir, manifest_chapters.get(subbook_dir.name, []),
+                                                         languages, book_code, deterministic_ids, manifest_counts,
+                                                         executor, statistics)
+            else:
+                subbook = assemble_subbook(subbook_dir, languages, book_code, deterministic_ids, executor, statistics)
             subbooks.append(subbook)
         structure["subBooks"] = subbooks
+        if manifest_chapters is not None:
+            logger.info(f"Took {manifest_counts['current']} chapter(s) from the build manifest, "
+                        f"parsed {manifest_counts['stale']} stale one(s)")
     else:
         # If no subbook folders are detected, assume a default subbook folder.
-        chapters = assemble_flat_chapters(input_dir, languages, book_code)
+        chapters = assemble_flat_chapters(input_dir, languages, book_code, deterministic_ids, executor, statistics)
         structure["subBooks"] = [{
-            "subBookID": str(uuid.uuid4()),
+            "subBookID": content_ids.subbook_id(book_code, 1, deterministic_ids),
             "subBookNumber": 1,
             "subBookTitle": "Default",
             "chapters": chapters
         }]
+        if statistics:
+            add_subbook_statistics(structure["subBooks"][0])
     
+    if executor is not None:
+        executor.shutdown()
     return structure
 
+def subbook_page_name(book_code: str, subbook_number: int) -> str:
+    """
+    Return the path of a subbook file of a paged structure, relative to the structure index:
+      SubBooks/{book_code}_S{subbook_number}_subbook.json
+    """
+    return f"{SUBBOOK_PAGES_DIR}/{book_code}_S{subbook_number}_subbook.json"
+
+def page_structure(structure: dict, book_code: str):
+    """
+    Split a structure JSON into a structure index and one page per subbook.
+
+    The index holds the book metadata and, for every subbook, its subBookID, subBookNumber,
+    subBookTitle, totalChapters, statistics (if any) and subBookFile (the path of its page
+    relative to the index, see subbook_page_name). A page is the subbook object of the full structure, chapters and
+    contentReferences included.
+
+    Returns:
+      tuple: (index, dict of subBookFile -> page).
+    """
+    index = {key: value for key, value in structure.items() if key != "subBooks"}
+    index["subBooks"] = []
+    pages = {}
+    for subbook in structure["subBooks"]:
+        page_name = subbook_page_name(book_code, subbook["subBookNumber"])
+        index["subBooks"].append({
+            "subBookID": subbook["subBookID"],
+            "subBookNumber": subbook["subBookNumber"],
+            "subBookTitle": subbook["subBookTitle"],
+            "totalChapters": len(subbook["chapters"]),
+            **{key: subbook[key] for key in STATISTICS_KEYS if key in subbook},
+            "subBookFile": page_name
+        })
+        pages[page_name] = subbook
+    return index, pages
+
+def load_existing_structure(structure_file: Path):
+    """
+    Read a structure JSON written by a previous run, or return None if there is none or it is
+    unreadable. The subbook pages of a paged structure (see page_structure) are read back into
+    their subbooks; a missing page gives a subbook without chapters.
+    """
+    if not structure_file.is_file():
+        logger.info(f"No existing structure JSON at {structure_file}; writing a new one.")
+        return None
+    try:
+        with open(structure_file, "r", encoding="utf-8") as f:
+            structure = json.load(f)
+        for position, subbook in enumerate(structure.get("subBooks", [])):
+            if "subBookFile" not in subbook:
+                continue
+            page_file = structure_file.parent / subbook["subBookFile"]
+            if page_file.is_file():
+                with open(page_file, "r", encoding="utf-8") as f:
+                    structure["subBooks"][position] = json.load(f)
+            else:
+                structure["subBooks"][position] = dict(subbook, chapters=[])
+        return structure
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable structure JSON {structure_file}: {e}")
+        return None
+
+def write_json_if_changed(path: Path, obj, style: str) -> bool:
+    """
+    Write obj to path as JSON (see chapter_json.write_json) unless the file already holds
+    exactly these bytes.
+
+    Returns:
+      bool: True if the file was written.
+    """
+    if path.is_file() and path.read_bytes() == encode(obj, style):
+        return False
+    write_json(path, obj, style)
+    return True
+
+def keep_existing_ids(structure: dict, existing: dict) -> dict:
+    """
+    Carry the IDs of an existing structure JSON over to a newly assembled one, in place: the
+    bookID, the subBookID of every subbook with the same subBookNumber, and the chapterID of every
+    chapter with the same subBookNumber and chapterNumber. New subbooks and chapters keep their
+    new IDs.
+
+    Returns:
+      dict: Number of chapters "unchanged", "changed" (title, totals or contentReferences differ),
+            "added" and "removed" with respect to the existing structure.
+    """
+    counts = {"unchanged": 0, "changed": 0, "added": 0, "removed": 0}
+    structure["bookID"] = existing.get("bookID", structure["bookID"])
+    existing_subbooks = {subbook.get("subBookNumber"): subbook for subbook in existing.get("subBooks", [])}
+    for subbook in structure["subBooks"]:
+        existing_subbook = existing_subbooks.pop(subbook["subBookNumber"], None)
+        if existing_subbook is None:
+            counts["added"] += len(subbook["chapters"])
+            continue
+        subbook["subBookID"] = existing_subbook.get("subBookID", subbook["subBookID"])
+        existing_chapters = {chapter.get("chapterNumber"): chapter for chapter in existing_subbook.get("chapters", [])}
+        for chapter in subbook["chapters"]:
+            existing_chapter = existing_chapters.pop(chapter["chapterNumber"], None)
+            if existing_chapter is None:
+                counts["added"] += 1
+                continue
+            chapter["chapterID"] = existing_chapter.get("chapterID", chapter["chapterID"])
+            counts["unchanged" if chapter == existing_chapter else "changed"] += 1
+        counts["removed"] += len(existing_chapters)
+    counts["removed"] += sum(len(subbook.get("chapters", [])) for subbook in existing_subbooks.values())
+    return counts
+
 def main():
     parser = argparse.ArgumentParser(
         description="Assemble a unified structure JSON for a book by scanning the chapter JSON files folder."
@@ -243,6 +744,28 @@ def main():
                         help='Path to the folder containing chapter JSON files (and subbook folders, if any).')
     parser.add_argument('--output_dir', type=str, required=True,
                         help='Directory where the unified structure JSON file will be saved.')
+    parser.add_argument('--manifest', type=str, default=None,
+                        help='Build manifest of the sentence parser stage to take chapter titles and totals from '
+                             '(default: {language}/{book_code}_{language}_manifest.json next to --input_dir).')
+    parser.add_argument('--no_manifest', action='store_true',
+                        help='Parse every chapter JSON instead of using the build manifest.')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Number of threads reading chapter files (default: ThreadPoolExecutor default; '
+                             '1 reads them sequentially).')
+    parser.add_argument('--deterministic_ids', action='store_true',
+                        help='Derive bookID, subBookID and chapterID (uuid5) from the book code and structural position '
+                             'instead of generating random UUIDs, so unchanged content yields identical JSON.')
+    parser.add_argument('--statistics', action='store_true',
+                        help='Add the word and character counts and audio duration of every chapter and subbook, '
+                             'per language.')
+    parser.add_argument('--update', action='store_true',
+                        help='Update the existing structure JSON in --output_dir: keep its bookID, subBookID and chapterID '
+                             'values and only rewrite the file if its content changed.')
+    parser.add_argument('--paged', action='store_true',
+                        help='Write a structure index with the book metadata and subbook list, and the chapters of '
+                             'every subbook to its own file in a SubBooks folder next to it.')
+    parser.add_argument('--json_style', choices=JSON_STYLES, default=DEFAULT_JSON_STYLE,
+                        help='Structure JSON layout: "pretty" (4-space indent) or "compact" (no whitespace). Default: "pretty".')
     parser.add_argument('--verbose', action='store_true', help='Enable verbose logging.')
     
     args = parser.parse_args()
@@ -270,17 +793,57 @@ def main():
         logger.error(f"Input directory '{input_dir}' does not exist or is not a directory.")
         return
     
-    structure = assemble_structure_json(book_metadata, input_dir, languages, args.book_code)
+    if args.no_manifest:
+        manifest_file = None
+    elif args.manifest:
+        manifest_file = Path(args.manifest)
+    else:
+        manifest_file = default_manifest_path(input_dir, args.book_code)
+    
+    structure = assemble_structure_json(book_metadata, input_dir, languages, args.book_code, args.deterministic_ids,
+                                        manifest_file, args.workers, args.statistics)
     
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
     output_filename = f"{args.book_code}_structure.json"
     output_file_path = output_dir / output_filename
-    
+
+    if args.update:
+        existing = load_existing_structure(output_file_path)
+        if existing is not None:
+            counts = keep_existing_ids(structure, existing)
+            logger.info(f"Kept the existing IDs: {counts['unchanged']} chapter(s) unchanged, {counts['changed']} changed, "
+                        f"{counts['added']} added, {counts['removed']} removed")
+
+    # The subbook pages are written before the index, so the index never refers to a missing page.
+    if args.paged:
+        index, pages = page_structure(structure, args.book_code)
+        output_files = [(output_dir / page_name, page) for page_name, page in pages.items()]
+        output_files.append((output_file_path, index))
+    else:
+        output_files = [(output_file_path, structure)]
+
     try:
-        with open(output_file_path, "w", encoding="utf-8") as out_file:
-            json.dump(structure, out_file, indent=4, ensure_ascii=False)
-        logger.info(f"Unified structure JSON successfully saved to '{output_file_path}'.")
+        if args.paged:
+            pages_dir = output_dir / SUBBOOK_PAGES_DIR
+            pages_dir.mkdir(exist_ok=True)
+            for page_file in pages_dir.glob(f"{args.book_code}_S*_subbook.json"):
+                if f"{SUBBOOK_PAGES_DIR}/{page_file.name}" not in pages:
+                    page_file.unlink()
+        written = 0
+        for path, obj in output_files:
+            if args.update:
+                written += write_json_if_changed(path, obj, args.json_style)
+            else:
+                write_json(path, obj, args.json_style)
+                written += 1
+        if not written:
+            logger.info(f"Unified structure JSON '{output_file_path}' is up to date; not rewritten.")
+        elif args.paged:
+            logger.info(f"Paged structure JSON successfully saved to '{output_file_path}' and '{pages_dir}' "
+                        f"({written} of {len(output_files)} file(s) written).")
+        else:
+            logger.info(f"Unified structure JSON successfully saved to '{output_file_path}'.")
     except Exception as e:
         logger.error(f"Error writing structure JSON: {e}")
 
@@ -26,24 +26,44 @@ Usage example:
         --output_dir "/path/to/The_Book_of_Mormon" \
         --native_language "en-US" \
         --target_languages "es-ES,fr-FR" \
+        [--concurrency 8] \
+        [--base_url "http://localhost:8000/v1"] \
+        [--json_style pretty|compact] \
         [--verbose]
 
+Sentences are translated concurrently: every sentence of a chapter, in every target language, is
+an independent request, and up to --concurrency requests are in flight at once on a thread pool
+sharing one OpenAI client (and its connection pool). Each translation is stored in its own
+sentence, and a chapter's files are only written once all of its translations are done, so the
+output does not depend on the concurrency or on the order in which responses arrive.
+--concurrency 1 translates one sentence at a time, as before.
+
+--base_url points the client at another OpenAI-compatible chat completions endpoint, such as a
+local stand-in server for testing.
+
 Requirements:
-  - Set the OPENAI_API_KEY environment variable with your OpenAI API key.
+  - Set the OPENAI_API_KEY environment variable with your OpenAI API key (it may be omitted with
+    --base_url, for endpoints that do not check it).
 """
 
 import os
 import re
-import json
+import time
 import argparse
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from openai import OpenAI
+from chapter_json import JSON_STYLES, DEFAULT_JSON_STYLE
+from content_model import load_chapter, write_chapter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
+# Default number of translation requests in flight at once.
+DEFAULT_CONCURRENCY = 8
+
 def sanitize_filename(name):
     """
     Replace spaces and other problematic characters in the name to make it suitable for filenames.
@@ -85,20 +105,20 @@ def process_sentence(sentence, native_language_code, target_language, language_m
     Also update the "audioFile" field by replacing the native language code with the target language code.
     
     Parameters:
-        sentence (dict): A dictionary representing a sentence.
+        sentence (Sentence): The sentence to update (see content_model.py).
         native_language_code (str): The native language code (e.g., "en-US").
         target_language (str): The target language code (e.g., "es-ES").
         language_map (dict): Mapping from language codes to full language names.
         client (OpenAI): An instance of the OpenAI client.
     """
-    text_field = sentence.get("text", "")
+    text_field = sentence.text
     if isinstance(text_field, dict):
         native_text = text_field.get(native_language_code, "").strip()
     else:
         native_text = text_field.strip()
     
     if not native_text:
-        logger.warning(f"Sentence {sentence.get('sentenceID', 'UnknownID')} has no native text; skipping translation.")
+        logger.warning(f"Sentence {sentence.sentence_id or 'UnknownID'} has no native text; skipping translation.")
         return
     
     target_language_name = language_map.get(target_language)
@@ -108,73 +128,96 @@ def process_sentence(sentence, native_language_code, target_language, language_m
     
     translation = translate_text(native_text, target_language_name, client)
     if not translation:
-        logger.warning(f"Translation failed for sentence {sentence.get('sentenceID')} in language '{target_language}'.")
+        logger.warning(f"Translation failed for sentence {sentence.sentence_id} in language '{target_language}'.")
         translation = ""
     else:
-        logger.info(f"Added translation for sentence {sentence.get('sentenceID')} in language '{target_language}'.")
+        logger.info(f"Added translation for sentence {sentence.sentence_id} in language '{target_language}'.")
     
     # Replace the "text" field with the translation string.
-    sentence["text"] = translation
+    sentence.text = translation
     
     # Update the "audioFile" field by replacing the native language code with the target language code.
-    audio_file = sentence.get("audioFile", "")
-    updated_audio = re.sub(rf"_{re.escape(native_language_code)}\.aac$", f"_{target_language}.aac", audio_file)
-    sentence["audioFile"] = updated_audio
+    sentence.audio_file = re.sub(rf"_{re.escape(native_language_code)}\.aac$", f"_{target_language}.aac",
+                                 sentence.audio_file)
 
-def translate_content(content, native_language_code, target_language, language_map, client):
+def translate_contents(translations, native_language_code, language_map, client, executor=None):
     """
-    Traverse the chapter content JSON and translate each sentence into the target language.
-    
-    The content dictionary is updated in place so that each sentence's "text" field becomes
-    a string in the target language.
-    
+    Translate the sentences of several chapter copies, each into its own target language, in place.
+
+    Every sentence is translated by its own call to process_sentence; with an executor, the calls
+    run concurrently on its threads (bounded by its number of workers) and this returns when all
+    of them are done. Each call only updates its own sentence, so the result is the same as
+    translating the sentences one by one.
+
     Parameters:
-        content (dict): The content JSON dictionary (with a "paragraphs" array).
+        translations (list): (target_language, Chapter) pairs.
         native_language_code (str): The native language code.
-        target_language (str): The target language code.
         language_map (dict): Mapping from language codes to full language names.
-        client (OpenAI): An instance of the OpenAI client.
+        client (OpenAI): An instance of the OpenAI client, shared by all threads.
+        executor (ThreadPoolExecutor): The pool running the translation requests, or None to
+            translate sequentially.
+
+    Returns:
+        int: The number of sentences processed.
     """
-    for para in content.get("paragraphs", []):
-        for sentence in para.get("sentences", []):
-            process_sentence(sentence, native_language_code, target_language, language_map, client)
+    jobs = [(sentence, target_language) for target_language, content in translations
+            for sentence in content.iter_sentences()]
+    def translate(job):
+        sentence, target_language = job
+        process_sentence(sentence, native_language_code, target_language, language_map, client)
+    if executor is None:
+        for job in jobs:
+            translate(job)
+    else:
+        # Consume the results so that an unexpected error in a thread is raised here.
+        for _ in executor.map(translate, jobs):
+            pass
+    return len(jobs)
 
-def process_json_file(json_file, native_language_code, target_language_codes, language_map, client, input_base_dir, output_base_dir):
+def process_json_file(json_file, native_language_code, target_language_codes, language_map, client, input_base_dir, output_base_dir,
+                      json_style=DEFAULT_JSON_STYLE, executor=None):
     """
     Process a single native content JSON file and produce translated versions.
 
     For each target language, the native JSON file is read, translated, and then written out
     to the corresponding target language folder while preserving the relative folder structure.
+    The sentences of all target languages are translated together (concurrently on the
+    executor's threads when one is given, see translate_contents) before any file is written.
     
     The output filename is constructed by replacing the native language code in the filename with the target language code.
+    The translated JSON is written in the given json_style ("pretty" or "compact", see chapter_json.py).
+
+    Returns:
+        int: The number of sentences translated (over all target languages).
     """
     try:
-        with open(json_file, "r", encoding="utf-8") as f:
-            native_content = json.load(f)
+        native_content = load_chapter(json_file)
     except Exception as e:
         logger.error(f"Error reading JSON file {json_file}: {e}")
-        return
+        return 0
 
     # Compute the relative path from the native base directory.
     try:
         rel_path = json_file.relative_to(input_base_dir)
     except Exception as e:
         logger.error(f"Error computing relative path for {json_file}: {e}")
-        return
+        return 0
 
+    translations = []
     for target_language in target_language_codes:
-        # Deep copy native content for independent translation.
-        translated_content = json.loads(json.dumps(native_content))
+        # Copy the native content for independent translation.
+        translated_content = native_content.copy()
         # Update the top-level language field.
-        translated_content["language"] = target_language
-        # Translate the content.
-        translate_content(translated_content, native_language_code, target_language, language_map, client)
+        translated_content.language = target_language
+        translations.append((target_language, translated_content))
+    # Translate the content in every target language.
+    sentence_count = translate_contents(translations, native_language_code, language_map, client, executor)
+
+    for target_language, translated_content in translations:
         # Update the audioFile fields.
-        for para in translated_content.get("paragraphs", []):
-            for sentence in para.get("sentences", []):
-                audio_file = sentence.get("audioFile", "")
-                updated_audio = re.sub(rf"_{re.escape(native_language_code)}\.aac$", f"_{target_language}.aac", audio_file)
-                sentence["audioFile"] = updated_audio
+        for sentence in translated_content.iter_sentences():
+            sentence.audio_file = re.sub(rf"_{re.escape(native_language_code)}\.aac$", f"_{target_language}.aac",
+                                         sentence.audio_file)
         # Construct the output filename.
         new_filename = re.sub(rf"_{re.escape(native_language_code)}\.json$", f"_{target_language}.json", json_file.name)
         if new_filename == json_file.name:
@@ -185,13 +228,14 @@ def process_json_file(json_file, native_language_code, target_language_codes, la
         output_path.mkdir(parents=True, exist_ok=True)
         full_output_file = output_path / new_filename
         try:
-            with open(full_output_file, "w", encoding="utf-8") as f_out:
-                json.dump(translated_content, f_out, indent=4, ensure_ascii=False)
+            write_chapter(full_output_file, translated_content, json_style)
             logger.info(f"Saved translated JSON for language '{target_language}' to {full_output_file}")
         except Exception as e:
             logger.error(f"Error writing translated JSON file {full_output_file}: {e}")
+    return sentence_count
 
-def process_all_json_files(input_dir, native_language_code, target_language_codes, language_map, client, output_base_dir):
+def process_all_json_files(input_dir, native_language_code, target_language_codes, language_map, client, output_base_dir,
+                           json_style=DEFAULT_JSON_STYLE, concurrency=DEFAULT_CONCURRENCY):
     """
     Recursively process all native content JSON files in the input directory.
 
@@ -199,13 +243,26 @@ def process_all_json_files(input_dir, native_language_code, target_language_code
     For each file, new translated JSON files for each target language are produced and saved under
     output_base_dir in a folder structure:
         {output_base_dir}/{target_language}/Content/{relative_path_of_native_file}
+
+    Up to concurrency translation requests are in flight at once, on one thread pool shared by
+    all files (1 translates sequentially).
     """
     native_pattern = re.compile(rf".*_{re.escape(native_language_code)}\.json$", re.IGNORECASE)
-    json_files = [f for f in input_dir.rglob("*.json") if f.is_file() and native_pattern.match(f.name)]
+    json_files = sorted(f for f in input_dir.rglob("*.json") if f.is_file() and native_pattern.match(f.name))
     logger.info(f"Found {len(json_files)} native content JSON file(s) in {input_dir}")
+    executor = ThreadPoolExecutor(max_workers=concurrency) if concurrency > 1 else None
+    start = time.perf_counter()
+    total_sentences = 0
     for json_file in json_files:
         logger.info(f"Processing native JSON file: {json_file}")
-        process_json_file(json_file, native_language_code, target_language_codes, language_map, client, input_dir, output_base_dir)
+        total_sentences += process_json_file(json_file, native_language_code, target_language_codes, language_map, client,
+                                             input_dir, output_base_dir, json_style, executor)
+    if executor is not None:
+        executor.shutdown()
+    elapsed = time.perf_counter() - start
+    rate = total_sentences / elapsed if elapsed > 0 else 0.0
+    logger.info(f"Translated {total_sentences} sentence(s) into {len(target_language_codes)} language(s) in {elapsed:.2f}s "
+                f"({rate:.1f} sentences/sec, concurrency {concurrency})")
 
 def main():
     parser = argparse.ArgumentParser(
@@ -219,12 +276,22 @@ def main():
                         help='Native language code (e.g., "en-US").')
     parser.add_argument('--target_languages', type=str, required=True,
                         help='Comma-separated list of target language codes (e.g., "es-ES,fr-FR").')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f'Maximum number of translation requests in flight at once (default: {DEFAULT_CONCURRENCY}; '
+                             f'1 translates one sentence at a time).')
+    parser.add_argument('--base_url', type=str, default=None,
+                        help='Base URL of an OpenAI-compatible API to use instead of OpenAI\'s '
+                             '(e.g., "http://localhost:8000/v1").')
+    parser.add_argument('--json_style', choices=JSON_STYLES, default=DEFAULT_JSON_STYLE,
+                        help='Chapter JSON layout: "pretty" (4-space indent) or "compact" (no whitespace). Default: "pretty".')
     parser.add_argument('--verbose', action='store_true', help='Enable verbose logging.')
     
     args = parser.parse_args()
     
     if args.verbose:
         logger.setLevel(logging.DEBUG)
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
     
     input_dir = Path(args.input_dir)
     output_dir = Path(args.output_dir)
@@ -304,13 +371,19 @@ def main():
         # Add additional mappings as needed.
     }
     
-    if not os.getenv("OPENAI_API_KEY"):
-        logger.error("The OPENAI_API_KEY environment variable is not set.")
-        return
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        if not args.base_url:
+            logger.error("The OPENAI_API_KEY environment variable is not set.")
+            return
+        # The client requires a key; a stand-in endpoint may not check it.
+        api_key = "unused"
     
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    # One client for every thread, so that requests share its connection pool.
+    client = OpenAI(api_key=api_key, base_url=args.base_url)
     
-    process_all_json_files(input_dir, native_language_code, target_language_codes, language_map, client, output_dir)
+    process_all_json_files(input_dir, native_language_code, target_language_codes, language_map, client, output_dir,
+                           args.json_style, args.concurrency)
 
 if __name__ == "__main__":
     main()
@@ -23,11 +23,11 @@ Requirements:
 
 import os
 import re
-import json
 import argparse
 import logging
 from pathlib import Path
 import openai
+from content_model import load_chapter
 
 # Configure logging
 logging.basicConfig(
@@ -79,13 +79,12 @@ def process_json_file(json_file: Path, content_base: Path, audio_base: Path):
       audio_base (Path): The base folder where Audio files for this language should be stored.
     """
     try:
-        with open(json_file, "r", encoding="utf-8") as f:
-            content = json.load(f)
+        content = load_chapter(json_file)
     except Exception as e:
         logger.error(f"Error reading JSON file {json_file}: {e}")
         return
 
-    language = content.get("language", "").strip()
+    language = content.language.strip()
     if not language:
         logger.error(f"No language specified in {json_file}. Skipping file.")
         return
@@ -100,19 +99,18 @@ def process_json_file(json_file: Path, content_base: Path, audio_base: Path):
     output_audio_dir = audio_base / rel_path.parent
     output_audio_dir.mkdir(parents=True, exist_ok=True)
 
-    for para in content.get("paragraphs", []):
-        for sentence in para.get("sentences", []):
-            sentence_text = sentence.get("text", "").strip()
-            if not sentence_text:
-                logger.warning(f"No text in sentence {sentence.get('sentenceID', 'UnknownID')}; skipping audio generation.")
-                continue
-            audio_filename = sentence.get("audioFile", "")
-            if not audio_filename:
-                logger.warning(f"No audio filename for sentence {sentence.get('sentenceID', 'UnknownID')}; skipping.")
-                continue
-            output_audio_path = output_audio_dir / audio_filename
-            logger.info(f"Generating audio for sentence {sentence.get('sentenceID', 'UnknownID')} in {language}")
-            generate_audio(sentence_text, language, output_audio_path)
+    for sentence in content.iter_sentences():
+        sentence_id = sentence.sentence_id or 'UnknownID'
+        sentence_text = sentence.text.strip()
+        if not sentence_text:
+            logger.warning(f"No text in sentence {sentence_id}; skipping audio generation.")
+            continue
+        if not sentence.audio_file:
+            logger.warning(f"No audio filename for sentence {sentence_id}; skipping.")
+            continue
+        output_audio_path = output_audio_dir / sentence.audio_file
+        logger.info(f"Generating audio for sentence {sentence_id} in {language}")
+        generate_audio(sentence_text, language, output_audio_path)
 
 def process_all_json_files(book_dir: Path):
     """
@@ -11,6 +11,8 @@ Usage example:
 Directory assumptions:
   - The top-level book folder (provided as --input_dir) contains the structure JSON,
     e.g. "structure.json" or "*structure*.json" (such as "BOOKM_structure.json").
+    For a paged structure JSON (6-assemble_structure_json.py --paged), the subbook files
+    its index refers to (SubBooks/{book_code}_S{n}_subbook.json) are validated as well.
   - Within the book folder, there are language folders (e.g., "en-US", "es-ES", etc.).
     Inside each language folder, a "Content" folder holds the chapter JSON files.
 """
@@ -28,6 +30,82 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s: %(m
 logger = logging.getLogger(__name__)
 
 # --- JSON Schemas ---
+# Schemas of the per-language statistics of chapters and subbooks (6-assemble_structure_json.py
+# --statistics): word and character counts, and audio durations in seconds
+language_counts_schema = {
+    "type": "object",
+    "patternProperties": {
+        "^[a-z]{2}-[A-Z]{2}$": {"type": "integer", "minimum": 0}
+    },
+    "additionalProperties": False
+}
+
+language_durations_schema = {
+    "type": "object",
+    "patternProperties": {
+        "^[a-z]{2}-[A-Z]{2}$": {"type": "number", "minimum": 0}
+    },
+    "additionalProperties": False
+}
+
+# Schema of a subbook with its chapters, in the unified structure JSON or in a subbook file
+# of a paged structure JSON (SubBooks/{book_code}_S{n}_subbook.json)
+subbook_schema = {
+    "type": "object",
+    "properties": {
+        "subBookID": {"type": "string", "format": "uuid"},
+        "subBookNumber": {"type": "integer", "minimum": 1},
+        "subBookTitle": {"type": "string"},
+        "totalWords": language_counts_schema,
+        "totalCharacters": language_counts_schema,
+        "audioDuration": language_durations_schema,
+        "chapters": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "chapterID": {"type": "string", "format": "uuid"},
+                    "chapterNumber": {"type": "integer", "minimum": 0},
+                    "chapterTitle": {"type": "string"},
+                    "totalParagraphs": {"type": "integer", "minimum": 0},
+                    "totalSentences": {"type": "integer", "minimum": 0},
+                    "totalWords": language_counts_schema,
+                    "totalCharacters": language_counts_schema,
+                    "audioDuration": language_durations_schema,
+                    "contentReferences": {
+                        "type": "object",
+                        "patternProperties": {
+                            "^[a-z]{2}-[A-Z]{2}$": {"type": "string"}
+                        },
+                        "additionalProperties": False
+                    }
+                },
+                "required": ["chapterID", "chapterNumber", "chapterTitle", "totalParagraphs", "totalSentences", "contentReferences"],
+                "additionalProperties": False
+            }
+        }
+    },
+    "required": ["subBookID", "subBookNumber", "subBookTitle", "chapters"],
+    "additionalProperties": False
+}
+
+# Schema of a subbook in the index of a paged structure JSON (its chapters are in subBookFile)
+subbook_entry_schema = {
+    "type": "object",
+    "properties": {
+        "subBookID": {"type": "string", "format": "uuid"},
+        "subBookNumber": {"type": "integer", "minimum": 1},
+        "subBookTitle": {"type": "string"},
+        "totalChapters": {"type": "integer", "minimum": 0},
+        "totalWords": language_counts_schema,
+        "totalCharacters": language_counts_schema,
+        "audioDuration": language_durations_schema,
+        "subBookFile": {"type": "string", "minLength": 1}
+    },
+    "required": ["subBookID", "subBookNumber", "subBookTitle", "totalChapters", "subBookFile"],
+    "additionalProperties": False
+}
+
 # Schema for the unified structure JSON
 structure_schema = {
     "$schema": "http://json-schema.org/draft-07/schema#",
@@ -51,38 +129,7 @@ structure_schema = {
         },
         "subBooks": {
             "type": "array",
-            "items": {
-                "type": "object",
-                "properties": {
-                    "subBookID": {"type": "string", "format": "uuid"},
-                    "subBookNumber": {"type": "integer", "minimum": 1},
-                    "subBookTitle": {"type": "string"},
-                    "chapters": {
-                        "type": "array",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "chapterID": {"type": "string", "format": "uuid"},
-                                "chapterNumber": {"type": "integer", "minimum": 0},
-                                "chapterTitle": {"type": "string"},
-                                "totalParagraphs": {"type": "integer", "minimum": 0},
-                                "totalSentences": {"type": "integer", "minimum": 0},
-                                "contentReferences": {
-                                    "type": "object",
-                                    "patternProperties": {
-                                        "^[a-z]{2}-[A-Z]{2}$": {"type": "string"}
-                                    },
-                                    "additionalProperties": False
-                                }
-                            },
-                            "required": ["chapterID", "chapterNumber", "chapterTitle", "totalParagraphs", "totalSentences", "contentReferences"],
-                            "additionalProperties": False
-                        }
-                    }
-                },
-                "required": ["subBookID", "subBookNumber", "subBookTitle", "chapters"],
-                "additionalProperties": False
-            }
+            "items": {"oneOf": [subbook_schema, subbook_entry_schema]}
         }
     },
     "required": ["bookID", "bookTitle", "author", "languages", "coverImageName", "bookCode", "defaultPlaybackOrder"],
@@ -167,6 +214,24 @@ def validate_json_file(json_file: Path, schema: dict) -> bool:
         logger.error(f"Validation error in {json_file}: {e}")
         return False
 
+def validate_subbook_files(structure_file: Path):
+    """
+    Validate the subbook files of a paged structure JSON: the subBookFile of every subbook in
+    its index, relative to the index. Does nothing for a unified structure JSON.
+    """
+    try:
+        with open(structure_file, "r", encoding="utf-8") as f:
+            subbooks = json.load(f).get("subBooks", [])
+    except Exception as e:
+        logger.error(f"Error reading {structure_file}: {e}")
+        return
+    for subbook in subbooks:
+        if not isinstance(subbook, dict) or "subBookFile" not in subbook:
+            continue
+        subbook_file = structure_file.parent / subbook["subBookFile"]
+        logger.info(f"Validating subbook JSON: {subbook_file}")
+        validate_json_file(subbook_file, subbook_page_schema)
+
 def validate_all_json_files(book_dir: Path):
     """
     Recursively search the book folder for the structure JSON and chapter JSON files,
@@ -174,6 +239,7 @@ def validate_all_json_files(book_dir: Path):
     
     Assumptions:
       - The structure JSON is located in the top-level book folder and is named with "structure" in its filename.
+      - The subbook files of a paged structure JSON are located relative to it (see validate_subbook_files).
       - Chapter JSON files are located under {book_dir}/{language}/Content/
     """
     # Look for structure JSON files (match any filename containing "structure" case-insensitively)
@@ -184,6 +250,7 @@ def validate_all_json_files(book_dir: Path):
         for struct_file in structure_candidates:
             logger.info(f"Validating structure JSON: {struct_file}")
             validate_json_file(struct_file, structure_schema)
+            validate_subbook_files(struct_file)
     
     # Now, find chapter JSON files under language folders.
     # We assume language folders are named like "en-US", "es-ES", etc.
@@ -6,6 +6,9 @@ python A-add_subbook_flags.py book.txt subbooks.txt
 
 book.txt → The full text of the book.
 subbooks.txt → A list of subbook titles (one per line).
+
+iter_subbook_flagged_lines() is also used as a stage of clean_and_tag_book.py.
+AB-add_title_flags.py flags subbooks and chapters together in a single pass.
 """
 
 
@@ -16,6 +19,27 @@ def load_subbooks(subbooks_path):
     with open(subbooks_path, 'r', encoding='utf-8') as file:
         return [line.strip() for line in file if line.strip()]
 
+def iter_subbook_flagged_lines(lines, found_counts):
+    """
+    Yield the lines of the book, with a subbook flag inserted before every line that is exactly
+    one of the subbook titles (the keys of found_counts). found_counts is updated in place with
+    the number of times each title was found.
+    """
+    for line in lines:
+        stripped_line = line.strip()
+        
+        if stripped_line in found_counts:
+            found_counts[stripped_line] += 1
+            yield f"<!-- SUBBOOK: {stripped_line} -->\n"
+
+        yield line
+
+def find_title_errors(found_counts):
+    """Return the titles that were not found and those found more than once."""
+    not_found = [title for title, count in found_counts.items() if count == 0]
+    multiple_found = [title for title, count in found_counts.items() if count > 1]
+    return not_found, multiple_found
+
 def add_flags_to_book(book_path, subbooks_path):
     """Adds subbook flags to the book text where subbook titles appear."""
     subbooks = load_subbooks(subbooks_path)
@@ -24,20 +48,10 @@ def add_flags_to_book(book_path, subbooks_path):
         lines = file.readlines()
     
     found_counts = {title: 0 for title in subbooks}
-    modified_lines = []
-    
-    for line in lines:
-        stripped_line = line.strip()
-        
-        if stripped_line in subbooks:
-            found_counts[stripped_line] += 1
-            modified_lines.append(f"<!-- SUBBOOK: {stripped_line} -->\n")
-
-        modified_lines.append(line)
+    modified_lines = list(iter_subbook_flagged_lines(lines, found_counts))
     
     # Check for errors
-    not_found = [title for title, count in found_counts.items() if count == 0]
-    multiple_found = [title for title, count in found_counts.items() if count > 1]
+    not_found, multiple_found = find_title_errors(found_counts)
 
     if not_found:
         print(f"Error: The following subbooks were NOT found in the book file:\n{not_found}")
@@ -0,0 +1,172 @@
+"""
+Combined subbook and chapter flags, in a single pass (A-add_subbook_flags.py followed by
+B-add_chapter_flags.py, without rewriting the book twice).
+
+Both title lists are loaded into one hash index keyed by the normalized title: case,
+whitespace and punctuation are ignored, so "1 Nephi -- Chapter 1" matches the title
+"1 Nephi Chapter 1". Every line is normalized once and looked up in the index; a line
+matching a subbook title gets a "<!-- SUBBOOK: title -->" flag and a line matching a chapter
+title a "<!-- CHAPTER: title -->" flag (using the title as written in the list). As with A
+and B, the output is only written if every title is found exactly once; for titles that
+were not found, the closest lines of the book are suggested.
+
+Example usage:
+python AB-add_title_flags.py --book book.txt --subbooks subbooks.txt --chapters chapters.txt [--output tagged.txt]
+
+book.txt → The full text of the book (overwritten unless --output is given).
+subbooks.txt, chapters.txt → Lists of subbook and chapter titles (one per line); either may be omitted.
+
+iter_title_flagged_lines() is also used as a stage of clean_and_tag_book.py.
+"""
+
+import os
+import re
+import argparse
+import difflib
+
+# Marker kinds, in the order their flags are inserted when a line matches both lists.
+SUBBOOK = "SUBBOOK"
+CHAPTER = "CHAPTER"
+
+# Punctuation (anything that is neither a word character nor whitespace) and underscores.
+PUNCTUATION = re.compile(r"[^\w\s]|_")
+
+# Lines whose normalized form is at most this many times as long as the longest title are
+# kept as candidates for near-match suggestions.
+CANDIDATE_LENGTH_FACTOR = 2
+
+def normalize_title(text):
+    """
+    Return the matching key of a title or line: case-folded, punctuation replaced by spaces
+    and runs of whitespace collapsed to single spaces.
+    """
+    return " ".join(PUNCTUATION.sub(" ", text.casefold()).split())
+
+def load_titles(titles_path):
+    """Load titles (one per line) from the provided file."""
+    with open(titles_path, 'r', encoding='utf-8') as file:
+        return [line.strip() for line in file if line.strip()]
+
+def build_title_index(subbooks=(), chapters=()):
+    """
+    Build the hash index of both title lists: normalized title -> list of (kind, title),
+    subbook before chapter when a title is in both lists.
+
+    Raises:
+        ValueError: If two titles of the same list normalize to the same key.
+    """
+    index = {}
+    for kind, titles in ((SUBBOOK, subbooks), (CHAPTER, chapters)):
+        for title in titles:
+            key = normalize_title(title)
+            if not key:
+                raise ValueError(f"The {kind.lower()} title '{title}' has no letters or digits.")
+            entries = index.setdefault(key, [])
+            for other_kind, other_title in entries:
+                if other_kind == kind:
+                    raise ValueError(f"The {kind.lower()} titles '{other_title}' and '{title}' only differ "
+                                     f"in case, whitespace or punctuation.")
+            entries.append((kind, title))
+    return index
+
+def new_found_counts(subbooks=(), chapters=()):
+    """Return the found counts of both title lists: kind -> {title: 0}."""
+    return {SUBBOOK: {title: 0 for title in subbooks}, CHAPTER: {title: 0 for title in chapters}}
+
+def iter_title_flagged_lines(lines, title_index, found_counts, candidates=None):
+    """
+    Yield the lines of the book, with a subbook and/or chapter flag inserted before every line
+    that matches a title of the index (see build_title_index). found_counts (see
+    new_found_counts) is updated in place with the number of times each title was found.
+
+    If candidates is a dict, the short lines of the book are collected into it (normalized
+    line -> stripped line) for suggest_matches().
+    """
+    max_length = CANDIDATE_LENGTH_FACTOR * max((len(key) for key in title_index), default=0)
+    for line in lines:
+        key = normalize_title(line)
+        entries = title_index.get(key)
+        if entries:
+            for kind, title in entries:
+                found_counts[kind][title] += 1
+                yield f"<!-- {kind}: {title} -->\n"
+        elif candidates is not None and key and len(key) <= max_length:
+            candidates.setdefault(key, line.strip())
+        yield line
+
+def find_title_errors(found_counts):
+    """Return the (kind, title) pairs that were not found and those found more than once."""
+    not_found = [(kind, title) for kind, counts in found_counts.items() for title, count in counts.items() if count == 0]
+    multiple_found = [(kind, title) for kind, counts in found_counts.items() for title, count in counts.items() if count > 1]
+    return not_found, multiple_found
+
+def suggest_matches(title, candidates, limit=3, cutoff=0.6):
+    """Return up to limit lines of the book (see iter_title_flagged_lines) closest to title."""
+    keys = difflib.get_close_matches(normalize_title(title), candidates, n=limit, cutoff=cutoff)
+    return [candidates[key] for key in keys]
+
+def format_title_errors(not_found, multiple_found, candidates):
+    """Return the error messages of find_title_errors(), with near-match suggestions."""
+    messages = []
+    for kind, title in not_found:
+        message = f"The {kind.lower()} '{title}' was NOT found in the book file."
+        suggestions = suggest_matches(title, candidates)
+        if suggestions:
+            message += " Did you mean: " + ", ".join(f"'{line}'" for line in suggestions) + "?"
+        messages.append(message)
+    for kind, title in multiple_found:
+        messages.append(f"The {kind.lower()} '{title}' was found MORE THAN ONCE in the book file.")
+    return messages
+
+def add_title_flags(book_path, subbooks_path=None, chapters_path=None, output_path=None):
+    """
+    Adds subbook and chapter flags to the book text where the titles appear, in one pass.
+
+    The output (book_path itself unless output_path is given) is only written if every title
+    was found exactly once.
+
+    Returns:
+        bool: True if the output was written.
+    """
+    subbooks = load_titles(subbooks_path) if subbooks_path else []
+    chapters = load_titles(chapters_path) if chapters_path else []
+    title_index = build_title_index(subbooks, chapters)
+    found_counts = new_found_counts(subbooks, chapters)
+    candidates = {}
+
+    output_path = output_path or book_path
+    temp_path = f"{output_path}.tmp"
+    try:
+        with open(book_path, 'r', encoding='utf-8') as file, open(temp_path, 'w', encoding='utf-8') as output_file:
+            output_file.writelines(iter_title_flagged_lines(file, title_index, found_counts, candidates))
+
+        # Check for errors
+        not_found, multiple_found = find_title_errors(found_counts)
+        if not_found or multiple_found:
+            for message in format_title_errors(not_found, multiple_found, candidates):
+                print(f"Error: {message}")
+            return False
+
+        os.replace(temp_path, output_path)
+    finally:
+        # Left behind only if the output was not written.
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    print(f"Subbook and chapter flags successfully added to {output_path} "
+          f"({len(subbooks)} subbooks, {len(chapters)} chapters)")
+    return True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add subbook and chapter flags to a book in a single pass.")
+    parser.add_argument('--book', type=str, required=True, help='Book text file.')
+    parser.add_argument('--subbooks', type=str, default=None, help='File of subbook titles, one per line.')
+    parser.add_argument('--chapters', type=str, default=None, help='File of chapter titles, one per line.')
+    parser.add_argument('--output', type=str, default=None,
+                        help='Flagged book text file to write (default: overwrite the book file).')
+    args = parser.parse_args()
+    if not (args.subbooks or args.chapters):
+        parser.error("give --subbooks and/or --chapters")
+    try:
+        add_title_flags(args.book, args.subbooks, args.chapters, args.output)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
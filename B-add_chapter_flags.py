@@ -6,6 +6,9 @@ python B-add_chapter_flags.py book.txt chapters.txt
 
 book.txt → The full text of the book.
 chapters.txt → A list of chapter titles (one per line).
+
+iter_chapter_flagged_lines() is also used as a stage of clean_and_tag_book.py.
+AB-add_title_flags.py flags subbooks and chapters together in a single pass.
 """
 
 import sys
@@ -15,6 +18,27 @@ def load_chapters(chapters_path):
     with open(chapters_path, 'r', encoding='utf-8') as file:
         return [line.strip() for line in file if line.strip()]
 
+def iter_chapter_flagged_lines(lines, found_counts):
+    """
+    Yield the lines of the book, with a chapter flag inserted before every line that is exactly
+    one of the chapter titles (the keys of found_counts). found_counts is updated in place with
+    the number of times each title was found.
+    """
+    for line in lines:
+        stripped_line = line.strip()
+        
+        if stripped_line in found_counts:
+            found_counts[stripped_line] += 1
+            yield f"<!-- CHAPTER: {stripped_line} -->\n"
+
+        yield line
+
+def find_title_errors(found_counts):
+    """Return the titles that were not found and those found more than once."""
+    not_found = [title for title, count in found_counts.items() if count == 0]
+    multiple_found = [title for title, count in found_counts.items() if count > 1]
+    return not_found, multiple_found
+
 def add_flags_to_book(book_path, chapters_path):
     """Adds chapter flags to the book text where chapter titles appear."""
     chapters = load_chapters(chapters_path)
@@ -23,20 +47,10 @@ def add_flags_to_book(book_path, chapters_path):
         lines = file.readlines()
     
     found_counts = {title: 0 for title in chapters}
-    modified_lines = []
-    
-    for line in lines:
-        stripped_line = line.strip()
-        
-        if stripped_line in chapters:
-            found_counts[stripped_line] += 1
-            modified_lines.append(f"<!-- CHAPTER: {stripped_line} -->\n")
-
-        modified_lines.append(line)
+    modified_lines = list(iter_chapter_flagged_lines(lines, found_counts))
     
     # Check for errors
-    not_found = [title for title, count in found_counts.items() if count == 0]
-    multiple_found = [title for title, count in found_counts.items() if count > 1]
+    not_found, multiple_found = find_title_errors(found_counts)
 
     if not_found:
         print(f"Error: The following chapters were NOT found in the book file:\n{not_found}")
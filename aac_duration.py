@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+aac_duration.py
+
+Duration of the AAC audio files written by the audio generation stage (8-audio-generation.py),
+used by 6-assemble_structure_json.py for the audio statistics of the structure JSON.
+
+The files are ADTS streams: a sequence of frames, each starting with a 7-byte header (9 bytes
+with a CRC) that holds the frame length, the sampling frequency and the number of raw data
+blocks in the frame, each of which decodes to 1024 samples per channel. The duration is
+therefore found by walking the frame headers, without decoding any audio and without an
+external tool. A leading ID3v2 tag is skipped.
+
+Run this module directly to print the duration of some files:
+
+    python aac_duration.py file.aac [file.aac ...]
+"""
+
+import argparse
+
+# Sampling frequencies by the 4-bit sampling frequency index of an ADTS header.
+SAMPLING_FREQUENCIES = (96000, 88200, 64000, 48000, 44100, 32000, 24000, 22050, 16000, 12000, 11025, 8000, 7350)
+SAMPLES_PER_BLOCK = 1024
+ADTS_HEADER_SIZE = 7
+ID3_HEADER_SIZE = 10
+
+def id3_tag_size(data: bytes) -> int:
+    """Return the size of the ID3v2 tag at the start of data (0 if there is none)."""
+    if len(data) < ID3_HEADER_SIZE or data[:3] != b"ID3":
+        return 0
+    # The tag size is a 28-bit "synchsafe" integer (7 bits per byte), excluding the header
+    # and the optional footer (flag 0x10).
+    size = (data[6] & 0x7F) << 21 | (data[7] & 0x7F) << 14 | (data[8] & 0x7F) << 7 | (data[9] & 0x7F)
+    footer = ID3_HEADER_SIZE if data[5] & 0x10 else 0
+    return ID3_HEADER_SIZE + size + footer
+
+def adts_duration(data: bytes) -> float:
+    """
+    Return the duration in seconds of an ADTS AAC stream.
+
+    Frames are read until the end of the data; a truncated last frame or trailing bytes that
+    are not an ADTS frame end the stream.
+
+    Raises:
+        ValueError: If the data does not start with an ADTS frame (after an ID3v2 tag).
+    """
+    position = id3_tag_size(data)
+    end = len(data)
+    seconds = 0.0
+    frames = 0
+    while position + ADTS_HEADER_SIZE <= end:
+        # Syncword (12 bits set) followed by the MPEG version bit and a zero layer.
+        if data[position] != 0xFF or data[position + 1] & 0xF6 != 0xF0:
+            break
+        frequency_index = (data[position + 2] >> 2) & 0x0F
+        frame_length = ((data[position + 3] & 0x03) << 11) | (data[position + 4] << 3) | (data[position + 5] >> 5)
+        if frequency_index >= len(SAMPLING_FREQUENCIES) or frame_length < ADTS_HEADER_SIZE \
+                or position + frame_length > end:
+            break
+        blocks = (data[position + 6] & 0x03) + 1
+        seconds += blocks * SAMPLES_PER_BLOCK / SAMPLING_FREQUENCIES[frequency_index]
+        frames += 1
+        position += frame_length
+    if not frames:
+        raise ValueError("not an ADTS AAC stream")
+    return seconds
+
+def aac_file_duration(path) -> float:
+    """
+    Return the duration in seconds of an ADTS AAC file (see adts_duration).
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    try:
+        return adts_duration(data)
+    except ValueError as e:
+        raise ValueError(f"{path}: {e}") from None
+
+def main():
+    parser = argparse.ArgumentParser(description="Print the duration of ADTS AAC audio files.")
+    parser.add_argument('files', nargs='+', help='AAC (ADTS) audio files.')
+    args = parser.parse_args()
+
+    total = 0.0
+    for path in args.files:
+        try:
+            seconds = aac_file_duration(path)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            continue
+        total += seconds
+        print(f"{seconds:10.3f}s  {path}")
+    if len(args.files) > 1:
+        print(f"{total:10.3f}s  total")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+chapter_json.py
+
+JSON serialization shared by every stage that writes chapter or structure JSON
+(5-spacy_sentence_parser.py, 6-assemble_structure_json.py and 7-translator.py).
+
+Two output styles are supported (selected with --json_style in those stages):
+  - "pretty":  4-space indented JSON, byte-for-byte what json.dump(..., indent=4,
+               ensure_ascii=False) has always produced. This is the default.
+  - "compact": no insignificant whitespace. Roughly halves file size and write time
+               for large chapters. Encoded with orjson or msgspec when one of them is
+               installed, and with the standard library otherwise.
+
+ChapterJSONWriter streams a chapter to disk one paragraph at a time, so a stage can
+write paragraphs as it produces them instead of building the whole chapter in memory.
+Its output is identical to serializing the complete chapter dictionary at once.
+
+All writes go to a temporary file that replaces the target only when complete, so an
+interrupted run never leaves a truncated JSON file behind.
+
+file_stamp() records the content hash, size and modification time of a written file, so a
+later stage can check with stamp_is_current() that the file has not changed since, without
+parsing it.
+"""
+
+import hashlib
+import json
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+JSON_STYLES = ("pretty", "compact")
+DEFAULT_JSON_STYLE = "pretty"
+
+_PRETTY_INDENT = 4
+
+if orjson is not None:
+    COMPACT_BACKEND = "orjson"
+elif msgspec is not None:
+    COMPACT_BACKEND = "msgspec"
+else:
+    COMPACT_BACKEND = "json"
+
+def encode(obj, style=DEFAULT_JSON_STYLE) -> bytes:
+    """
+    Serialize obj to UTF-8 JSON bytes in the given style.
+    """
+    if style == "pretty":
+        return json.dumps(obj, indent=_PRETTY_INDENT, ensure_ascii=False).encode("utf-8")
+    if style != "compact":
+        raise ValueError(f"Unknown JSON style '{style}'; expected one of {', '.join(JSON_STYLES)}.")
+    if orjson is not None:
+        return orjson.dumps(obj)
+    if msgspec is not None:
+        return msgspec.json.encode(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def write_json(path, obj, style=DEFAULT_JSON_STYLE):
+    """
+    Write obj to path as JSON in the given style (atomically).
+    """
+    temp_path = f"{path}.tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(encode(obj, style))
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+class ChapterJSONWriter:
+    """
+    Stream a chapter JSON object to disk, one paragraph at a time.
+
+    The header holds every top-level field of the chapter except "paragraphs", which is
+    always written last (matching the key order the pipeline uses):
+
+        with ChapterJSONWriter(path, {"chapterID": ..., "chapterTitle": ...}, style) as writer:
+            for paragraph in paragraphs:
+                writer.write_paragraph(paragraph)
+    """
+
+    def __init__(self, path, header, style=DEFAULT_JSON_STYLE):
+        if style not in JSON_STYLES:
+            raise ValueError(f"Unknown JSON style '{style}'; expected one of {', '.join(JSON_STYLES)}.")
+        self.path = path
+        self.header = header
+        self.style = style
+        self.paragraph_count = 0
+        self._temp_path = f"{path}.tmp"
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self._temp_path, "wb")
+        # Serialize the header as a complete object, then reopen it to append "paragraphs".
+        header = encode(self.header, self.style)
+        if self.style == "pretty":
+            if self.header:
+                self._file.write(header[:-2] + b",\n" + b" " * _PRETTY_INDENT + b'"paragraphs": [')
+            else:
+                self._file.write(b"{\n" + b" " * _PRETTY_INDENT + b'"paragraphs": [')
+        else:
+            separator = b"," if self.header else b""
+            self._file.write(header[:-1] + separator + b'"paragraphs":[')
+        return self
+
+    def write_paragraph(self, paragraph):
+        """
+        Append one paragraph object to the chapter's "paragraphs" array.
+        """
+        encoded = encode(paragraph, self.style)
+        if self.style == "pretty":
+            indent = b" " * (2 * _PRETTY_INDENT)
+            encoded = b"\n".join(indent + line for line in encoded.split(b"\n"))
+            separator = b",\n" if self.paragraph_count else b"\n"
+        else:
+            separator = b"," if self.paragraph_count else b""
+        self._file.write(separator + encoded)
+        self.paragraph_count += 1
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                if self.style == "pretty" and self.paragraph_count:
+                    self._file.write(b"\n" + b" " * _PRETTY_INDENT + b"]\n}")
+                elif self.style == "pretty":
+                    self._file.write(b"]\n}")
+                else:
+                    self._file.write(b"]}")
+        finally:
+            self._file.close()
+        if exc_type is None:
+            os.replace(self._temp_path, self.path)
+        elif os.path.exists(self._temp_path):
+            os.remove(self._temp_path)
+        return False
+
+def file_stamp(path) -> dict:
+    """
+    Return the stamp of a written file: its content hash ("contentHash", blake2b), size
+    ("contentSize") and modification time ("contentMtimeNs").
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    stat = os.stat(path)
+    return {"contentHash": digest.hexdigest(), "contentSize": stat.st_size, "contentMtimeNs": stat.st_mtime_ns}
+
+def stamp_is_current(path, stamp) -> bool:
+    """
+    Return True if the file at path still has the content recorded in stamp (see file_stamp).
+
+    The size and modification time are checked first; the file is only hashed when its
+    modification time changed but its size did not (e.g. it was copied or touched).
+    """
+    if not stamp.get("contentHash"):
+        return False
+    try:
+        stat = os.stat(path)
+        if stat.st_size != stamp.get("contentSize"):
+            return False
+        if stat.st_mtime_ns == stamp.get("contentMtimeNs"):
+            return True
+        return file_stamp(path)["contentHash"] == stamp["contentHash"]
+    except OSError:
+        return False
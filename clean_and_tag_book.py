@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+clean_and_tag_book.py
+
+Fused, single-pass book preparation.
+
+The preparation steps before chapter extraction normally run as separate scripts, each
+reading the previous step's intermediate file and writing a new one. This script chains
+them as composable stages over a single line iterator: the book is read once, every line
+flows through the selected stages, and one output file is written. Flags choose the steps:
+
+    --join_paragraphs     1-remove-in-paragraph-new-line.py  (join the lines of every paragraph)
+    --subbooks FILE       A-add_subbook_flags.py  \  both in one pass with the combined matcher of
+    --chapters FILE       B-add_chapter_flags.py  /  AB-add_title_flags.py (flag title lines)
+    --chapter_flags       2-BOM-add-chapter-flags.py         (flag lines mentioning "Chapter N")
+    --references          3-Scripture-add-references.py      (move "N:N" references to marker lines)
+    --rules FILE          marker_rules.py                    (apply the rules of a JSON rules file)
+
+Stages run in the order listed, and the output is identical to running the selected
+scripts one after another in that order, except that subbook and chapter titles are flagged
+together by the combined matcher of AB-add_title_flags.py, which also matches lines that
+differ from a title only in case, whitespace or punctuation. As with A and B, the output is only written
+if every subbook and chapter title is found exactly once; near matches are suggested for
+titles that were not found.
+
+Usage example:
+    python clean_and_tag_book.py \
+        --input "/path/to/The_Book_of_Mormon.txt" \
+        --output "/path/to/The_Book_of_Mormon_tagged.txt" \
+        --join_paragraphs --chapter_flags --references \
+        [--subbooks "/path/to/subbooks.txt"] \
+        [--chapters "/path/to/chapters.txt"] \
+        [--rules "/path/to/marker_rules.json"] \
+        [--verbose]
+"""
+
+import os
+import argparse
+import importlib.util
+import logging
+import time
+from pathlib import Path
+
+from marker_rules import CHAPTER_RULE, REFERENCE_RULE, MarkerRuleEngine, load_rules
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+def load_stage(filename, module_name):
+    """
+    Import one of the pipeline scripts as a module (their file names are not valid module names).
+    """
+    path = Path(__file__).resolve().parent / filename
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def build_pipeline(lines, join_paragraphs=False, title_index=None, found_counts=None, candidates=None,
+                   chapter_flags=None, references=None, rules=None):
+    """
+    Chain the selected stages over an iterable of lines and return the resulting line iterator.
+
+    title_index is the subbook and chapter title index (see AB-add_title_flags.py), or None
+    to skip title flags; found_counts and candidates are updated as the lines are consumed.
+    chapter_flags, references and rules are the MarkerRuleEngine of the stage (2, 3 and the
+    rules file), or None to skip it.
+    """
+    if join_paragraphs:
+        lines = load_stage("1-remove-in-paragraph-new-line.py", "remove_in_paragraph_new_line").iter_joined_lines(lines)
+    if title_index is not None:
+        lines = load_stage("AB-add_title_flags.py", "add_title_flags").iter_title_flagged_lines(lines, title_index, found_counts, candidates)
+    if chapter_flags is not None:
+        lines = load_stage("2-BOM-add-chapter-flags.py", "bom_add_chapter_flags").iter_chapter_flagged_lines(lines, chapter_flags)
+    if references is not None:
+        lines = load_stage("3-Scripture-add-references.py", "scripture_add_references").iter_referenced_lines(lines, references)
+    if rules is not None:
+        lines = rules.iter_marked_lines(lines)
+    return lines
+
+def clean_and_tag_book(input_path, output_path, join_paragraphs=False, subbooks_path=None, chapters_path=None,
+                       chapter_flags=False, references=False, rules_path=None):
+    """
+    Run the selected stages over the book in one pass and write the result to output_path.
+
+    The output is streamed into a temporary file that replaces output_path only when the pass
+    succeeded and every title was found exactly once (output_path may be input_path).
+
+    Returns:
+        bool: True if the output was written.
+    """
+    start = time.perf_counter()
+    temp_path = f"{output_path}.tmp"
+    line_count = 0
+    try:
+        title_index = found_counts = candidates = None
+        if subbooks_path or chapters_path:
+            title_flags = load_stage("AB-add_title_flags.py", "add_title_flags")
+            subbooks = title_flags.load_titles(subbooks_path) if subbooks_path else []
+            chapters = title_flags.load_titles(chapters_path) if chapters_path else []
+            title_index = title_flags.build_title_index(subbooks, chapters)
+            found_counts = title_flags.new_found_counts(subbooks, chapters)
+            candidates = {}
+        engines = {
+            "chapter flags": MarkerRuleEngine([CHAPTER_RULE]) if chapter_flags else None,
+            "references": MarkerRuleEngine([REFERENCE_RULE]) if references else None,
+            "rules file": MarkerRuleEngine(load_rules(rules_path)) if rules_path else None
+        }
+        with open(input_path, "r", encoding="utf-8") as file, open(temp_path, "w", encoding="utf-8") as output_file:
+            for line in build_pipeline(file, join_paragraphs, title_index, found_counts, candidates,
+                                       engines["chapter flags"], engines["references"], engines["rules file"]):
+                output_file.write(line)
+                line_count += 1
+        if found_counts is not None:
+            not_found, multiple_found = title_flags.find_title_errors(found_counts)
+            if not_found or multiple_found:
+                for message in title_flags.format_title_errors(not_found, multiple_found, candidates):
+                    logger.error(message)
+                os.remove(temp_path)
+                return False
+        os.replace(temp_path, output_path)
+    except Exception as e:
+        logger.error(f"An error occurred while processing '{input_path}': {e}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
+
+    seconds = time.perf_counter() - start
+    megabytes = os.path.getsize(input_path) / 1e6
+    rate = megabytes / seconds if seconds > 0 else float("inf")
+    logger.info(f"Wrote {line_count} lines to {output_path} in {seconds:.2f}s ({megabytes:.2f} MB, {rate:.1f} MB/s)")
+    for stage, engine in engines.items():
+        if engine is not None:
+            logger.info(f"Rule matches ({stage}): {engine.report()}")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Clean and tag a book in a single streaming pass (stages 1, A, B, 2, 3 and a rules file, as selected)."
+    )
+    parser.add_argument('--input', type=str, required=True, help='Source book text file.')
+    parser.add_argument('--output', type=str, required=True, help='Cleaned and tagged book text file to write.')
+    parser.add_argument('--join_paragraphs', action='store_true',
+                        help='Join the lines of every paragraph (1-remove-in-paragraph-new-line.py).')
+    parser.add_argument('--subbooks', type=str, default=None,
+                        help='File of subbook titles, one per line, to flag (AB-add_title_flags.py).')
+    parser.add_argument('--chapters', type=str, default=None,
+                        help='File of chapter titles, one per line, to flag (AB-add_title_flags.py).')
+    parser.add_argument('--chapter_flags', action='store_true',
+                        help='Flag lines mentioning "Chapter N" (2-BOM-add-chapter-flags.py).')
+    parser.add_argument('--references', action='store_true',
+                        help='Move "N:N" scripture references to marker lines (3-Scripture-add-references.py).')
+    parser.add_argument('--rules', type=str, default=None,
+                        help='JSON file of marker rules to apply last (see marker_rules.py).')
+    parser.add_argument('--verbose', action='store_true', help='Enable verbose logging.')
+    args = parser.parse_args()
+
+    if args.verbose:
+        logger.setLevel(logging.DEBUG)
+
+    if not (args.join_paragraphs or args.subbooks or args.chapters or args.chapter_flags or args.references
+            or args.rules):
+        parser.error("select at least one step: --join_paragraphs, --subbooks, --chapters, --chapter_flags, "
+                     "--references or --rules")
+    if not os.path.isfile(args.input):
+        logger.error(f"The input file '{args.input}' does not exist.")
+        return
+
+    clean_and_tag_book(args.input, args.output, args.join_paragraphs, args.subbooks, args.chapters,
+                       args.chapter_flags, args.references, args.rules)
+
+if __name__ == "__main__":
+    main()
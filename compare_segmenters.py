@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+compare_segmenters.py
+
+Comparison harness for the rule-based sentence segmenter.
+
+This script runs the dependency-free RuleSegmenter (rule_segmenter.py) and a spaCy
+segmenter from 5-spacy_sentence_parser.py over the same chapter text files, using the
+sentence parser's own chapter reading and reference-marker handling. For every line it
+compares the sentence boundaries produced by both engines and reports:
+  - the number of lines and sentences segmented by each engine,
+  - the lines on which the boundaries disagree (with examples),
+  - the load time and segmentation time of each engine, and the resulting speedup.
+
+Usage example:
+    python compare_segmenters.py \
+        --input_dir "/path/to/chapter_texts" \
+        --language "en-US" \
+        [--spacy_segmenter parser] \
+        [--show 20] \
+        [--verbose]
+"""
+
+import argparse
+import importlib.util
+import logging
+import time
+from pathlib import Path
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+def load_sentence_parser():
+    """
+    Import 5-spacy_sentence_parser.py as a module (its file name is not a valid module name).
+    """
+    path = Path(__file__).resolve().parent / "5-spacy_sentence_parser.py"
+    spec = importlib.util.spec_from_file_location("spacy_sentence_parser", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def boundary_offsets(sentences):
+    """
+    Return the set of sentence boundaries of a segmented line.
+
+    Boundaries are measured in non-whitespace characters from the start of the line, so
+    engines that trim or split whitespace differently still agree on the same boundary.
+    """
+    offsets = set()
+    position = 0
+    for sentence in sentences[:-1]:
+        position += len("".join(sentence.split()))
+        offsets.add(position)
+    return offsets
+
+def segment_files(chapter_files, parser_module, nlp, batch_size):
+    """
+    Segment every chapter file with one engine.
+
+    Returns (lines, seconds) where lines holds the list of sentences of every source line.
+    """
+    results = []
+    start = time.perf_counter()
+    for chapter_file in chapter_files:
+        segmented = parser_module.segment_chapter_file(chapter_file, nlp, batch_size)
+        if not segmented:
+            continue
+        for paragraph in segmented["paragraphs"]:
+            for line in paragraph["lines"]:
+                results.append(line["sentences"])
+    return results, time.perf_counter() - start
+
+def compare(chapter_files, language, spacy_segmenter, batch_size, show):
+    """
+    Run both engines over the chapter files and log a comparison report.
+    """
+    parser_module = load_sentence_parser()
+
+    load_start = time.perf_counter()
+    rules_nlp = parser_module.load_nlp("rules", language)
+    rules_load = time.perf_counter() - load_start
+    load_start = time.perf_counter()
+    spacy_nlp = parser_module.load_nlp(spacy_segmenter, language)
+    spacy_load = time.perf_counter() - load_start
+
+    rules_lines, rules_seconds = segment_files(chapter_files, parser_module, rules_nlp, batch_size)
+    spacy_lines, spacy_seconds = segment_files(chapter_files, parser_module, spacy_nlp, batch_size)
+
+    disagreements = 0
+    only_spacy = 0
+    only_rules = 0
+    for rules_sentences, spacy_sentences in zip(rules_lines, spacy_lines):
+        if rules_sentences == spacy_sentences:
+            continue
+        rules_offsets = boundary_offsets(rules_sentences)
+        spacy_offsets = boundary_offsets(spacy_sentences)
+        only_spacy += len(spacy_offsets - rules_offsets)
+        only_rules += len(rules_offsets - spacy_offsets)
+        disagreements += 1
+        if disagreements <= show:
+            logger.info(f"Disagreement #{disagreements}:\n"
+                        f"  {spacy_segmenter}: {spacy_sentences}\n"
+                        f"  rules: {rules_sentences}")
+
+    rules_count = sum(len(sentences) for sentences in rules_lines)
+    spacy_count = sum(len(sentences) for sentences in spacy_lines)
+    speedup = spacy_seconds / rules_seconds if rules_seconds > 0 else float("inf")
+    logger.info(f"Compared {len(spacy_lines)} lines from {len(chapter_files)} chapter file(s).")
+    logger.info(f"Sentences: {spacy_segmenter}={spacy_count}, rules={rules_count}")
+    logger.info(f"Lines with boundary disagreements: {disagreements} "
+                f"({only_spacy} boundaries only in {spacy_segmenter}, {only_rules} only in rules)")
+    logger.info(f"Load time: {spacy_segmenter}={spacy_load:.3f}s, rules={rules_load:.3f}s")
+    logger.info(f"Segmentation time: {spacy_segmenter}={spacy_seconds:.3f}s, rules={rules_seconds:.3f}s "
+                f"(speedup x{speedup:.1f})")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the rule-based sentence segmenter with a spaCy segmenter on the same chapter files."
+    )
+    parser.add_argument('--input_dir', type=str, required=True,
+                        help='Base directory containing chapter text files (and subbook folders, if any).')
+    parser.add_argument('--language', type=str, default="en-US",
+                        help='Language code selecting the rule pack (e.g., "en-US").')
+    parser.add_argument('--spacy_segmenter', choices=("parser", "senter", "sentencizer"), default="parser",
+                        help='spaCy segmenter to compare against (default: "parser").')
+    parser.add_argument('--batch_size', type=int, default=256, help='nlp.pipe batch size for the spaCy run.')
+    parser.add_argument('--show', type=int, default=20, help='Number of disagreeing lines to print.')
+    parser.add_argument('--verbose', action='store_true', help='Enable verbose logging.')
+    args = parser.parse_args()
+
+    if args.verbose:
+        logger.setLevel(logging.DEBUG)
+
+    input_dir = Path(args.input_dir)
+    if not input_dir.is_dir():
+        logger.error(f"Input directory '{input_dir}' does not exist or is not a directory.")
+        return
+
+    chapter_files = sorted(input_dir.rglob("chapter*.txt"))
+    if not chapter_files:
+        logger.error(f"No chapter files found under {input_dir}")
+        return
+
+    # The sentence parser logs every chapter and paragraph; keep the report readable.
+    logging.getLogger("spacy_sentence_parser").setLevel(logging.WARNING)
+    compare(chapter_files, args.language, args.spacy_segmenter, args.batch_size, args.show)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+compare_translator_concurrency.py
+
+Comparison harness for the concurrent translator (7-translator.py).
+
+This script starts a local stand-in for the OpenAI chat completions endpoint and runs
+7-translator.py against it (through its --base_url option) once per requested concurrency,
+over the same native content JSON files. The stand-in answers every request after a random
+delay, so responses finish out of order, with the text prefixed by the target language
+named in the system prompt (e.g. "[Spanish] And it came to pass."). No API key and no
+network access are needed. For every run it reports:
+  - the translation time and the number of requests answered,
+  - the largest number of requests that were in flight at once,
+  - the speedup over the first run, and
+  - the output files that differ from the first run's output (there should be none).
+
+Usage example:
+    python compare_translator_concurrency.py \
+        --input_dir "/path/to/The_Book_of_Mormon/en-US/Content" \
+        --native_language "en-US" \
+        [--target_languages "es-ES,fr-FR"] \
+        [--concurrency "1,8,32"] \
+        [--latency "0.02,0.08"] \
+        [--verbose]
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+TRANSLATOR_SCRIPT = Path(__file__).resolve().parent / "7-translator.py"
+
+class StandInServer(ThreadingHTTPServer):
+    """
+    Chat completions stand-in: one thread per connection, counting requests in flight.
+    """
+    daemon_threads = True
+
+    def __init__(self, latency):
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.in_flight = 0
+            self.peak = 0
+            self.requests = 0
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+class StandInHandler(BaseHTTPRequestHandler):
+    # Keep-alive connections, as the OpenAI client pools them.
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        logger.debug(f"Stand-in: {format % args}")
+
+    def do_POST(self):
+        server = self.server
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.in_flight += 1
+            server.requests += 1
+            server.peak = max(server.peak, server.in_flight)
+        try:
+            time.sleep(random.uniform(*server.latency))
+            # The system prompt ends with "... the following text to {language}."
+            language = request["messages"][0]["content"].rsplit(" to ", 1)[-1].rstrip(".")
+            text = f"[{language}] {request['messages'][-1]['content']}"
+            body = json.dumps({
+                "id": f"standin-{server.requests}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "stand-in"),
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": text}}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            }, ensure_ascii=False).encode("utf-8")
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def read_outputs(output_dir):
+    """
+    Return {relative path: bytes} for every file written under output_dir.
+    """
+    return {path.relative_to(output_dir).as_posix(): path.read_bytes()
+            for path in sorted(output_dir.rglob("*")) if path.is_file()}
+
+def run_translator(server, input_dir, output_dir, native_language, target_languages, concurrency, verbose):
+    """
+    Run 7-translator.py against the stand-in and return (seconds, succeeded).
+    """
+    command = [sys.executable, str(TRANSLATOR_SCRIPT),
+               "--input_dir", str(input_dir), "--output_dir", str(output_dir),
+               "--native_language", native_language, "--target_languages", target_languages,
+               "--concurrency", str(concurrency), "--base_url", server.base_url]
+    if verbose:
+        command.append("--verbose")
+    # Without a key the translator accepts --base_url alone; make sure nothing reaches OpenAI.
+    env = {key: value for key, value in os.environ.items() if key != "OPENAI_API_KEY"}
+    start = time.perf_counter()
+    result = subprocess.run(command, env=env, capture_output=not verbose, text=True)
+    seconds = time.perf_counter() - start
+    if result.returncode != 0:
+        logger.error(f"7-translator.py exited with status {result.returncode}:\n{result.stderr or ''}")
+        return seconds, False
+    return seconds, True
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the translator against a local chat completions stand-in at several concurrencies and compare the output."
+    )
+    parser.add_argument('--input_dir', type=str, required=True,
+                        help='Base directory containing native content JSON files.')
+    parser.add_argument('--native_language', type=str, default="en-US",
+                        help='Native language code (e.g., "en-US").')
+    parser.add_argument('--target_languages', type=str, default="es-ES,fr-FR",
+                        help='Comma-separated list of target language codes (default: "es-ES,fr-FR").')
+    parser.add_argument('--concurrency', type=str, default="1,8,32",
+                        help='Comma-separated concurrencies to run; the first is the reference (default: "1,8,32").')
+    parser.add_argument('--latency', type=str, default="0.02,0.08",
+                        help='Minimum and maximum stand-in response delay in seconds (default: "0.02,0.08").')
+    parser.add_argument('--verbose', action='store_true', help='Enable verbose logging.')
+    args = parser.parse_args()
+
+    if args.verbose:
+        logger.setLevel(logging.DEBUG)
+
+    try:
+        concurrencies = [int(value) for value in args.concurrency.split(",") if value.strip()]
+        latency = tuple(float(value) for value in args.latency.split(","))
+    except ValueError as e:
+        parser.error(f"Invalid number: {e}")
+    if not concurrencies or min(concurrencies) < 1:
+        parser.error("--concurrency needs one or more values of at least 1")
+    if len(latency) != 2 or not 0 <= latency[0] <= latency[1]:
+        parser.error('--latency must be "minimum,maximum" with 0 <= minimum <= maximum')
+
+    input_dir = Path(args.input_dir)
+    if not input_dir.is_dir():
+        logger.error(f"Input directory '{input_dir}' does not exist or is not a directory.")
+        return
+
+    server = StandInServer(latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logger.info(f"Chat completions stand-in listening on {server.base_url}")
+
+    results = []
+    reference = None
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for concurrency in concurrencies:
+                output_dir = Path(temp_dir) / f"concurrency_{concurrency}"
+                server.reset()
+                logger.info(f"Translating with concurrency {concurrency}...")
+                seconds, succeeded = run_translator(server, input_dir, output_dir, args.native_language,
+                                                    args.target_languages, concurrency, args.verbose)
+                if not succeeded:
+                    return
+                outputs = read_outputs(output_dir)
+                if reference is None:
+                    reference = outputs
+                    differing = []
+                else:
+                    differing = sorted(path for path in reference.keys() | outputs.keys()
+                                       if reference.get(path) != outputs.get(path))
+                results.append((concurrency, seconds, server.requests, server.peak, len(outputs), differing))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    base_seconds = results[0][1]
+    print(f"{'concurrency':>11}  {'time':>9}  {'requests':>8}  {'peak':>4}  {'files':>5}  {'speedup':>7}  differing")
+    for concurrency, seconds, requests, peak, files, differing in results:
+        speedup = base_seconds / seconds if seconds > 0 else float("inf")
+        print(f"{concurrency:>11}  {seconds:>8.2f}s  {requests:>8}  {peak:>4}  {files:>5}  {speedup:>6.1f}x  {len(differing)}")
+        for path in differing[:10]:
+            print(f"    differs: {path}")
+    if not reference:
+        logger.warning(f"No translated files were written; are there *_{args.native_language}.json files under {input_dir}?")
+
+if __name__ == "__main__":
+    main()
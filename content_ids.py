@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+content_ids.py
+
+Identifier generation shared by the pipeline stages that create IDs
+(5-spacy_sentence_parser.py and 6-assemble_structure_json.py).
+
+By default every book, subbook, chapter, paragraph and sentence gets a fresh random
+UUID (uuid4) on each run. In deterministic mode, IDs are uuid5 values derived from
+the book code and the element's structural position:
+
+    book       {book_code}
+    subbook    {book_code}/S{subbook_num}
+    chapter    {book_code}/S{subbook_num}/C{chapter_num}
+    paragraph  {book_code}/S{subbook_num}/C{chapter_num}/P{paragraph_index}
+    sentence   {book_code}/S{subbook_num}/C{chapter_num}/P{paragraph_index}/N{position}
+
+where position is the sentence's 1-based position within its paragraph. Re-running a
+stage on unchanged content then produces byte-identical JSON, and a chapter has the same
+chapterID in its content files and in the structure JSON.
+"""
+
+import uuid
+
+# Fixed namespace for all deterministic pipeline IDs. Never change it: doing so would
+# change every deterministic ID of every book.
+ID_NAMESPACE = uuid.UUID("d286a9a1-3e8f-4e0e-acf8-769d1bc1921a")
+
+def _make_id(deterministic, *path):
+    if not deterministic:
+        return str(uuid.uuid4())
+    return str(uuid.uuid5(ID_NAMESPACE, "/".join(str(part) for part in path)))
+
+def book_id(book_code, deterministic=False):
+    """Return the ID of a book."""
+    return _make_id(deterministic, book_code)
+
+def subbook_id(book_code, subbook_num, deterministic=False):
+    """Return the ID of a subbook."""
+    return _make_id(deterministic, book_code, f"S{subbook_num}")
+
+def chapter_id(book_code, subbook_num, chapter_num, deterministic=False):
+    """Return the ID of a chapter (shared by every language of the chapter)."""
+    return _make_id(deterministic, book_code, f"S{subbook_num}", f"C{chapter_num}")
+
+def paragraph_id(book_code, subbook_num, chapter_num, paragraph_index, deterministic=False):
+    """Return the ID of a paragraph."""
+    return _make_id(deterministic, book_code, f"S{subbook_num}", f"C{chapter_num}", f"P{paragraph_index}")
+
+def sentence_id(book_code, subbook_num, chapter_num, paragraph_index, position, deterministic=False):
+    """Return the ID of a sentence, given its 1-based position within its paragraph."""
+    return _make_id(deterministic, book_code, f"S{subbook_num}", f"C{chapter_num}",
+                    f"P{paragraph_index}", f"N{position}")
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+content_model.py
+
+Compact in-memory model of chapter content, shared by the stages that hold chapters in
+memory (5-spacy_sentence_parser.py, 7-translator.py and 8-audio-generation.py).
+
+Chapters, paragraphs and sentences are __slots__ classes instead of nested dicts. A
+sentence costs one small fixed-size object instead of a six-key dict, and repeated
+reference strings (a verse reference shared by several sentences) are interned. The
+model is converted to the chapter JSON schema only when it is serialized:
+
+    Chapter.to_dict() / header_dict()   ->  {"chapterID", "language", "chapterNumber", "chapterTitle", "paragraphs"}
+    Paragraph.to_dict()                 ->  {"paragraphID", "paragraphIndex", "sentences"}
+    Sentence.to_dict()                  ->  {"sentenceID", "sentenceIndex", "globalSentenceIndex",
+                                             "reference", "text", "audioFile"}
+
+Keys of the chapter JSON that the model does not declare are kept in each object's extra
+dict (None when there are none) and written back after the declared keys, so loading and
+writing a chapter does not lose them.
+
+Run this module directly to compare the memory used by a synthetic chapter held as dicts
+and as model objects:
+
+    python content_model.py [--sentences 200000]
+"""
+
+import argparse
+import json
+import sys
+from chapter_json import ChapterJSONWriter, DEFAULT_JSON_STYLE
+
+def _extra_keys(data, keys):
+    """Return the items of data whose key is not one of keys, or None if there are none."""
+    if len(data) <= len(keys) and all(key in keys for key in data):
+        return None
+    return {key: value for key, value in data.items() if key not in keys} or None
+
+def _copy_extra(extra):
+    """Return an independent copy of an extra dict (values may be nested JSON)."""
+    return json.loads(json.dumps(extra)) if extra else None
+
+class Sentence:
+    """One sentence of a chapter."""
+    __slots__ = ("sentence_id", "sentence_index", "global_index", "reference", "text", "audio_file", "extra")
+    KEYS = ("sentenceID", "sentenceIndex", "globalSentenceIndex", "reference", "text", "audioFile")
+
+    def __init__(self, sentence_id, sentence_index, global_index, reference, text, audio_file, extra=None):
+        self.sentence_id = sentence_id
+        self.sentence_index = sentence_index
+        self.global_index = global_index
+        self.reference = sys.intern(str(reference)) if reference is not None else None
+        self.text = text
+        self.audio_file = audio_file
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get("sentenceID", ""), data.get("sentenceIndex", 0), data.get("globalSentenceIndex", 0),
+                   data.get("reference", ""), data.get("text", ""), data.get("audioFile", ""),
+                   _extra_keys(data, cls.KEYS))
+
+    def to_dict(self):
+        sentence_dict = {
+            "sentenceID": self.sentence_id,
+            "sentenceIndex": self.sentence_index,
+            "globalSentenceIndex": self.global_index,
+            "reference": self.reference,
+            "text": self.text,
+            "audioFile": self.audio_file
+        }
+        if self.extra:
+            sentence_dict.update(self.extra)
+        return sentence_dict
+
+    def copy(self):
+        return Sentence(self.sentence_id, self.sentence_index, self.global_index, self.reference,
+                        self.text, self.audio_file, _copy_extra(self.extra))
+
+class Paragraph:
+    """One paragraph of a chapter: an ordered list of sentences."""
+    __slots__ = ("paragraph_id", "paragraph_index", "sentences", "extra")
+    KEYS = ("paragraphID", "paragraphIndex", "sentences")
+
+    def __init__(self, paragraph_id, paragraph_index, sentences=None, extra=None):
+        self.paragraph_id = paragraph_id
+        self.paragraph_index = paragraph_index
+        self.sentences = sentences if sentences is not None else []
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get("paragraphID", ""), data.get("paragraphIndex", 0),
+                   [Sentence.from_dict(sentence) for sentence in data.get("sentences", [])],
+                   _extra_keys(data, cls.KEYS))
+
+    def to_dict(self):
+        paragraph_dict = {
+            "paragraphID": self.paragraph_id,
+            "paragraphIndex": self.paragraph_index,
+            "sentences": [sentence.to_dict() for sentence in self.sentences]
+        }
+        if self.extra:
+            paragraph_dict.update(self.extra)
+        return paragraph_dict
+
+    def copy(self):
+        return Paragraph(self.paragraph_id, self.paragraph_index, [sentence.copy() for sentence in self.sentences],
+                         _copy_extra(self.extra))
+
+class Chapter:
+    """A chapter's content in one language."""
+    __slots__ = ("chapter_id", "language", "chapter_number", "chapter_title", "paragraphs", "extra")
+    KEYS = ("chapterID", "language", "chapterNumber", "chapterTitle", "paragraphs")
+
+    def __init__(self, chapter_id, language, chapter_number, chapter_title, paragraphs=None, extra=None):
+        self.chapter_id = chapter_id
+        self.language = language
+        self.chapter_number = chapter_number
+        self.chapter_title = chapter_title
+        self.paragraphs = paragraphs if paragraphs is not None else []
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get("chapterID", ""), data.get("language", ""), data.get("chapterNumber", 0),
+                   data.get("chapterTitle", ""),
+                   [Paragraph.from_dict(paragraph) for paragraph in data.get("paragraphs", [])],
+                   _extra_keys(data, cls.KEYS))
+
+    def header_dict(self):
+        """Return the top-level fields of the chapter JSON (everything except "paragraphs")."""
+        header = {
+            "chapterID": self.chapter_id,
+            "language": self.language,
+            "chapterNumber": self.chapter_number,
+            "chapterTitle": self.chapter_title
+        }
+        if self.extra:
+            header.update(self.extra)
+        return header
+
+    def to_dict(self):
+        chapter_dict = self.header_dict()
+        chapter_dict["paragraphs"] = [paragraph.to_dict() for paragraph in self.paragraphs]
+        return chapter_dict
+
+    def copy(self):
+        return Chapter(self.chapter_id, self.language, self.chapter_number, self.chapter_title,
+                       [paragraph.copy() for paragraph in self.paragraphs], _copy_extra(self.extra))
+
+    def iter_sentences(self):
+        """Yield every sentence of the chapter in order."""
+        for paragraph in self.paragraphs:
+            yield from paragraph.sentences
+
+def load_chapter(path) -> Chapter:
+    """
+    Load a chapter JSON file into the model.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return Chapter.from_dict(json.load(f))
+
+def write_chapter(path, chapter: Chapter, style=DEFAULT_JSON_STYLE):
+    """
+    Write a chapter to disk as chapter JSON, converting one paragraph at a time.
+    """
+    with ChapterJSONWriter(path, chapter.header_dict(), style) as writer:
+        for paragraph in chapter.paragraphs:
+            writer.write_paragraph(paragraph.to_dict())
+
+def _measure(build):
+    """Return (result, bytes still allocated by build) using tracemalloc."""
+    import gc
+    import tracemalloc
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the memory used by a synthetic chapter held as dicts and as content model objects."
+    )
+    parser.add_argument('--sentences', type=int, default=200_000, help='Number of sentences to build.')
+    parser.add_argument('--per_paragraph', type=int, default=5, help='Sentences per paragraph.')
+    args = parser.parse_args()
+
+    import uuid
+
+    def sentence_fields(index):
+        paragraph = index // args.per_paragraph + 1
+        local = index % args.per_paragraph + 1
+        return (str(uuid.uuid4()), local, index + 1, f"{paragraph}:{local // 2 + 1}",
+                f"And it came to pass that sentence number {index} was spoken.",
+                f"{index + 1:07d}_BOOKM_S1_C1_P{paragraph}_S{local}_en-US.aac")
+
+    def build_dicts():
+        paragraphs = []
+        for index in range(args.sentences):
+            if index % args.per_paragraph == 0:
+                paragraphs.append({"paragraphID": str(uuid.uuid4()), "paragraphIndex": len(paragraphs) + 1,
+                                   "sentences": []})
+            sentence_id, local, global_index, reference, text, audio = sentence_fields(index)
+            paragraphs[-1]["sentences"].append({"sentenceID": sentence_id, "sentenceIndex": local,
+                                                "globalSentenceIndex": global_index, "reference": reference,
+                                                "text": text, "audioFile": audio})
+        return {"chapterID": str(uuid.uuid4()), "language": "en-US", "chapterNumber": 1,
+                "chapterTitle": "Synthetic", "paragraphs": paragraphs}
+
+    def build_model():
+        chapter = Chapter(str(uuid.uuid4()), "en-US", 1, "Synthetic")
+        for index in range(args.sentences):
+            if index % args.per_paragraph == 0:
+                chapter.paragraphs.append(Paragraph(str(uuid.uuid4()), len(chapter.paragraphs) + 1))
+            chapter.paragraphs[-1].sentences.append(Sentence(*sentence_fields(index)))
+        return chapter
+
+    dicts, dict_bytes = _measure(build_dicts)
+    del dicts
+    model, model_bytes = _measure(build_model)
+    del model
+    print(f"{args.sentences} sentences:")
+    print(f"  dicts: {dict_bytes / 2**20:8.1f} MiB ({dict_bytes / args.sentences:.0f} bytes/sentence)")
+    print(f"  model: {model_bytes / 2**20:8.1f} MiB ({model_bytes / args.sentences:.0f} bytes/sentence)")
+    print(f"  saved: {(1 - model_bytes / dict_bytes) * 100:.0f}%")
+
+if __name__ == "__main__":
+    main()
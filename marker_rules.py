@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+marker_rules.py
+
+Declarative marker insertion, shared by the tagging stages (2-BOM-add-chapter-flags.py,
+3-Scripture-add-references.py and clean_and_tag_book.py).
+
+A rule maps a regex pattern to a marker template. Rules are JSON objects, and a rules file
+is a JSON list of them:
+
+    [
+        {"name": "chapter", "pattern": "\\\\bChapter\\\\s+(\\\\d+)", "ignore_case": true,
+         "marker": "<!-- CHAPTER: {1} -->"},
+        {"name": "reference", "pattern": "\\\\b(\\\\d+:\\\\d+) ", "marker": "<!-- REF: {1} -->",
+         "split_line": true}
+    ]
+
+  - name:          Unique rule name, used in the match count report.
+  - pattern:       Python regex. It may use numbered groups, backreferences to them ("\\1")
+                   and conditionals on them ("(?(1)...)"), but no named groups.
+  - marker:        Marker line inserted before a matching line; {0} is the whole match and
+                   {1}, {2}, ... are the pattern's groups.
+  - ignore_case:   Match case-insensitively (default false).
+  - remove_match:  Remove every match of the rule from the line (default false).
+  - every_match:   Insert a marker for every match instead of only the first (default false).
+  - split_line:    Split the line at every match (default false): each match is replaced by
+                   its marker, on its own line, and the text between matches goes on lines of
+                   its own. Blank pieces of text are dropped.
+
+All rules are compiled into a single alternation regex with one named group per rule, so
+each line is scanned once however many rules there are. A rule's group numbers shift in the
+combined regex, so its backreferences and conditionals are renumbered to match. Matches never overlap: where two
+rules could match at the same position, the rule listed first wins. Markers are inserted in
+the order their matches appear in the line, before the line itself (the markers of
+split_line rules go where their matches were). The engine counts the matches of every rule.
+"""
+
+import json
+import re
+
+# Rule of 2-BOM-add-chapter-flags.py: flag lines mentioning "Chapter N".
+CHAPTER_RULE = {
+    "name": "chapter",
+    "pattern": r"\bChapter\s+(\d+)",
+    "ignore_case": True,
+    "marker": "<!-- CHAPTER: {1} -->"
+}
+
+# Rule of 3-Scripture-add-references.py: split lines at every "N:N " reference, so the text
+# of each verse follows its own reference marker line.
+REFERENCE_RULE = {
+    "name": "reference",
+    "pattern": r"\b(\d+:\d+) ",
+    "marker": "<!-- REF: {1} -->",
+    "split_line": True
+}
+
+_RULE_KEYS = {"name", "pattern", "marker", "ignore_case", "remove_match", "every_match", "split_line"}
+
+# The tokens of a regex that matter when renumbering its groups: octal escapes, numbered
+# backreferences (group 1), other escapes, character classes (where "\1" is an octal escape)
+# and conditionals on a numbered group (group 2).
+_GROUP_REFERENCE_TOKEN = re.compile(r"""
+    \\(?:0[0-7]{0,2}|[1-7][0-7]{2})
+  | \\([1-9][0-9]?)
+  | \\.
+  | \[\^?\]?(?:\\.|[^\]\\])*\]
+  | \(\?\(([0-9]+)\)
+""", re.VERBOSE | re.DOTALL)
+
+def _renumber_group_references(pattern, offset, rule_name):
+    """
+    Return pattern with its numbered backreferences and conditionals shifted by offset groups.
+    """
+    def renumber(match):
+        if match.group(1):
+            number = int(match.group(1)) + offset
+            if number > 99:
+                raise ValueError(f"Marker rule '{rule_name}' uses a backreference, but the rules before it "
+                                 f"have too many groups for it to be renumbered; move the rule up.")
+            # Wrapped so that digits following the backreference are not read as part of it.
+            return f"(?:\\{number})"
+        if match.group(2):
+            return f"(?({int(match.group(2)) + offset})"
+        return match.group(0)
+    return _GROUP_REFERENCE_TOKEN.sub(renumber, pattern)
+
+def load_rules(rules_path):
+    """
+    Load a list of rules from a JSON rules file.
+    """
+    with open(rules_path, "r", encoding="utf-8") as f:
+        rules = json.load(f)
+    if not isinstance(rules, list):
+        raise ValueError(f"Rules file {rules_path} must contain a JSON list of rules.")
+    return rules
+
+class MarkerRuleEngine:
+    """
+    Compiled set of marker rules (see the module docstring).
+    """
+
+    def __init__(self, rules):
+        if not rules:
+            raise ValueError("At least one marker rule is required.")
+        self.rules = []
+        self.counts = {}
+        # Per rule: (offset of its named group among the combined regex's groups, name, marker
+        # template, slice of its whole match and pattern groups, split_line, every_match,
+        # remove_match).
+        self._rule_groups = []
+        alternatives = []
+        group_index = 0
+        for position, rule in enumerate(rules):
+            unknown = set(rule) - _RULE_KEYS
+            if unknown:
+                raise ValueError(f"Unknown key(s) {sorted(unknown)} in marker rule {position + 1}.")
+            if "name" not in rule or "pattern" not in rule or "marker" not in rule:
+                raise ValueError(f"Marker rule {position + 1} needs a name, a pattern and a marker.")
+            if rule["name"] in self.counts:
+                raise ValueError(f"Duplicate marker rule name '{rule['name']}'.")
+            compiled = re.compile(rule["pattern"])
+            if compiled.groupindex:
+                raise ValueError(f"Marker rule '{rule['name']}' may not use named groups.")
+            pattern = _renumber_group_references(rule["pattern"], group_index + 1, rule["name"])
+            if rule.get("ignore_case"):
+                pattern = f"(?i:{pattern})"
+            alternatives.append(f"(?P<rule{position}>{pattern})")
+            self._rule_groups.append((
+                group_index, rule["name"], rule["marker"] + "\n", slice(group_index, group_index + 1 + compiled.groups),
+                bool(rule.get("split_line")), bool(rule.get("every_match")), bool(rule.get("remove_match"))
+            ))
+            group_index += 1 + compiled.groups
+            self.rules.append(rule)
+            self.counts[rule["name"]] = 0
+        self.regex = re.compile("|".join(alternatives))
+        if self.regex.groups != group_index:
+            raise ValueError("The marker rule patterns could not be combined into one regex.")
+        self._group_count = group_index
+
+    def mark_line(self, line):
+        """
+        Apply the rules to one line in a single scan. Returns the marker lines to insert
+        before it and the (possibly shortened or split) line itself, in output order.
+        """
+        parts = self.regex.split(line)
+        return [line] if len(parts) == 1 else self._mark_parts(parts)
+
+    def _mark_parts(self, parts):
+        """
+        mark_line for a line with at least one match, given the line split by the combined
+        regex: the text before the first match, then for every match the values of all the
+        regex's groups followed by the text after the match.
+        """
+        counts = self.counts
+        group_count = self._group_count
+        markers = []
+        segments = []
+        kept = [parts[0]]
+        marked = set()
+        for start in range(1, len(parts), group_count + 1):
+            match_groups = parts[start:start + group_count]
+            for offset, name, template, groups, split, every, remove in self._rule_groups:
+                if match_groups[offset] is not None:
+                    break
+            counts[name] += 1
+            if split or every or name not in marked:
+                marked.add(name)
+                marker = template.format(*[group if group is not None else "" for group in match_groups[groups]])
+                if split:
+                    text = "".join(kept)
+                    if text.strip():
+                        segments.append(text.rstrip() + "\n")
+                    segments.append(marker)
+                    kept = []
+                else:
+                    markers.append(marker)
+            if not (split or remove):
+                kept.append(match_groups[offset])
+            kept.append(parts[start + group_count])
+        line = "".join(kept)
+        if segments:
+            markers.extend(segments)
+            if not line.strip():
+                return markers
+        markers.append(line)
+        return markers
+
+    def iter_marked_lines(self, lines):
+        """
+        Yield the lines with markers inserted (see mark_line).
+        """
+        split = self.regex.split
+        for line in lines:
+            parts = split(line)
+            if len(parts) == 1:
+                yield line
+            else:
+                yield from self._mark_parts(parts)
+
+    def report(self):
+        """
+        Return a one-line summary of the match count of every rule.
+        """
+        return ", ".join(f"{name}: {count} match(es)" for name, count in self.counts.items())
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+rule_segmenter.py
+
+Dependency-free, rule-based sentence segmenter.
+
+This module is a pure-Python alternative to spaCy for the sentence parsing stage
+(5-spacy_sentence_parser.py --segmenter rules). It is meant for bulk drafts and CI
+runs where loading a spaCy model is too slow or not available.
+
+Sentence boundaries are found with one precompiled regular expression per language
+rule pack. Each candidate boundary (terminal punctuation followed by whitespace) is
+then checked against the pack's exceptions:
+  - known abbreviations ("Mr.", "St.", "etc."),
+  - reference abbreviations followed by a number: scripture books, such as the "Ne." in
+    "1 Ne. 3:7", and numbering words, such as "No. 5" or "p. 12" (most of them are also
+    names or ordinary words, such as "Dan.", "Philip." or "no.", so they end a sentence
+    anywhere else),
+  - single-letter initials ("J. Smith"),
+  - verse or list numbers at the start of a line ("12. And it came to pass..."),
+  - a following word that starts in lowercase.
+
+Rule packs are selected by the language part of a language code (e.g. "en" for
+"en-US"); unknown languages fall back to the generic "xx" pack.
+
+The segmenter mimics the tiny part of the spaCy API the sentence parser uses
+(calling it on a string or using .pipe, then reading doc.sents), so it can be used
+wherever a loaded spaCy pipeline is expected.
+
+Usage example:
+    from rule_segmenter import RuleSegmenter
+    segmenter = RuleSegmenter("en-US")
+    segmenter.segment("Mr. Smith went to St. Louis. He saw 1 Ne. 3:7 there.")
+
+Run this module directly to check the segmenter against its regression cases:
+
+    python rule_segmenter.py
+"""
+
+import re
+import sys
+
+# Bump whenever the rules change so cached segmentations made with older rules are ignored.
+RULES_VERSION = "3"
+
+# Abbreviations shared by every rule pack (lowercase, without the trailing period).
+COMMON_ABBREVIATIONS = {"etc", "vs", "cf", "ca", "e.g", "i.e"}
+
+# Numbering abbreviations shared by every rule pack; like scripture book abbreviations, they are
+# only abbreviations when a number follows (e.g. "No. 5", "p. 12", "vv. 3-4").
+NUMBERING_ABBREVIATIONS = {"no", "vol", "pp", "p", "ch", "v", "vv"}
+
+# Scripture book abbreviations as they appear in cross references (e.g. "1 Ne. 3:7", "Gen. 1:1").
+SCRIPTURE_ABBREVIATIONS = {
+    "ne", "jac", "hel", "morm", "moro", "eth",
+    "gen", "ex", "lev", "num", "deut", "josh", "judg", "sam", "kgs", "chr", "neh", "esth",
+    "ps", "prov", "eccl", "isa", "jer", "lam", "ezek", "dan", "hos", "obad", "mic", "nah",
+    "hab", "zeph", "hag", "zech", "mal", "matt", "mk", "lk", "jn", "rom", "cor", "gal",
+    "eph", "philip", "col", "thes", "tim", "philem", "heb", "jas", "pet", "jude", "rev",
+}
+
+# Per-language rule packs. "abbreviations" and "reference_abbreviations" are matched
+# case-insensitively against the word immediately before a period; a reference abbreviation
+# only continues the sentence when a digit follows it. "terminators" is a regex character class body.
+RULE_PACKS = {
+    "xx": {
+        "abbreviations": COMMON_ABBREVIATIONS,
+        "reference_abbreviations": NUMBERING_ABBREVIATIONS,
+        "terminators": r".!?…",
+    },
+    "en": {
+        # "Rev.", "Gen." and "Col." are book abbreviations rather than titles: as titles they
+        # would also hide the end of sentences ending in "Dan." or "Rev.".
+        "abbreviations": COMMON_ABBREVIATIONS | {
+            "mr", "mrs", "ms", "dr", "st", "jr", "sr", "prof", "capt", "lt",
+            "sgt", "hon", "mt", "ft", "ave", "co", "corp", "inc", "ltd", "jan", "feb", "mar",
+            "apr", "jun", "jul", "aug", "sep", "sept", "oct", "nov", "dec", "a.m", "p.m", "u.s",
+        },
+        "reference_abbreviations": NUMBERING_ABBREVIATIONS | SCRIPTURE_ABBREVIATIONS,
+        "terminators": r".!?…",
+    },
+    "es": {
+        "abbreviations": COMMON_ABBREVIATIONS | {
+            "sr", "sra", "srta", "dr", "dra", "d", "dña", "ud", "uds", "sto", "sta",
+        },
+        "reference_abbreviations": NUMBERING_ABBREVIATIONS | {
+            "pág", "núm", "cap", "vers", "gén", "éx", "lev", "deut", "mat", "apoc",
+        },
+        "terminators": r".!?…",
+    },
+    "fr": {
+        "abbreviations": COMMON_ABBREVIATIONS | {
+            "m", "mm", "mme", "mmes", "mlle", "dr", "st", "ste", "av",
+        },
+        "reference_abbreviations": NUMBERING_ABBREVIATIONS | {"chap", "gen", "ex", "mat", "apoc"},
+        "terminators": r".!?…",
+    },
+    "de": {
+        "abbreviations": COMMON_ABBREVIATIONS | {
+            "hr", "fr", "dr", "st", "bzw", "ca", "z.b", "d.h", "u.a", "usw", "vgl",
+        },
+        "reference_abbreviations": NUMBERING_ABBREVIATIONS | {"nr", "kap", "mose", "offb"},
+        "terminators": r".!?…",
+    },
+}
+
+# Regression cases checked by running this module: (language, line, expected sentences).
+REGRESSION_CASES = [
+    ("en-US", "Mr. Smith went to St. Louis. He saw 1 Ne. 3:7 there.",
+     ["Mr. Smith went to St. Louis.", "He saw 1 Ne. 3:7 there."]),
+    ("en-US", "12. And it came to pass. Then Dan. Then Philip.",
+     ["12. And it came to pass.", "Then Dan.", "Then Philip."]),
+    ("en-US", "Read Dan. 3:17 and Rev. 21:4 again. Then Jude. Then Col.",
+     ["Read Dan. 3:17 and Rev. 21:4 again.", "Then Jude.", "Then Col."]),
+    ("en-US", "J. Smith wrote it. The end!", ["J. Smith wrote it.", "The end!"]),
+    ("es-ES", "Véase Mat. 5:3. Luego Apoc. Fin.", ["Véase Mat. 5:3.", "Luego Apoc.", "Fin."]),
+    ("en-US", "He said no. She left.", ["He said no.", "She left."]),
+    ("en-US", "See No. 5 and Vol. 2 on pp. 10-12. Then ch. 3. It ends in Ch. The End.",
+     ["See No. 5 and Vol. 2 on pp. 10-12.", "Then ch. 3.", "It ends in Ch.", "The End."]),
+    ("de-DE", "Siehe Kap. 3 und Nr. 4. Das ist die Nr. Eins.",
+     ["Siehe Kap. 3 und Nr. 4.", "Das ist die Nr.", "Eins."]),
+]
+
+# Closing characters that belong to the sentence they follow.
+_CLOSERS = "\"'”’»)]"
+
+class _Span:
+    """A sentence span exposing the .text attribute that spaCy spans have."""
+    __slots__ = ("text",)
+
+    def __init__(self, text):
+        self.text = text
+
+class _Doc:
+    """A segmented line exposing the .sents attribute that spaCy docs have."""
+    __slots__ = ("sents",)
+
+    def __init__(self, sentences):
+        self.sents = [_Span(sentence) for sentence in sentences]
+
+class RuleSegmenter:
+    """
+    Abbreviation-aware, rule-based sentence segmenter for one language rule pack.
+    """
+
+    def __init__(self, language="en-US"):
+        self.language = language
+        self.pack_name = language.split("-")[0].lower()
+        if self.pack_name not in RULE_PACKS:
+            self.pack_name = "xx"
+        pack = RULE_PACKS[self.pack_name]
+        self.abbreviations = frozenset(pack["abbreviations"])
+        self.reference_abbreviations = frozenset(pack["reference_abbreviations"])
+        # A candidate boundary: terminal punctuation, optional closing quotes/brackets,
+        # then whitespace. The lookahead captures the first character of the next sentence.
+        self._boundary = re.compile(
+            rf"[{pack['terminators']}]+[{re.escape(_CLOSERS)}]*(?=\s+(\S))"
+        )
+        # Presented like a spaCy pipeline in log messages.
+        self.pipe_names = [f"rules:{self.pack_name}"]
+
+    def _is_boundary(self, text, match):
+        """
+        Decide whether a candidate match really ends a sentence.
+        """
+        punctuation = match.group(0).rstrip(_CLOSERS)
+        next_char = match.group(1)
+        if punctuation != ".":
+            # "!", "?", "..." and mixed runs end a sentence unless the text simply continues.
+            return not next_char.islower()
+        if next_char.islower():
+            return False
+        # The word right before the period.
+        start = match.start()
+        word_start = max(text.rfind(" ", 0, start), text.rfind("\t", 0, start)) + 1
+        word = text[word_start:start].lstrip("\"'“‘«([").lower()
+        if not word:
+            return True
+        if word in self.abbreviations:
+            return False
+        if word in self.reference_abbreviations and next_char.isdigit():
+            # A book or numbering abbreviation followed by a number ("Dan. 3:17", "No. 5").
+            return False
+        if len(word) == 1 and word.isalpha():
+            # A single initial such as "J." in "J. Smith".
+            return False
+        if word.isdigit() and not text[:word_start].strip():
+            # A verse or list number at the start of the line ("12. And it came to pass").
+            return False
+        return True
+
+    def segment(self, text):
+        """
+        Split a line of text into sentences (stripped, non-empty strings).
+        """
+        sentences = []
+        start = 0
+        for match in self._boundary.finditer(text):
+            if not self._is_boundary(text, match):
+                continue
+            sentence = text[start:match.end()].strip()
+            if sentence:
+                sentences.append(sentence)
+            start = match.end()
+        tail = text[start:].strip()
+        if tail:
+            sentences.append(tail)
+        return sentences
+
+    def __call__(self, text):
+        return _Doc(self.segment(text))
+
+    def pipe(self, texts, batch_size=None):
+        """
+        Segment an iterable of texts, yielding one doc per text (batch_size is accepted
+        for compatibility with spaCy and ignored).
+        """
+        for text in texts:
+            yield _Doc(self.segment(text))
+
+def main():
+    failures = 0
+    for language, text, expected in REGRESSION_CASES:
+        sentences = RuleSegmenter(language).segment(text)
+        if sentences != expected:
+            failures += 1
+            print(f"FAIL [{language}] {text!r}\n  expected {expected}\n  got      {sentences}")
+    print(f"{len(REGRESSION_CASES) - failures} of {len(REGRESSION_CASES)} regression case(s) passed")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
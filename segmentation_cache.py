@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+segmentation_cache.py
+
+Persistent, size-bounded cache of sentence segmentation results.
+
+The sentence parsing stage (5-spacy_sentence_parser.py --cache_path ...) checks this
+cache before handing a line to spaCy, so re-running the stage after editing one chapter
+only re-segments the lines that actually changed.
+
+Entries live in a single SQLite database and are keyed by a hash of:
+  - the segmenter fingerprint (segmenter name, model name/version and library version),
+  - the line text.
+so switching segmenters or upgrading the model never returns stale boundaries.
+
+Every lookup refreshes the entry's last-used time; when the cache is closed, the least
+recently used entries beyond max_entries are evicted. Several processes (e.g. the
+parser's --workers pool) may share one database file.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+
+# Default maximum number of cached lines.
+DEFAULT_MAX_ENTRIES = 500_000
+
+# SQLite limits the number of bound parameters per statement; look keys up in chunks.
+_QUERY_CHUNK = 500
+
+class SegmentationCache:
+    """
+    SQLite-backed LRU cache mapping (segmenter fingerprint, line) to a list of sentences.
+    """
+
+    def __init__(self, path, max_entries=DEFAULT_MAX_ENTRIES, fingerprint=""):
+        self.path = str(path)
+        self.max_entries = max_entries
+        self.fingerprint = fingerprint
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(self.path, timeout=60)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS segments ("
+            " key BLOB PRIMARY KEY,"
+            " sentences TEXT NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS segments_last_used ON segments (last_used)")
+        self._conn.commit()
+
+    def _key(self, line):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.fingerprint.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(line.encode("utf-8"))
+        return digest.digest()
+
+    def get_many(self, lines):
+        """
+        Look up many lines at once.
+
+        Returns a dict mapping each cached line to its list of sentences and updates the
+        hit/miss counters (one count per line occurrence).
+        """
+        keys = {}
+        for line in lines:
+            keys.setdefault(self._key(line), line)
+        found = {}
+        key_list = list(keys)
+        for offset in range(0, len(key_list), _QUERY_CHUNK):
+            chunk = key_list[offset:offset + _QUERY_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT key, sentences FROM segments WHERE key IN ({placeholders})", chunk
+            ).fetchall()
+            for key, sentences in rows:
+                found[keys[key]] = json.loads(sentences)
+        if found:
+            now = time.time()
+            self._conn.executemany(
+                "UPDATE segments SET last_used = ? WHERE key = ?",
+                [(now, self._key(line)) for line in found]
+            )
+            self._conn.commit()
+        for line in lines:
+            if line in found:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return found
+
+    def put_many(self, segmented):
+        """
+        Store a dict mapping lines to their list of sentences.
+        """
+        if not segmented:
+            return
+        now = time.time()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO segments (key, sentences, last_used) VALUES (?, ?, ?)",
+            [(self._key(line), json.dumps(sentences, ensure_ascii=False), now)
+             for line, sentences in segmented.items()]
+        )
+        self._conn.commit()
+
+    def evict(self):
+        """
+        Delete the least recently used entries beyond max_entries. Returns the number evicted.
+        """
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM segments").fetchone()
+        excess = count - self.max_entries
+        if excess <= 0:
+            return 0
+        self._conn.execute(
+            "DELETE FROM segments WHERE key IN "
+            "(SELECT key FROM segments ORDER BY last_used ASC LIMIT ?)", (excess,)
+        )
+        self._conn.commit()
+        return excess
+
+    def close(self):
+        """
+        Enforce the size bound and close the database. Returns the number of evicted entries.
+        """
+        evicted = self.evict()
+        self._conn.close()
+        return evicted
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+segmentation_daemon.py
+
+Unix-socket transport for the warm sentence segmentation daemon.
+
+Loading spaCy and its model dominates the run time of 5-spacy_sentence_parser.py when
+only a chapter or two changed. Started with --serve, the parser keeps its pipelines
+loaded in a long-running process that listens on a Unix socket; later runs started with
+--use_daemon send their chapter text to it instead of importing spaCy themselves, and
+fall back to in-process parsing when no daemon answers.
+
+This module only knows how to move requests and responses; the parser supplies the
+handler that does the work. The protocol is one request per connection: the client sends
+a JSON object on a single line and the server answers with a JSON object on a single
+line. Every response carries "ok"; failed requests carry "error" instead of a result.
+
+A request {"op": "shutdown"} stops the server after it has been answered.
+"""
+
+import json
+import logging
+import os
+import socket
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+def default_socket_path():
+    """
+    Return the per-user default socket path (in the system temporary directory).
+    """
+    user = os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME", "user")
+    return os.path.join(tempfile.gettempdir(), f"spacy_sentence_parser-{user}.sock")
+
+class DaemonUnavailable(Exception):
+    """Raised by SegmentationClient when no daemon answers on the socket."""
+
+class SegmentationClient:
+    """
+    Thin client for a segmentation daemon listening on socket_path.
+    """
+
+    def __init__(self, socket_path=None, timeout=600.0):
+        self.socket_path = str(socket_path or default_socket_path())
+        self.timeout = timeout
+
+    def request(self, payload):
+        """
+        Send one request and return the daemon's response dict.
+
+        Raises DaemonUnavailable if the daemon cannot be reached, the connection breaks or
+        the reply is truncated or unreadable, and RuntimeError if the daemon answered with an
+        error.
+        """
+        if not hasattr(socket, "AF_UNIX"):
+            raise DaemonUnavailable("Unix sockets are not supported on this platform")
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self.timeout)
+                sock.connect(self.socket_path)
+                sock.sendall(json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n")
+                with sock.makefile("rb") as stream:
+                    line = stream.readline()
+        except OSError as e:
+            raise DaemonUnavailable(f"No segmentation daemon at {self.socket_path}: {e}") from e
+        if not line:
+            raise DaemonUnavailable(f"Segmentation daemon at {self.socket_path} closed the connection")
+        if not line.endswith(b"\n"):
+            raise DaemonUnavailable(f"Truncated reply from segmentation daemon at {self.socket_path}")
+        try:
+            response = json.loads(line)
+        except ValueError as e:
+            raise DaemonUnavailable(f"Unreadable reply from segmentation daemon at {self.socket_path}: {e}") from e
+        if not isinstance(response, dict):
+            raise DaemonUnavailable(f"Unexpected reply from segmentation daemon at {self.socket_path}")
+        if not response.get("ok"):
+            raise RuntimeError(f"Segmentation daemon error: {response.get('error', 'unknown error')}")
+        return response
+
+    def ping(self):
+        """
+        Return the daemon's status dict, or None if no daemon is running.
+        """
+        try:
+            return self.request({"op": "ping"})
+        except (DaemonUnavailable, RuntimeError, ValueError):
+            return None
+
+def _remove_stale_socket(socket_path):
+    """
+    Remove a socket file left behind by a daemon that is no longer running.
+    """
+    if not os.path.exists(socket_path):
+        return
+    if SegmentationClient(socket_path, timeout=5.0).ping() is not None:
+        raise RuntimeError(f"A segmentation daemon is already running on {socket_path}")
+    os.remove(socket_path)
+
+def serve(socket_path, handler):
+    """
+    Answer requests on socket_path with handler(request) -> response dict until a
+    shutdown request arrives. Requests are handled one at a time.
+    """
+    socket_path = str(socket_path or default_socket_path())
+    _remove_stale_socket(socket_path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)  # Only the owner may connect.
+    try:
+        server.bind(socket_path)
+    finally:
+        os.umask(old_umask)
+    server.listen(16)
+    logger.info(f"Segmentation daemon listening on {socket_path} (pid {os.getpid()})")
+    running = True
+    try:
+        while running:
+            connection, _ = server.accept()
+            with connection, connection.makefile("rb") as stream:
+                line = stream.readline()
+                if not line:
+                    continue
+                try:
+                    request = json.loads(line)
+                    if request.get("op") == "shutdown":
+                        running = False
+                        response = {"ok": True}
+                    else:
+                        response = handler(request)
+                        response["ok"] = True
+                except Exception as e:
+                    logger.error(f"Error handling daemon request: {e}")
+                    response = {"ok": False, "error": str(e)}
+                try:
+                    connection.sendall(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                except OSError as e:
+                    logger.warning(f"Could not answer daemon client: {e}")
+    except KeyboardInterrupt:
+        logger.info("Segmentation daemon interrupted")
+    finally:
+        server.close()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+    logger.info("Segmentation daemon stopped")